@@ -1,15 +1,24 @@
-from utils.config_loader import get_secret_key
+from utils.config_loader import get_secret_key, get_download_config, get_executor_config, get_chat_config
+from utils.stream import iter_chunks
 from typing import Optional, List
 from knowledge.knowledge_manager import KnowledgeManager
+from dao.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from dao.document_module.errors import VersionConflictError
 from dao.user_module.user import User
-from fastapi import HTTPException, Depends, status, APIRouter, Form, UploadFile, File, Body, Query
+from fastapi import HTTPException, Depends, status, APIRouter, Form, UploadFile, File, Body, Query, Header, Request
 import logging
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 from datetime import datetime, timedelta
-from io import BytesIO
 from api.iapi_router import IAPIRouter
-from fastapi.responses import StreamingResponse
+from api.principal import Principal
+from api.blocking_executor import BlockingExecutor
+from api.content_range import parse_range_header, if_range_matches, http_date, parse_if_match, \
+    accepted_encodings
+from api.sse import chat_events
+from knowledge.chat.generators import create_generator
+from knowledge.chat.igenerator import IGenerator
+from fastapi.responses import StreamingResponse, Response, RedirectResponse, FileResponse
 
 
 logger = logging.getLogger(__name__)
@@ -21,11 +30,26 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 security = HTTPBearer()
 
+# Download config
+DOWNLOAD_CONFIG = get_download_config()
+DOWNLOAD_MODES = {"proxy", "presigned", "redirect"}
+
+# Chat config
+CHAT_CONFIG = get_chat_config()
+
 
 class KMS_APIRouter(IAPIRouter):
-    def __init__(self, knowledge_manager: KnowledgeManager):
+    def __init__(self, knowledge_manager: KnowledgeManager, executor: Optional[BlockingExecutor] = None,
+                 generator: Optional[IGenerator] = None):
         self.router = APIRouter()
         self.knowledge = knowledge_manager
+        if executor is None:
+            executor_config = get_executor_config()
+            executor = BlockingExecutor(executor_config["max_workers"], executor_config["max_queue"])
+        self.executor = executor
+        if generator is None:
+            generator = create_generator(CHAT_CONFIG["generator"], token_delay=CHAT_CONFIG["token_delay"])
+        self.generator = generator
         self._register_routes()
 
     def _register_routes(self):
@@ -37,8 +61,13 @@ class KMS_APIRouter(IAPIRouter):
         # doc routes
         self.router.post("/kms/document")(self.upload_document)
         self.router.get("/kms/document/ids")(self.get_doc_ids)
+        self.router.get("/kms/document/batch")(self.get_documents_meta)
         self.router.get('/kms/document/search')(self.search_doc_by_name)
 
+        # permission routes, registered before /kms/document/{document_id} would take "permission" as an id
+        self.router.post("/kms/document/permission")(self.share_document_permission)
+        self.router.delete("/kms/document/permission")(self.remove_document_permission)
+
         # specific doc routes
         self.router.get("/kms/document/{document_id}")(self.get_document_meta)
         self.router.get("/kms/document/{document_id}/content")(self.get_document_content)
@@ -49,11 +78,22 @@ class KMS_APIRouter(IAPIRouter):
         # versioning routes
         self.router.get("/kms/document/{document_id}/versions")(self.get_document_versions)
         self.router.get("/kms/document/{document_id}/versions/{version_id}")(self.get_specific_document_version)
+        self.router.get("/kms/document/{document_id}/versions/{version_number}/content")(self.get_document_version_content)
         self.router.post("/kms/document/{document_id}/versions/{version_id}")(self.restore_document_version)
 
-        # permission routes
-        self.router.post("/kms/document/permission")(self.share_document_permission)
-        self.router.delete("/kms/document/permission")(self.remove_document_permission)
+        # retrieval routes
+        self.router.get("/kms/retrieve")(self.retrieve)
+        self.router.post("/kms/chat")(self.chat)
+
+        # monitoring routes
+        self.router.get("/kms/metrics")(self.get_metrics)
+        self.router.get("/kms/activity/rollups")(self.get_activity_rollups)
+
+    async def _run_knowledge(self, sync_fn, async_fn, *args, **kwargs):
+        # metadata reads stay on the event loop when the async driver is configured
+        if self.knowledge.is_async:
+            return await async_fn(*args, **kwargs)
+        return await self.executor.run(sync_fn, *args, **kwargs)
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -66,14 +106,30 @@ class KMS_APIRouter(IAPIRouter):
     def decode_token(token: str):
         return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
 
-    def get_user_from_token(self, credentials):
-        payload = self.decode_token(credentials.credentials)
+    async def get_principal(self, credentials: HTTPAuthorizationCredentials) -> Principal:
+        # the token is decoded once per request and names the user, who is read through the user cache.
+        # roles come from the stored user, so a deleted or demoted user loses access on the next request
+        try:
+            payload = self.decode_token(credentials.credentials)
+        except jwt.PyJWTError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
         email: str = payload.get("sub")
         if email is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
-        current_user = self.knowledge.get_user_by_email(email)
-        return current_user
+        user_id = payload.get("uid")
+        if user_id is None:
+            # tokens issued before the uid claim was added
+            user = await self._run_knowledge(
+                self.knowledge.get_user_by_email, self.knowledge.get_user_by_email_async, email
+            )
+        else:
+            user = await self._run_knowledge(
+                self.knowledge.get_user_information, self.knowledge.get_user_information_async, user_id
+            )
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        return Principal(userId=user.userId, email=user.email, roles=user.roles)
 
     async def verify_token(self, credentials: HTTPAuthorizationCredentials = Depends(security)):
         try:
@@ -94,7 +150,8 @@ class KMS_APIRouter(IAPIRouter):
             department_id: str = Form(...),
             roles: List[str] = Form(...)
     ):
-        success = self.knowledge.sign_up(
+        success = await self.executor.run(
+            self.knowledge.sign_up,
             email=email,
             password=password,
             name=name,
@@ -114,14 +171,15 @@ class KMS_APIRouter(IAPIRouter):
             email: str = Form(...),
             password: str = Form(...)
     ):
-        if not self.knowledge.login(email.strip(), password.strip()):
+        user = await self.executor.run(self.knowledge.authenticate, email.strip(), password.strip())
+        if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
 
         token = self.create_access_token(
-            data={"sub": email},
+            data={"sub": email, "uid": user.userId, "roles": user.roles},
             expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         )
         return {
@@ -143,11 +201,11 @@ class KMS_APIRouter(IAPIRouter):
             university: Optional[str] = Form(None),
             _: None = Depends(verify_token)  # verify token
     ):
-        content = await document.read()
-        content_io = BytesIO(content)
         try:
-            result = self.knowledge.upload(
-                content=content_io,
+            # pass the spooled upload file through so it is streamed, not buffered, into storage
+            result = await self.executor.run(
+                self.knowledge.upload,
+                content=document.file,
                 name=name,
                 doc_type=doc_type,
                 department_id=department_id,
@@ -158,6 +216,8 @@ class KMS_APIRouter(IAPIRouter):
                 university=university
             )
             return result
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -166,26 +226,42 @@ class KMS_APIRouter(IAPIRouter):
 
     # get current user
     async def get_current_user(self, credentials: HTTPAuthorizationCredentials = Depends(security)):
-        try:
-            user = self.get_user_from_token(credentials)
-            if not user:
-                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
-
-            return user
-        except jwt.PyJWTError:
+        principal = await self.get_principal(credentials)
+        user = await self._run_knowledge(
+            self.knowledge.get_user_information, self.knowledge.get_user_information_async, principal.userId
+        )
+        if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
 
+        return user
+
     # search doc by name
     async def search_doc_by_name(
         self,
         name: str,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(50, ge=1, le=200),
+        mode: str = Query("keyword", pattern="^(keyword|hybrid)$"),
         credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            current_user = self.get_user_from_token(credentials)
-            metadata = self.knowledge.get_doc_by_name(
+            current_user = await self.get_principal(credentials)
+            if mode == "hybrid":
+                # results carry their fused score and per-stage ranks, timings_ms the cost of each stage
+                return await self.executor.run(
+                    self.knowledge.hybrid_search,
+                    query=name,
+                    user_id=current_user.userId,
+                    skip=skip,
+                    limit=limit
+                )
+            metadata = await self._run_knowledge(
+                self.knowledge.get_doc_by_name,
+                self.knowledge.get_doc_by_name_async,
                 name=name,
-                user_id=current_user.userId
+                user_id=current_user.userId,
+                skip=skip,
+                limit=limit
             )
             if not metadata:
                 raise HTTPException(
@@ -193,6 +269,8 @@ class KMS_APIRouter(IAPIRouter):
                     detail="Document not found or access denied"
                 )
             return metadata
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -206,8 +284,10 @@ class KMS_APIRouter(IAPIRouter):
         credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            current_user = self.get_user_from_token(credentials)
-            metadata = self.knowledge.get_metadata(
+            current_user = await self.get_principal(credentials)
+            metadata = await self._run_knowledge(
+                self.knowledge.get_metadata,
+                self.knowledge.get_metadata_async,
                 document_id=document_id,
                 user_id=current_user.userId
             )
@@ -217,6 +297,34 @@ class KMS_APIRouter(IAPIRouter):
                     detail="Document not found or access denied"
                 )
             return metadata
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
+
+    # get metadata of many documents in one call
+    async def get_documents_meta(
+        self,
+        ids: Optional[List[str]] = Query(None),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(50, ge=1, le=500),
+        credentials: HTTPAuthorizationCredentials = Depends(security)
+    ):
+        try:
+            current_user = await self.get_principal(credentials)
+            return await self._run_knowledge(
+                self.knowledge.get_metadata_batch,
+                self.knowledge.get_metadata_batch_async,
+                user_id=current_user.userId,
+                document_ids=ids,
+                skip=skip,
+                limit=limit
+            )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -227,31 +335,59 @@ class KMS_APIRouter(IAPIRouter):
     async def get_document_content(
             self,
             document_id: str,
-            credentials: HTTPAuthorizationCredentials = Depends(security)
+            mode: Optional[str] = None,
+            credentials: HTTPAuthorizationCredentials = Depends(security),
+            range_header: Optional[str] = Header(None, alias="Range"),
+            if_range: Optional[str] = Header(None, alias="If-Range"),
+            accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding")
     ):
         try:
-            current_user = self.get_user_from_token(credentials)
-            content = self.knowledge.get_content(
+            current_user = await self.get_principal(credentials)
+            return await self._serve_content(
                 document_id=document_id,
-                user_id=current_user.userId
+                user_id=current_user.userId,
+                mode=mode,
+                range_header=range_header,
+                if_range=if_range,
+                accept_encoding=accept_encoding
             )
-            if not content:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Document content not found or access denied"
-                )
-
-            file_content = content.read()
-            content.close()
-
-            return StreamingResponse(
-                BytesIO(file_content),
-                media_type="application/octet-stream",
-                headers={
-                    "Content-Disposition": f"attachment; filename={document_id}"
-                }
+        except HTTPException:
+            raise
+        except PermissionError as pe:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=str(pe)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
             )
 
+    # get content of a specific version
+    async def get_document_version_content(
+            self,
+            document_id: str,
+            version_number: int,
+            mode: Optional[str] = None,
+            credentials: HTTPAuthorizationCredentials = Depends(security),
+            range_header: Optional[str] = Header(None, alias="Range"),
+            if_range: Optional[str] = Header(None, alias="If-Range"),
+            accept_encoding: Optional[str] = Header(None, alias="Accept-Encoding")
+    ):
+        try:
+            current_user = await self.get_principal(credentials)
+            return await self._serve_content(
+                document_id=document_id,
+                user_id=current_user.userId,
+                mode=mode,
+                range_header=range_header,
+                if_range=if_range,
+                accept_encoding=accept_encoding,
+                version_number=version_number
+            )
+        except HTTPException:
+            raise
         except PermissionError as pe:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -263,14 +399,159 @@ class KMS_APIRouter(IAPIRouter):
                 detail=str(e)
             )
 
+    async def _serve_content(
+            self,
+            document_id: str,
+            user_id: str,
+            mode: Optional[str],
+            range_header: Optional[str],
+            if_range: Optional[str],
+            accept_encoding: Optional[str] = None,
+            version_number: Optional[int] = None
+    ):
+        mode = (mode or DOWNLOAD_CONFIG["mode"]).lower()
+        if mode not in DOWNLOAD_MODES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown download mode '{mode}', expected one of {sorted(DOWNLOAD_MODES)}"
+            )
+        if mode == "proxy":
+            return await self._stream_content(
+                document_id=document_id,
+                user_id=user_id,
+                range_header=range_header,
+                if_range=if_range,
+                accept_encoding=accept_encoding,
+                version_number=version_number
+            )
+
+        # permission is checked before signing, then the client fetches the bytes from storage directly
+        url = await self.executor.run(
+            self.knowledge.get_content_url,
+            document_id=document_id,
+            user_id=user_id,
+            version_number=version_number,
+            expires=timedelta(seconds=DOWNLOAD_CONFIG["url_expires"]),
+            accept_encodings=accepted_encodings(accept_encoding)
+        )
+        if not url:
+            # compressed content the client cannot decode is streamed decompressed, a missing one ends in 404
+            return await self._stream_content(
+                document_id=document_id,
+                user_id=user_id,
+                range_header=range_header,
+                if_range=if_range,
+                accept_encoding=accept_encoding,
+                version_number=version_number
+            )
+        if mode == "redirect":
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+        return {"url": url, "expires_in": DOWNLOAD_CONFIG["url_expires"]}
+
+    async def _stream_content(
+            self,
+            document_id: str,
+            user_id: str,
+            range_header: Optional[str],
+            if_range: Optional[str],
+            accept_encoding: Optional[str] = None,
+            version_number: Optional[int] = None
+    ) -> Response:
+        info = await self.executor.run(
+            self.knowledge.get_content_info,
+            document_id=document_id,
+            user_id=user_id,
+            version_number=version_number
+        )
+        if not info:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document content not found or access denied"
+            )
+
+        codec = info.get("codec")
+        # compressed content goes out as stored to clients that decode it, ranges are served decompressed
+        encoded = bool(codec) and not range_header and codec in accepted_encodings(accept_encoding)
+        size = info["stored_size"] if encoded else info["size"]
+        headers = {
+            "Content-Disposition": f"attachment; filename={document_id}",
+            "Accept-Ranges": "bytes",
+        }
+        if codec:
+            headers["Vary"] = "Accept-Encoding"
+        if encoded:
+            headers["Content-Encoding"] = codec
+        if info.get("etag"):
+            # each representation has its own validator
+            headers["ETag"] = f'"{info["etag"]}-{codec}"' if encoded else f'"{info["etag"]}"'
+        if info.get("last_modified"):
+            headers["Last-Modified"] = http_date(info["last_modified"])
+
+        byte_range = None
+        if if_range_matches(if_range, info.get("etag"), info.get("last_modified")):
+            try:
+                byte_range = parse_range_header(range_header, size)
+            except ValueError:
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers={"Content-Range": f"bytes */{size}"}
+                )
+
+        content_type = info.get("content_type") or ""
+        media_type = content_type if "/" in content_type else "application/octet-stream"
+        if info.get("path") and not range_header and (encoded or not codec):
+            # whole objects on local disk are sent from the file, zero-copy where the server supports it
+            headers["Content-Length"] = str(size)
+            return FileResponse(info["path"], media_type=media_type, headers=headers)
+
+        # pin the version resolved above so a concurrent update cannot change the bytes mid-range
+        offset, length = (byte_range[0], byte_range[1] - byte_range[0] + 1) if byte_range else (0, 0)
+        content = await self.executor.run(
+            self.knowledge.get_content,
+            document_id=document_id,
+            user_id=user_id,
+            version_number=info["version_number"],
+            offset=offset,
+            length=length,
+            decode=not encoded
+        )
+        if not content:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document content not found or access denied"
+            )
+
+        if byte_range:
+            headers["Content-Range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+            headers["Content-Length"] = str(length)
+        else:
+            headers["Content-Length"] = str(size)
+
+        return StreamingResponse(
+            iter_chunks(content, DOWNLOAD_CONFIG["chunk_size"]),
+            status_code=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+            media_type=media_type,
+            headers=headers
+        )
+
     # get all document content
     async def get_doc_ids(
             self,
+            after: Optional[str] = None,
+            limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
             credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            current_user = self.get_user_from_token(credentials)
-            doc_ids = self.knowledge.get_doc_ids(user_id=current_user.userId)
+            current_user = await self.get_principal(credentials)
+            if after is not None or limit is not None:
+                # paged: {"items", "next_cursor"}, next_cursor is None on the last page
+                return await self._run_knowledge(
+                    self.knowledge.get_doc_ids_page, self.knowledge.get_doc_ids_page_async,
+                    user_id=current_user.userId, after=after, limit=limit or DEFAULT_PAGE_SIZE
+                )
+            doc_ids = await self._run_knowledge(
+                self.knowledge.get_doc_ids, self.knowledge.get_doc_ids_async, user_id=current_user.userId
+            )
 
             if not doc_ids:
                 return {"messgae": "Not Found"}
@@ -283,6 +564,8 @@ class KMS_APIRouter(IAPIRouter):
 
         except HTTPException:
             raise
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -292,7 +575,6 @@ class KMS_APIRouter(IAPIRouter):
     # update document metadata
     async def update_document_meta(
             self,
-            modified_by: str,
             document_id: str,
             new_name: str = Body(...),
             new_department_id: str = Body(...),
@@ -301,11 +583,13 @@ class KMS_APIRouter(IAPIRouter):
             new_category: str = Body(...),
             new_description: str = Body(...),
             new_university: str = Body(...),
-            _: None = Depends(verify_token)
+            credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            success = self.knowledge.update_metadata(
-                modified_by=modified_by,
+            current_user = await self.get_principal(credentials)
+            success = await self.executor.run(
+                self.knowledge.update_metadata,
+                modified_by=current_user.userId,
                 document_id=document_id,
                 new_name=new_name.strip(),
                 new_department_id=new_department_id.strip(),
@@ -321,6 +605,8 @@ class KMS_APIRouter(IAPIRouter):
                     detail="Document not found"
                 )
             return {'message': 'update document metadata successfully'}
+        except PermissionError as pe:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(pe))
         except ValueError as e:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -338,26 +624,36 @@ class KMS_APIRouter(IAPIRouter):
     async def update_document_content(
             self,
             document_id: str,
-            modified_by: str = Form(...),
+            response: Response,
             document: UploadFile = File(...),
-            _: None = Depends(verify_token)
+            if_match: Optional[str] = Header(None, alias="If-Match"),
+            credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            content = await document.read()
-            content_io = BytesIO(content)
-            success = self.knowledge.update_content(
+            current_user = await self.get_principal(credentials)
+            version_number = await self.executor.run(
+                self.knowledge.update_content,
                 document_id=document_id,
-                modified_by=modified_by,
-                new_content=content_io
+                modified_by=current_user.userId,
+                new_content=document.file,
+                expected_version=parse_if_match(if_match)
             )
-            if not success:
+            if not version_number:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Document not found or update failed"
                 )
-            return {'message': 'update document content successfully'}
+            # the new version number is the validator for the next If-Match
+            response.headers["ETag"] = f'"{version_number}"'
+            return {'message': 'update document content successfully', 'version_number': version_number}
         except HTTPException:
             raise
+        except PermissionError as pe:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(pe))
+        except VersionConflictError as e:
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -371,8 +667,9 @@ class KMS_APIRouter(IAPIRouter):
             credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            current_user = self.get_user_from_token(credentials)
-            success = self.knowledge.delete(
+            current_user = await self.get_principal(credentials)
+            success = await self.executor.run(
+                self.knowledge.delete,
                 deleted_by=current_user.userId,
                 document_id=document_id
             )
@@ -393,23 +690,32 @@ class KMS_APIRouter(IAPIRouter):
     # get all versions
     async def get_document_versions(
             self,
-            user_id: str,
             document_id: str,
-            _: None = Depends(verify_token)
+            after: Optional[str] = None,
+            limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+            credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            versions = self.knowledge.get_all_versions(
-                user_id=user_id,
-                document_id=document_id
+            current_user = await self.get_principal(credentials)
+            page = await self.executor.run(
+                self.knowledge.get_versions_page,
+                user_id=current_user.userId,
+                document_id=document_id,
+                after=after,
+                limit=limit
             )
-            if not versions:
+            if not page["versions"] and after is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="No versions found for the given document ID or access denied"
                 )
-            return {"versions": versions}
+            return page
         except HTTPException:
             raise
+        except PermissionError as pe:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(pe))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -419,14 +725,15 @@ class KMS_APIRouter(IAPIRouter):
     # get specific version
     async def get_specific_document_version(
             self,
-            user_id: str,
             document_id: str,
             version_number: str,
-            _: None = Depends(verify_token)
+            credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            document = self.knowledge.get_specific_version(
-                user_id=user_id,
+            current_user = await self.get_principal(credentials)
+            document = await self.executor.run(
+                self.knowledge.get_specific_version,
+                user_id=current_user.userId,
                 document_id=document_id,
                 version_number=version_number
             )
@@ -438,6 +745,8 @@ class KMS_APIRouter(IAPIRouter):
             return {'document': document}
         except HTTPException:
             raise
+        except PermissionError as pe:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(pe))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -448,24 +757,35 @@ class KMS_APIRouter(IAPIRouter):
     async def restore_document_version(
             self,
             document_id: str,
+            response: Response,
             version_number: str = Form(...),
-            restored_by: str = Form(...),
-            _: None = Depends(verify_token)
+            if_match: Optional[str] = Header(None, alias="If-Match"),
+            credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            success = self.knowledge.restore_version(
+            current_user = await self.get_principal(credentials)
+            restored_number = await self.executor.run(
+                self.knowledge.restore_version,
                 document_id=document_id,
                 version_number=version_number,
-                restored_by=restored_by
+                restored_by=current_user.userId,
+                expected_version=parse_if_match(if_match)
             )
-            if not success:
+            if not restored_number:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Document version not found or restore failed"
                 )
-            return {'message': 'Document version restored successfully'}
+            response.headers["ETag"] = f'"{restored_number}"'
+            return {'message': 'Document version restored successfully', 'version_number': restored_number}
         except HTTPException:
             raise
+        except PermissionError as pe:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(pe))
+        except VersionConflictError as e:
+            raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -481,9 +801,10 @@ class KMS_APIRouter(IAPIRouter):
             credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            current_user = self.get_user_from_token(credentials)
+            current_user = await self.get_principal(credentials)
 
-            success = self.knowledge.share_permissions(
+            success = await self.executor.run(
+                self.knowledge.share_permissions,
                 shared_by=current_user.userId,
                 shared_to=shared_to,
                 document_id=document_id,
@@ -494,7 +815,7 @@ class KMS_APIRouter(IAPIRouter):
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Failed to share permissions. Check if user or document exists or access denied."
                 )
-            return {"message": f"Permissions shared with user {shared_to} on document {document_id} by {shared_by}"}
+            return {"message": f"Permissions shared with user {shared_to} on document {document_id} by {current_user.userId}"}
         except HTTPException:
             raise
         except Exception as e:
@@ -512,9 +833,10 @@ class KMS_APIRouter(IAPIRouter):
             credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
         try:
-            current_user = self.get_user_from_token(credentials)
+            current_user = await self.get_principal(credentials)
 
-            success = self.knowledge.remove_permissions(
+            success = await self.executor.run(
+                self.knowledge.remove_permissions,
                 removed_by=current_user.userId,
                 removed_to=removed_to,
                 document_id=document_id,
@@ -525,7 +847,7 @@ class KMS_APIRouter(IAPIRouter):
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Failed to remove permissions. Check if user or document exists or access denied."
                 )
-            return {"message": f"Permissions removed for user {removed_to} on document {document_id} by {removed_by}"}
+            return {"message": f"Permissions removed for user {removed_to} on document {document_id} by {current_user.userId}"}
         except HTTPException:
             raise
         except Exception as e:
@@ -533,3 +855,99 @@ class KMS_APIRouter(IAPIRouter):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(e)
             )
+
+    # passages the user may read, nearest to the query
+    async def retrieve(
+            self,
+            q: str = Query(..., min_length=1),
+            k: int = Query(5, ge=1, le=50),
+            credentials: HTTPAuthorizationCredentials = Depends(security)
+    ):
+        try:
+            current_user = await self.get_principal(credentials)
+            return await self.executor.run(self.knowledge.retrieve, user_id=current_user.userId, query=q, k=k)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
+
+    async def get_activity_rollups(
+            self,
+            granularity: str = Query("day", pattern="^(hour|day)$"),
+            dimension: str = Query("document", pattern="^(document|user)$"),
+            key: Optional[str] = None,
+            action: Optional[str] = None,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None,
+            credentials: HTTPAuthorizationCredentials = Depends(security)
+    ):
+        # pre-aggregated counters, admins see everything, other users only their own activity
+        current_user = await self.get_principal(credentials)
+        if "admin" not in current_user.roles:
+            if dimension != "user" or key not in (None, current_user.userId):
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required")
+            key = current_user.userId
+        try:
+            return await self._run_knowledge(
+                self.knowledge.get_activity_rollups,
+                self.knowledge.get_activity_rollups_async,
+                granularity=granularity,
+                dimension=dimension,
+                key=key,
+                action=action,
+                since=since,
+                until=until
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
+
+    async def chat(
+            self,
+            request: Request,
+            question: str = Body(..., min_length=1),
+            k: Optional[int] = Body(None, ge=1, le=50),
+            credentials: HTTPAuthorizationCredentials = Depends(security)
+    ):
+        # retrieval happens before the response starts, so its errors are still plain http errors
+        # and the first byte waits on retrieval only, never on generation
+        try:
+            current_user = await self.get_principal(credentials)
+            passages = await self.executor.run(
+                self.knowledge.retrieve, user_id=current_user.userId, query=question, k=k or CHAT_CONFIG["top_k"]
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=str(e)
+            )
+        return StreamingResponse(
+            chat_events(request, passages, self.generator.generate(question, passages)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    # runtime metrics
+    async def get_metrics(
+            self,
+            credentials: HTTPAuthorizationCredentials = Depends(security)
+    ):
+        current_user = await self.get_principal(credentials)
+        if "admin" not in current_user.roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin role required")
+        return {
+            "caches": self.knowledge.get_cache_stats(),
+            "executor": self.executor.stats(),
+            "extraction": self.knowledge.get_extraction_stats(),
+            "retrieval": self.knowledge.get_retrieval_stats(),
+            "activity_log": self.knowledge.get_activity_log_stats(),
+            "compaction": self.knowledge.get_compaction_stats(),
+            "reconciliation": self.knowledge.get_reconciliation_stats()
+        }
@@ -13,6 +13,9 @@ async def lifespan(kms_app: FastAPI):
     # Startup code
     try:
         knowledge_manager = KnowledgeManager()
+        knowledge_manager.dao.ensure_indexes()
+        knowledge_manager.dao.dropExpiredActivityPartitions()
+        knowledge_manager.resume_extraction()
         kms_app.state.api_router = KMS_APIRouter(knowledge_manager)
         kms_app.include_router(kms_app.state.api_router.router)
         logger.info("Resources initialized successfully.")
@@ -23,7 +26,10 @@ async def lifespan(kms_app: FastAPI):
     yield  # now running
 
     logger.info("Cleaning up resources...")
-    knowledge_manager.dao.close_connection()  # close connection to db
+    kms_app.state.api_router.executor.shutdown()
+    knowledge_manager.shutdown()  # stop background extraction
+    await knowledge_manager.close_async()
+    knowledge_manager.dao.close_connection()  # drain queued activity logs, close connection to db
 
 
 app = FastAPI(
@@ -0,0 +1,81 @@
+from typing import Optional, Tuple
+from datetime import datetime
+from email.utils import format_datetime
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    # returns the inclusive (start, end) of a single "bytes=" range, None when the header should be ignored,
+    # raises ValueError when the range cannot be satisfied
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        # unknown unit or multipart ranges, serve the whole content instead
+        return None
+
+    start_str, sep, end_str = spec.strip().partition("-")
+    start_str, end_str = start_str.strip(), end_str.strip()
+    if not sep or not (start_str + end_str).isdigit():
+        # malformed ranges are ignored
+        return None
+
+    if not start_str:
+        # suffix range: the last N bytes
+        suffix = int(end_str)
+        if suffix == 0 or size == 0:
+            raise ValueError(f"Range {range_header} not satisfiable for size {size}")
+        return max(size - suffix, 0), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Range {range_header} not satisfiable for size {size}")
+    return start, min(end, size - 1)
+
+
+def if_range_matches(if_range: Optional[str], etag: Optional[str], last_modified: Optional[datetime]) -> bool:
+    # a Range is only honoured when If-Range (if present) still identifies the current representation
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # weak validators never match for ranges
+        return bool(etag) and if_range == f'"{etag}"'
+    return last_modified is not None and if_range == http_date(last_modified)
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    # document versions are their own validator, If-Match: "3" means "only if still at version 3"
+    if not if_match or if_match.strip() == "*":
+        return None
+    value = if_match.strip()
+    if value.startswith("W/"):
+        value = value[2:]
+    value = value.strip('"')
+    if not value.isdigit():
+        raise ValueError(f"Invalid If-Match: {if_match}")
+    return int(value)
+
+
+def accepted_encodings(accept_encoding: Optional[str]) -> Tuple[str, ...]:
+    # the content codings a client can decode, q=0 rules one out. "*" is not expanded, compressed
+    # content is only sent to clients that name its coding
+    accepted = []
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        q = params.strip().lower()
+        if not coding or coding == "*":
+            continue
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.append(coding)
+    return tuple(accepted)
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
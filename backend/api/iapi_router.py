@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional, List
-from fastapi import UploadFile
+from fastapi import UploadFile, Request
 from fastapi.security import HTTPAuthorizationCredentials
 
 
@@ -50,17 +51,41 @@ class IAPIRouter(ABC):
             credentials: HTTPAuthorizationCredentials
     ) -> dict: pass
 
+    @abstractmethod
+    async def get_documents_meta(
+            self,
+            ids: Optional[List[str]],
+            skip: int,
+            limit: int,
+            credentials: HTTPAuthorizationCredentials
+    ) -> dict: pass
+
     @abstractmethod
     async def get_document_content(
             self,
             document_id: str,
-            credentials: HTTPAuthorizationCredentials
+            mode: Optional[str],
+            credentials: HTTPAuthorizationCredentials,
+            range_header: Optional[str],
+            if_range: Optional[str],
+            accept_encoding: Optional[str]
+    ) -> dict: pass
+
+    @abstractmethod
+    async def get_document_version_content(
+            self,
+            document_id: str,
+            version_number: int,
+            mode: Optional[str],
+            credentials: HTTPAuthorizationCredentials,
+            range_header: Optional[str],
+            if_range: Optional[str],
+            accept_encoding: Optional[str]
     ) -> dict: pass
 
     @abstractmethod
     async def update_document_meta(
             self,
-            modified_by: str,
             document_id: str,
             new_name: str,
             new_department_id: str,
@@ -76,8 +101,8 @@ class IAPIRouter(ABC):
     async def update_document_content(
             self,
             document_id: str,
-            modified_by: str,
             document: UploadFile,
+            if_match: Optional[str],
             credentials: HTTPAuthorizationCredentials
     ) -> dict: pass
 
@@ -91,15 +116,15 @@ class IAPIRouter(ABC):
     @abstractmethod
     async def get_document_versions(
             self,
-            user_id: str,
             document_id: str,
+            after: Optional[str],
+            limit: int,
             credentials: HTTPAuthorizationCredentials
     ) -> dict: pass
 
     @abstractmethod
     async def get_specific_document_version(
             self,
-            user_id: str,
             document_id: str,
             version_number: str,
             credentials: HTTPAuthorizationCredentials
@@ -110,7 +135,7 @@ class IAPIRouter(ABC):
             self,
             document_id: str,
             version_number: str,
-            restored_by: str,
+            if_match: Optional[str],
             credentials: HTTPAuthorizationCredentials
     ) -> dict: pass
 
@@ -126,9 +151,43 @@ class IAPIRouter(ABC):
     @abstractmethod
     async def remove_document_permission(
             self,
-            removed_by: str,
             removed_to: str,
             document_id: str,
             permissions: List[str],
             credentials: HTTPAuthorizationCredentials
     ) -> dict: pass
+
+    @abstractmethod
+    async def retrieve(
+            self,
+            q: str,
+            k: int,
+            credentials: HTTPAuthorizationCredentials
+    ) -> List[dict]: pass
+
+    @abstractmethod
+    async def chat(
+            self,
+            request: Request,
+            question: str,
+            k: Optional[int],
+            credentials: HTTPAuthorizationCredentials
+    ): pass
+
+    @abstractmethod
+    async def get_activity_rollups(
+            self,
+            granularity: str,
+            dimension: str,
+            key: Optional[str],
+            action: Optional[str],
+            since: Optional[datetime],
+            until: Optional[datetime],
+            credentials: HTTPAuthorizationCredentials
+    ) -> List[dict]: pass
+
+    @abstractmethod
+    async def get_metrics(
+            self,
+            credentials: HTTPAuthorizationCredentials
+    ) -> dict: pass
@@ -0,0 +1,8 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class Principal(BaseModel):
+    userId: str = Field(..., description="ID of the authenticated user")
+    email: str = Field(..., description="Email the token was issued for")
+    roles: List[str] = Field(default_factory=list, description="Roles of the stored user")
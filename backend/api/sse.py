@@ -0,0 +1,30 @@
+import json
+import logging
+from typing import AsyncIterator, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def sse_event(event: str, data: object) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def chat_events(request, passages: List[Dict[str, object]], tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    # citations go out as soon as retrieval is done, generated tokens follow as they are produced.
+    # generation stops, and the generator is closed, once the client has gone away
+    citations = [dict(passage, number=number) for number, passage in enumerate(passages, start=1)]
+    yield sse_event("citations", citations)
+    count = 0
+    try:
+        async for token in tokens:
+            if await request.is_disconnected():
+                logger.info(f"Chat client disconnected after {count} tokens")
+                return
+            count += 1
+            yield sse_event("token", {"text": token})
+        yield sse_event("done", {"tokens": count})
+    except Exception as e:
+        logger.error(f"Chat generation failed: {str(e)}", exc_info=True)
+        yield sse_event("error", {"detail": str(e)})
+    finally:
+        await tokens.aclose()
@@ -1,9 +1,14 @@
 from pydantic import BaseModel, Field
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timezone
 from dao.activitylog_module.iactivitylog import IActivityLog
 
 
+def utc_now() -> datetime:
+    # naive utc, what mongo hands back and what its ttl indexes compare against
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class ActivityLog(BaseModel, IActivityLog):
     activityLogId: str = Field(default_factory=lambda: str(ObjectId()), description="Unique identifier")  # Auto-generated
     userId: str = Field(..., description="ID of the user_module who performed the action")
@@ -25,7 +30,7 @@ class ActivityLog(BaseModel, IActivityLog):
             docId=docId,
             action=action,
             description=description,
-            date=datetime.now(),
+            date=kwargs.pop("date", None) or utc_now(),  # kept when loaded from mongo
             **kwargs
         )
 
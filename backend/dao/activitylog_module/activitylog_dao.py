@@ -1,51 +1,283 @@
-from typing import List, Optional
-from pymongo import MongoClient
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Dict, List, Optional, Set
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
 from bson import ObjectId
 from dao.activitylog_module.activitylog import ActivityLog
 from dao.activitylog_module.iactivitylog_dao import IActivityLogDAO
+from dao.activitylog_module.activitylog_partitions import ActivityLogPartitions, TTL_INDEX
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, keyset_query, page_size, to_page
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_GRANULARITIES = ("hour", "day")
+ROLLUP_DIMENSIONS = {"document": "docId", "user": "userId"}
+# IndexOptionsConflict, IndexKeySpecsConflict
+INDEX_CONFLICT_CODES = (85, 86)
+# NamespaceNotFound, IndexNotFound
+INDEX_MISSING_CODES = (26, 27)
 
 
 class ActivityLogDAO(IActivityLogDAO):
-    def __init__(self, mongo_client: MongoClient, database_name: str, collection_name: str):
+    # logs live in one collection per month, <collection>_YYYYMM, so retention drops whole partitions and
+    # reads only touch the months they ask for. logs written before partitioning stay in <collection>.
+    # every write also bumps hourly and daily counters per document, user and action in <collection>_rollups
+    INDEXES = [
+        IndexModel([("docId", ASCENDING), ("date", ASCENDING)], name="docId_date"),
+        IndexModel([("userId", ASCENDING), ("date", ASCENDING)], name="userId_date"),
+    ]
+    ROLLUP_INDEXES = [
+        IndexModel([("granularity", ASCENDING), ("dimension", ASCENDING), ("key", ASCENDING), ("bucket", ASCENDING)],
+                   name="granularity_dimension_key_bucket"),
+        IndexModel([("granularity", ASCENDING), ("dimension", ASCENDING), ("bucket", ASCENDING)],
+                   name="granularity_dimension_bucket"),
+        # only hourly counters carry expire_at
+        IndexModel([("expire_at", ASCENDING)], name="expire_at_ttl", expireAfterSeconds=0),
+    ]
+
+    def __init__(self, mongo_client: MongoClient, database_name: str, collection_name: str,
+                 retention_days: int = 0, hourly_rollup_days: int = 0):
         self.db = mongo_client[database_name]
         self.collection = self.db[collection_name]
+        self.rollups = self.db[f"{collection_name}_rollups"]
+        self.partitions = ActivityLogPartitions(collection_name, self.INDEXES, retention_days)
+        self.hourly_rollup_days = hourly_rollup_days
+        self._prepared: Set[str] = set()
+        self._prepared_lock = Lock()
+
+    # partitions
+    def _partition(self, date: datetime):
+        name = self.partitions.name_for(date)
+        collection = self.db[name]
+        if name not in self._prepared:
+            # once per process and month, the first write of a month creates its partition's indexes
+            with self._prepared_lock:
+                if name not in self._prepared:
+                    self.preparePartition(name)
+                    self._prepared.add(name)
+        return collection
+
+    def preparePartition(self, name: str) -> List[str]:
+        # never raises, a partition missing an index still takes writes. returns the indexes it could not create
+        collection = self.db[name]
+        missing = []
+        for index in self.partitions.indexes():
+            try:
+                collection.create_indexes([index])
+            except OperationFailure as e:
+                if e.code in INDEX_CONFLICT_CODES and index.document["name"] == TTL_INDEX \
+                        and self._set_ttl(name, index.document["expireAfterSeconds"]):
+                    continue
+                logger.error(f"Failed to create index {index.document['name']} on {name}: {e}")
+                missing.append(index.document["name"])
+            except PyMongoError as e:
+                logger.error(f"Failed to create index {index.document['name']} on {name}: {e}")
+                missing.append(index.document["name"])
+        if not self.partitions.retention_days:
+            # retention was switched off, logs kept under the old setting must stop expiring
+            try:
+                collection.drop_index(TTL_INDEX)
+            except OperationFailure as e:
+                if e.code not in INDEX_MISSING_CODES:
+                    logger.error(f"Failed to drop index {TTL_INDEX} on {name}: {e}")
+            except PyMongoError as e:
+                logger.error(f"Failed to drop index {TTL_INDEX} on {name}: {e}")
+        return missing
+
+    def _set_ttl(self, name: str, seconds: int) -> bool:
+        # retention changed since the partition was created, its ttl is moved in place
+        try:
+            self.db.command("collMod", name, index={"name": TTL_INDEX, "expireAfterSeconds": seconds})
+            logger.info(f"Set {TTL_INDEX} on {name} to {seconds}s")
+            return True
+        except PyMongoError as e:
+            logger.error(f"Failed to update {TTL_INDEX} on {name}: {e}")
+            return False
+
+    def partitionNames(self) -> List[str]:
+        return self.partitions.filter(self.db.list_collection_names())
 
+    def dropExpiredPartitions(self, now: Optional[datetime] = None) -> List[str]:
+        # whole months past retention are dropped, the ttl index expires the rest log by log
+        dropped = self.partitions.expired(self.partitionNames(), now)
+        for name in dropped:
+            self.db.drop_collection(name)
+            self._prepared.discard(name)
+        return dropped
+
+    # writes
     def save(self, log: ActivityLog, session=None) -> bool:
-        log_dict = log.dict()
-        log_dict['_id'] = ObjectId(log_dict['activityLogId'])
-        del log_dict['activityLogId']
-        result = self.collection.insert_one(log_dict)
+        result = self._partition(log.date).insert_one(self._to_doc(log), session=session)
+        self._update_rollups([log], session=session)
         return result.acknowledged
 
+    def saveMany(self, logs: List[ActivityLog]) -> int:
+        if not logs:
+            return 0
+        by_partition: Dict[str, List[ActivityLog]] = {}
+        for log in logs:
+            by_partition.setdefault(self.partitions.name_for(log.date), []).append(log)
+        inserted = []
+        for month_logs in by_partition.values():
+            docs = [self._to_doc(log) for log in month_logs]
+            try:
+                self._partition(month_logs[0].date).insert_many(docs, ordered=False)
+                inserted.extend(month_logs)
+            except BulkWriteError as e:
+                # unordered, the rest of the batch is still written
+                failed = {error["index"] for error in e.details.get("writeErrors", [])}
+                inserted.extend(log for i, log in enumerate(month_logs) if i not in failed)
+        try:
+            self._update_rollups(inserted)
+        except PyMongoError as e:
+            # the logs themselves are stored, only the counters fall behind
+            logger.error(f"Failed to update activity rollups for {len(inserted)} logs: {str(e)}")
+        return len(inserted)
+
+    def _update_rollups(self, logs: List[ActivityLog], session=None):
+        operations = self.rollup_operations(logs, self.hourly_rollup_days)
+        if operations:
+            self.rollups.bulk_write(operations, ordered=False, session=session)
+
+    @staticmethod
+    def rollup_operations(logs: List[ActivityLog], hourly_rollup_days: int = 0) -> List[UpdateOne]:
+        # one $inc per (granularity, bucket, dimension, key, action) the batch touches
+        counts: Counter = Counter()
+        for log in logs:
+            for granularity in ROLLUP_GRANULARITIES:
+                bucket = ActivityLogDAO.bucket_of(log.date, granularity)
+                for dimension, field in ROLLUP_DIMENSIONS.items():
+                    counts[(granularity, bucket, dimension, getattr(log, field), log.action)] += 1
+        operations = []
+        for (granularity, bucket, dimension, key, action), count in counts.items():
+            fields = {"granularity": granularity, "bucket": bucket, "dimension": dimension, "key": key,
+                      "action": action}
+            if granularity == "hour" and hourly_rollup_days:
+                fields["expire_at"] = bucket + timedelta(days=hourly_rollup_days)
+            operations.append(UpdateOne(
+                {"_id": f"{granularity}|{bucket:%Y%m%d%H}|{dimension}|{key}|{action}"},
+                {"$inc": {"count": count}, "$setOnInsert": fields},
+                upsert=True
+            ))
+        return operations
+
+    @staticmethod
+    def bucket_of(date: datetime, granularity: str) -> datetime:
+        if granularity == "hour":
+            return date.replace(minute=0, second=0, microsecond=0)
+        return date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # reads
+    def _candidate_collections(self, activityLogId: str):
+        created = ObjectId(activityLogId).generation_time.replace(tzinfo=None)
+        return [self.db[name] for name in self.partitions.candidates_for_id(created)] + [self.collection]
+
     def findById(self, activityLogId: str) -> Optional[ActivityLog]:
-        log = self.collection.find_one({"_id": ObjectId(activityLogId)})
-        return self._convert_log(log) if log else None
+        for collection in self._candidate_collections(activityLogId):
+            log = collection.find_one({"_id": ObjectId(activityLogId)})
+            if log:
+                return self._convert_log(log)
+        return None
+
+    def _find(self, query: dict, since: Optional[datetime], until: Optional[datetime],
+              limit: int) -> List[ActivityLog]:
+        # newest first, partitions are read until limit logs are found
+        query = dict(query, **self.date_filter(since, until))
+        logs = []
+        names = self.partitions.between(self.partitionNames(), since, until)
+        for collection in [self.db[name] for name in names] + [self.collection]:
+            remaining = limit - len(logs)
+            if remaining <= 0:
+                break
+            cursor = collection.find(query).sort("date", DESCENDING).limit(remaining)
+            logs.extend(self._convert_log(log) for log in cursor)
+        return logs
+
+    @staticmethod
+    def date_filter(since: Optional[datetime], until: Optional[datetime]) -> dict:
+        date = {}
+        if since is not None:
+            date["$gte"] = since
+        if until is not None:
+            date["$lt"] = until
+        return {"date": date} if date else {}
+
+    def findByUser(self, userId: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   limit: int = 100) -> List[ActivityLog]:
+        return self._find({"userId": userId}, since, until, limit)
 
-    def findByUser(self, userId: str) -> List[ActivityLog]:
-        logs = self.collection.find({"userId": userId})
-        return [self._convert_log(log) for log in logs]
+    def findByDocument(self, docId: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                       limit: int = 100) -> List[ActivityLog]:
+        return self._find({"docId": docId}, since, until, limit)
 
-    def findByDocument(self, docId: str) -> List[ActivityLog]:
-        logs = self.collection.find({"docId": docId})
-        return [self._convert_log(log) for log in logs]
+    def findAll(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                limit: int = 100) -> List[ActivityLog]:
+        return self._find({}, since, until, limit)
 
-    def findAll(self) -> List[ActivityLog]:
-        logs = self.collection.find({})
-        return [self._convert_log(log) for log in logs]
+    def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        # newest first across the partitions, ids grow with the log dates so _id order is date order
+        limit = page_size(limit)
+        query = keyset_query({}, after, descending=True)
+        names = self.partitionNames()
+        if after is not None:
+            created = ObjectId(after).generation_time.replace(tzinfo=None)
+            names = self.partitions.between(names, None, created + timedelta(days=1))
+        docs = []
+        for collection in [self.db[name] for name in names] + [self.collection]:
+            remaining = limit + 1 - len(docs)
+            if remaining <= 0:
+                break
+            docs.extend(collection.find(query).sort("_id", DESCENDING).limit(remaining))
+        return to_page(docs, limit, self._convert_log)
+
+    def findRollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                    action: Optional[str] = None, since: Optional[datetime] = None,
+                    until: Optional[datetime] = None) -> List[Dict[str, object]]:
+        cursor = self.rollups.find(self.rollup_query(granularity, dimension, key, action, since, until),
+                                   {"_id": 0, "expire_at": 0}).sort("bucket", ASCENDING)
+        return list(cursor)
+
+    @staticmethod
+    def rollup_query(granularity: str, dimension: str, key: Optional[str], action: Optional[str],
+                     since: Optional[datetime], until: Optional[datetime]) -> dict:
+        query = {"granularity": granularity, "dimension": dimension}
+        if key is not None:
+            query["key"] = key
+        if action is not None:
+            query["action"] = action
+        bucket = {}
+        if since is not None:
+            bucket["$gte"] = ActivityLogDAO.bucket_of(since, granularity)
+        if until is not None:
+            bucket["$lt"] = until
+        if bucket:
+            query["bucket"] = bucket
+        return query
 
     def update(self, log: ActivityLog) -> bool:
         log_dict = log.dict()
         log_id = ObjectId(log_dict['activityLogId'])
         del log_dict['activityLogId']
-        result = self.collection.update_one(
-            {"_id": log_id},
-            {"$set": log_dict}
-        )
-        return result.modified_count > 0
+        for collection in self._candidate_collections(str(log_id)):
+            result = collection.update_one({"_id": log_id}, {"$set": log_dict})
+            if result.matched_count:
+                return result.modified_count > 0
+        return False
 
     def delete(self, activityLogId: str) -> bool:
-        result = self.collection.delete_one({"_id": ObjectId(activityLogId)})
-        return result.deleted_count > 0
+        for collection in self._candidate_collections(activityLogId):
+            if collection.delete_one({"_id": ObjectId(activityLogId)}).deleted_count:
+                return True
+        return False
+
+    @staticmethod
+    def _to_doc(log: ActivityLog) -> dict:
+        log_dict = log.dict()
+        log_dict['_id'] = ObjectId(log_dict.pop('activityLogId'))
+        return log_dict
 
     @staticmethod
     def _convert_log(log: dict) -> Optional[ActivityLog]:
@@ -53,4 +285,4 @@ class ActivityLogDAO(IActivityLogDAO):
             log["activityLogId"] = str(log["_id"])
             del log["_id"]
             return ActivityLog(**log)
-        return None
\ No newline at end of file
+        return None
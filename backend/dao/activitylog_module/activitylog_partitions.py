@@ -0,0 +1,55 @@
+import re
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from pymongo import IndexModel, ASCENDING
+from dao.activitylog_module.activitylog import utc_now
+
+TTL_INDEX = "date_ttl"
+
+
+def _next_month(month: datetime) -> datetime:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+class ActivityLogPartitions:
+    # naming and selection of the monthly activity log collections, <collection>_YYYYMM
+    def __init__(self, collection_name: str, indexes: List[IndexModel], retention_days: int = 0):
+        self.collection_name = collection_name
+        self.retention_days = retention_days
+        self._indexes = indexes
+        self._name_re = re.compile(rf"^{re.escape(collection_name)}_(\d{{6}})$")
+
+    def name_for(self, date: datetime) -> str:
+        return f"{self.collection_name}_{date:%Y%m}"
+
+    def indexes(self) -> List[IndexModel]:
+        indexes = list(self._indexes)
+        if self.retention_days:
+            indexes.append(IndexModel([("date", ASCENDING)], name=TTL_INDEX,
+                                      expireAfterSeconds=self.retention_days * 86400))
+        return indexes
+
+    def filter(self, collection_names: Iterable[str]) -> List[str]:
+        # newest first
+        return sorted((name for name in collection_names if self._name_re.match(name)), reverse=True)
+
+    def month_of(self, name: str) -> datetime:
+        return datetime.strptime(self._name_re.match(name).group(1), "%Y%m")
+
+    def between(self, names: List[str], since: Optional[datetime], until: Optional[datetime]) -> List[str]:
+        return [
+            name for name in names
+            if (since is None or _next_month(self.month_of(name)) > since)
+            and (until is None or self.month_of(name) <= until)
+        ]
+
+    def expired(self, names: List[str], now: Optional[datetime] = None) -> List[str]:
+        # partitions whose whole month is past retention
+        if not self.retention_days:
+            return []
+        cutoff = (now or utc_now()) - timedelta(days=self.retention_days)
+        return [name for name in names if _next_month(self.month_of(name)) <= cutoff]
+
+    def candidates_for_id(self, created: datetime) -> List[str]:
+        # an id's creation time names the month, its neighbours cover logs dated across a month boundary
+        return sorted({self.name_for(created + timedelta(days=offset)) for offset in (-1, 0, 1)}, reverse=True)
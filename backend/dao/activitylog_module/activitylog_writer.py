@@ -0,0 +1,106 @@
+import logging
+import queue
+import time
+from threading import Event, Lock, Thread
+from typing import Dict, List
+from dao.activitylog_module.activitylog import ActivityLog
+from dao.activitylog_module.iactivitylog_dao import IActivityLogDAO
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedActivityLogWriter:
+    # takes activity logs off the request path: they are queued in memory and written by a background
+    # thread with insert_many, once batch_size logs are waiting or flush_interval seconds have passed.
+    # a full queue blocks the caller for at most block_timeout seconds, then the log is dropped
+    def __init__(self, dao: IActivityLogDAO, max_queue: int, batch_size: int, flush_interval: float,
+                 block_timeout: float):
+        self._dao = dao
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+        self._queue: "queue.Queue[ActivityLog]" = queue.Queue(maxsize=max_queue)
+        self._stopping = Event()
+        self._lock = Lock()
+        self.submitted = 0
+        self.blocked = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self._thread = Thread(target=self._run, name="kms-activity-log", daemon=True)
+        self._thread.start()
+
+    def submit(self, log: ActivityLog) -> bool:
+        if self._stopping.is_set():
+            # the writer is gone, fall back to a direct write
+            return self._dao.save(log)
+        try:
+            self._queue.put_nowait(log)
+        except queue.Full:
+            with self._lock:
+                self.blocked += 1
+            try:
+                self._queue.put(log, timeout=self.block_timeout)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+                logger.warning("Activity log queue is full, dropping a log")
+                return False
+        with self._lock:
+            self.submitted += 1
+        return True
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                batch = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._stopping.is_set():
+                    # on shutdown whatever is already queued is written without waiting
+                    try:
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    except queue.Empty:
+                        break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[ActivityLog]):
+        try:
+            written = self._dao.saveMany(batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} activity logs: {str(e)}")
+            written = 0
+        with self._lock:
+            self.batches += 1
+            self.written += written
+            self.failed += len(batch) - written
+
+    def close(self, timeout: float = 10.0):
+        # drains the queue, logs submitted afterwards are written directly
+        self._stopping.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(f"Activity log writer still has {self._queue.qsize()} logs after {timeout}s")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_queue": self.max_queue,
+                "queued": self._queue.qsize(),
+                "submitted": self.submitted,
+                "blocked": self.blocked,
+                "dropped": self.dropped,
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches
+            }
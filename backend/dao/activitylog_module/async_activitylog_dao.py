@@ -0,0 +1,149 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+from pymongo import AsyncMongoClient, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure, PyMongoError
+from bson import ObjectId
+from dao.activitylog_module.activitylog import ActivityLog
+from dao.activitylog_module.activitylog_dao import ActivityLogDAO, INDEX_CONFLICT_CODES, INDEX_MISSING_CODES
+from dao.activitylog_module.activitylog_partitions import ActivityLogPartitions, TTL_INDEX
+from dao.activitylog_module.iasync_activitylog_dao import IAsyncActivityLogDAO
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, keyset_query, page_size, to_page
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncActivityLogDAO(IAsyncActivityLogDAO):
+    # same monthly partitions and rollups as ActivityLogDAO
+    def __init__(self, mongo_client: AsyncMongoClient, database_name: str, collection_name: str,
+                 retention_days: int = 0, hourly_rollup_days: int = 0):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection_name]
+        self.rollups = self.db[f"{collection_name}_rollups"]
+        self.partitions = ActivityLogPartitions(collection_name, ActivityLogDAO.INDEXES, retention_days)
+        self.hourly_rollup_days = hourly_rollup_days
+        self._prepared: Set[str] = set()
+
+    async def _partition(self, date: datetime):
+        name = self.partitions.name_for(date)
+        collection = self.db[name]
+        if name not in self._prepared:
+            await self.preparePartition(name)
+            self._prepared.add(name)
+        return collection
+
+    async def preparePartition(self, name: str) -> List[str]:
+        # same as ActivityLogDAO.preparePartition
+        collection = self.db[name]
+        missing = []
+        for index in self.partitions.indexes():
+            try:
+                await collection.create_indexes([index])
+            except OperationFailure as e:
+                if e.code in INDEX_CONFLICT_CODES and index.document["name"] == TTL_INDEX \
+                        and await self._set_ttl(name, index.document["expireAfterSeconds"]):
+                    continue
+                logger.error(f"Failed to create index {index.document['name']} on {name}: {e}")
+                missing.append(index.document["name"])
+            except PyMongoError as e:
+                logger.error(f"Failed to create index {index.document['name']} on {name}: {e}")
+                missing.append(index.document["name"])
+        if not self.partitions.retention_days:
+            try:
+                await collection.drop_index(TTL_INDEX)
+            except OperationFailure as e:
+                if e.code not in INDEX_MISSING_CODES:
+                    logger.error(f"Failed to drop index {TTL_INDEX} on {name}: {e}")
+            except PyMongoError as e:
+                logger.error(f"Failed to drop index {TTL_INDEX} on {name}: {e}")
+        return missing
+
+    async def _set_ttl(self, name: str, seconds: int) -> bool:
+        try:
+            await self.db.command("collMod", name, index={"name": TTL_INDEX, "expireAfterSeconds": seconds})
+            logger.info(f"Set {TTL_INDEX} on {name} to {seconds}s")
+            return True
+        except PyMongoError as e:
+            logger.error(f"Failed to update {TTL_INDEX} on {name}: {e}")
+            return False
+
+    async def save(self, log: ActivityLog, session=None) -> bool:
+        partition = await self._partition(log.date)
+        result = await partition.insert_one(ActivityLogDAO._to_doc(log), session=session)
+        operations = ActivityLogDAO.rollup_operations([log], self.hourly_rollup_days)
+        await self.rollups.bulk_write(operations, ordered=False, session=session)
+        return result.acknowledged
+
+    def _candidate_collections(self, activityLogId: str):
+        created = ObjectId(activityLogId).generation_time.replace(tzinfo=None)
+        return [self.db[name] for name in self.partitions.candidates_for_id(created)] + [self.collection]
+
+    async def findById(self, activityLogId: str) -> Optional[ActivityLog]:
+        for collection in self._candidate_collections(activityLogId):
+            log = await collection.find_one({"_id": ObjectId(activityLogId)})
+            if log:
+                return ActivityLogDAO._convert_log(log)
+        return None
+
+    async def _find(self, query: dict, since: Optional[datetime], until: Optional[datetime],
+                    limit: int) -> List[ActivityLog]:
+        query = dict(query, **ActivityLogDAO.date_filter(since, until))
+        names = self.partitions.between(self.partitions.filter(await self.db.list_collection_names()), since, until)
+        logs = []
+        for collection in [self.db[name] for name in names] + [self.collection]:
+            remaining = limit - len(logs)
+            if remaining <= 0:
+                break
+            cursor = collection.find(query).sort("date", DESCENDING).limit(remaining)
+            logs.extend([ActivityLogDAO._convert_log(log) async for log in cursor])
+        return logs
+
+    async def findByUser(self, userId: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                         limit: int = 100) -> List[ActivityLog]:
+        return await self._find({"userId": userId}, since, until, limit)
+
+    async def findByDocument(self, docId: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                             limit: int = 100) -> List[ActivityLog]:
+        return await self._find({"docId": docId}, since, until, limit)
+
+    async def findAll(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      limit: int = 100) -> List[ActivityLog]:
+        return await self._find({}, since, until, limit)
+
+    async def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        limit = page_size(limit)
+        query = keyset_query({}, after, descending=True)
+        names = self.partitions.filter(await self.db.list_collection_names())
+        if after is not None:
+            created = ObjectId(after).generation_time.replace(tzinfo=None)
+            names = self.partitions.between(names, None, created + timedelta(days=1))
+        docs = []
+        for collection in [self.db[name] for name in names] + [self.collection]:
+            remaining = limit + 1 - len(docs)
+            if remaining <= 0:
+                break
+            docs.extend([doc async for doc in collection.find(query).sort("_id", DESCENDING).limit(remaining)])
+        return to_page(docs, limit, ActivityLogDAO._convert_log)
+
+    async def findRollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                          action: Optional[str] = None, since: Optional[datetime] = None,
+                          until: Optional[datetime] = None) -> List[Dict[str, object]]:
+        cursor = self.rollups.find(ActivityLogDAO.rollup_query(granularity, dimension, key, action, since, until),
+                                   {"_id": 0, "expire_at": 0}).sort("bucket", ASCENDING)
+        return [rollup async for rollup in cursor]
+
+    async def update(self, log: ActivityLog) -> bool:
+        log_dict = log.dict()
+        log_id = ObjectId(log_dict['activityLogId'])
+        del log_dict['activityLogId']
+        for collection in self._candidate_collections(str(log_id)):
+            result = await collection.update_one({"_id": log_id}, {"$set": log_dict})
+            if result.matched_count:
+                return result.modified_count > 0
+        return False
+
+    async def delete(self, activityLogId: str) -> bool:
+        for collection in self._candidate_collections(activityLogId):
+            if (await collection.delete_one({"_id": ObjectId(activityLogId)})).deleted_count:
+                return True
+        return False
@@ -1,26 +1,52 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from pymongo import IndexModel
+from typing import Dict, List, Optional
 from dao.activitylog_module.activitylog import ActivityLog
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
 
 
 class IActivityLogDAO(ABC):
+    # indexes the queries of this dao rely on, provisioned by ManagementDAO.ensure_indexes
+    INDEXES: List[IndexModel] = []
+
     @abstractmethod
     def save(self, log: ActivityLog, session=None) -> bool: pass
 
+    @abstractmethod
+    def saveMany(self, logs: List[ActivityLog]) -> int: pass
+
     @abstractmethod
     def findById(self, activityLogId: str) -> Optional[ActivityLog]: pass
 
     @abstractmethod
-    def findByUser(self, userId: str) -> List[ActivityLog]: pass
+    def findByUser(self, userId: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    def findByDocument(self, docId: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                       limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    def findAll(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def findRollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                    action: Optional[str] = None, since: Optional[datetime] = None,
+                    until: Optional[datetime] = None) -> List[Dict[str, object]]: pass
 
     @abstractmethod
-    def findByDocument(self, docId: str) -> List[ActivityLog]: pass
+    def partitionNames(self) -> List[str]: pass
 
     @abstractmethod
-    def findAll(self) -> List[ActivityLog]: pass
+    def dropExpiredPartitions(self, now: Optional[datetime] = None) -> List[str]: pass
 
     @abstractmethod
     def update(self, log: ActivityLog) -> bool: pass
 
     @abstractmethod
-    def delete(self, activityLogId: str) -> bool: pass
\ No newline at end of file
+    def delete(self, activityLogId: str) -> bool: pass
@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+from dao.activitylog_module.activitylog import ActivityLog
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+
+
+class IAsyncActivityLogDAO(ABC):
+    @abstractmethod
+    async def save(self, log: ActivityLog, session=None) -> bool: pass
+
+    @abstractmethod
+    async def findById(self, activityLogId: str) -> Optional[ActivityLog]: pass
+
+    @abstractmethod
+    async def findByUser(self, userId: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                         limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    async def findByDocument(self, docId: str, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                             limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    async def findAll(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                      limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    async def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    async def findRollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                          action: Optional[str] = None, since: Optional[datetime] = None,
+                          until: Optional[datetime] = None) -> List[Dict[str, object]]: pass
+
+    @abstractmethod
+    async def update(self, log: ActivityLog) -> bool: pass
+
+    @abstractmethod
+    async def delete(self, activityLogId: str) -> bool: pass
@@ -0,0 +1,235 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pymongo import AsyncMongoClient
+from dao.user_module.user import User
+from dao.user_module.async_user_dao import AsyncUserDAO
+from dao.document_module.document import Document, Version
+from dao.document_module.async_document_dao import AsyncDocumentDAO
+from dao.department_module.department import Department
+from dao.department_module.async_department_dao import AsyncDepartmentDAO
+from dao.activitylog_module.activitylog import ActivityLog
+from dao.activitylog_module.async_activitylog_dao import AsyncActivityLogDAO
+from dao.permission_module.permission import Permission
+from dao.permission_module.async_permission_dao import AsyncPermissionDAO
+from dao.version_module.async_version_dao import AsyncVersionDAO
+from dao.iasync_management_dao import IAsyncManagementDAO
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+from utils.config_loader import get_collections, get_db_config, get_cache_config, get_activity_retention_config
+from utils.cache import TTLCache
+
+_MISSING = object()
+
+
+class AsyncManagementDAO(IAsyncManagementDAO):
+    def __init__(self, mongo_client=None, database_name=None, user_cache: Optional[TTLCache] = None,
+                 user_email_cache: Optional[TTLCache] = None, permission_cache: Optional[TTLCache] = None):
+        if mongo_client is None or database_name is None:
+            mongo_config = get_db_config()
+            mongo_client = AsyncMongoClient(mongo_config['uri'], tlsAllowInvalidCertificates=True)
+            database_name = mongo_config['db_name']
+
+        self.mongo_client = mongo_client
+        self.database_name = database_name
+
+        collects = get_collections()
+        cache_config = get_cache_config()
+
+        # daos
+        self.user_dao = AsyncUserDAO(self.mongo_client, self.database_name, collects['user_dao'])
+        self.document_dao = AsyncDocumentDAO(self.mongo_client, self.database_name, collects['document_dao'])
+        self.department_dao = AsyncDepartmentDAO(self.mongo_client, self.database_name, collects['department_dao'])
+        self.activity_log_dao = AsyncActivityLogDAO(self.mongo_client, self.database_name, collects['activity_log_dao'],
+                                                    **get_activity_retention_config())
+        self.permission_dao = AsyncPermissionDAO(self.mongo_client, self.database_name, collects['permission_dao'])
+        self.version_dao = AsyncVersionDAO(self.mongo_client, self.database_name, collects['version_dao'])
+
+        # pass the sync dao's caches in so both paths see the same invalidations
+        if user_cache is None:
+            user_cache = TTLCache(cache_config['user_cache_size'], cache_config['user_cache_ttl'])
+        if user_email_cache is None:
+            user_email_cache = TTLCache(cache_config['user_cache_size'], cache_config['user_cache_ttl'])
+        if permission_cache is None:
+            permission_cache = TTLCache(cache_config['permission_cache_size'], cache_config['permission_cache_ttl'])
+        self.user_cache = user_cache
+        self.user_email_cache = user_email_cache
+        self.permission_cache = permission_cache
+
+    async def close_connection(self):
+        await self.mongo_client.close()
+
+    # User
+    async def saveUser(self, user: User) -> bool:
+        return await self.user_dao.save(user)
+
+    async def findUserById(self, user_id: str) -> Optional[User]:
+        user = self.user_cache.get(user_id)
+        if user is None:
+            user = await self.user_dao.findById(user_id)
+            if user is None:
+                return None
+            self._cache_user(user)
+        return user.model_copy(deep=True)
+
+    async def findUserByEmail(self, email: str) -> Optional[User]:
+        user_id = self.user_email_cache.get(email)
+        user = self.user_cache.get(user_id) if user_id else None
+        if user is None or user.email != email:
+            user = await self.user_dao.findByEmail(email)
+            if user is None:
+                return None
+            self._cache_user(user)
+        return user.model_copy(deep=True)
+
+    def _cache_user(self, user: User):
+        self.user_cache.set(user.userId, user)
+        self.user_email_cache.set(user.email, user.userId)
+
+    async def findAllUsers(self) -> List[User]:
+        return await self.user_dao.findAll()
+
+    async def updateUser(self, user: User) -> bool:
+        updated = await self.user_dao.update(user)
+        self.user_cache.pop(user.userId)
+        return updated
+
+    async def deleteUser(self, user_id: str) -> bool:
+        deleted = await self.user_dao.delete(user_id)
+        self.user_cache.pop(user_id)
+        return deleted
+
+    # Document
+    async def findDocumentById(self, document_id: str) -> Optional[Document]:
+        return await self.document_dao.findById(document_id)
+
+    async def findDocumentsByIds(self, document_ids: List[str]) -> List[Document]:
+        return await self.document_dao.findByIds(document_ids)
+
+    async def findDocumentsByOwner(self, owner_id: str) -> List[Document]:
+        return await self.document_dao.findByOwner(owner_id)
+
+    async def findAllDocuments(self) -> List[Document]:
+        return await self.document_dao.findAll()
+
+    async def findAllDocumentsMeta(self) -> List[Document]:
+        return await self.document_dao.findAllMeta()
+
+    async def updateMetaData(self, document: Document) -> bool:
+        return await self.document_dao.updateMetaData(document)
+
+    async def _move_versions(self, document_id: str):
+        # same lazy move as the sync dao
+        embedded = await self.document_dao.findEmbeddedVersions(document_id)
+        if embedded is None:
+            return
+        await self.version_dao.saveMany(document_id, embedded)
+        await self.document_dao.markVersionsMoved(document_id)
+
+    async def addVersion(self, document_id: str, version: Version) -> bool:
+        await self._move_versions(document_id)
+        if not await self.version_dao.save(document_id, version):
+            return False
+        return await self.document_dao.setCurrentNumber(document_id, version.version_number)
+
+    async def getVersions(self, document_id: str) -> List[Version]:
+        await self._move_versions(document_id)
+        return await self.version_dao.findByDocument(document_id)
+
+    async def getVersionsPage(self, document_id: str, after: Optional[str] = None,
+                              limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        await self._move_versions(document_id)
+        return await self.version_dao.findPage(document_id, after, limit)
+
+    async def findVersion(self, document_id: str, version_number: int) -> Optional[Version]:
+        await self._move_versions(document_id)
+        return await self.version_dao.findOne(document_id, version_number)
+
+    async def restoreVersion(self, document_id: str, version_number: int) -> bool:
+        if not await self.findVersion(document_id, version_number):
+            return False
+        return await self.document_dao.setCurrentNumber(document_id, version_number)
+
+    # Permission
+    async def shareDocument(self, document_id: str, user_id: str, permissions: List[str]) -> bool:
+        try:
+            existing = await self.permission_dao.findByUserDoc(user_id, document_id)
+            if existing:
+                existing.permissions = sorted(set(existing.permissions + permissions))
+                return await self.permission_dao.update(existing)
+
+            permission = Permission(
+                userId=user_id,
+                docId=document_id,
+                permissions=permissions
+            )
+            return await self.permission_dao.save(permission)
+        finally:
+            self.permission_cache.pop((user_id, document_id))
+
+    async def removeShareDocument(self, document_id: str, user_id: str, permissions: List[str]) -> bool:
+        try:
+            user_permissions = await self.permission_dao.findByUserDoc(user_id, document_id)
+            if not user_permissions:
+                return False
+
+            if not user_permissions.remove_permissions(permissions):
+                return False
+
+            return await self.permission_dao.update(user_permissions)
+        except Exception:
+            return False
+        finally:
+            self.permission_cache.pop((user_id, document_id))
+
+    async def getPermissionsByDoc(self, document_id: str) -> List[Permission]:
+        return await self.permission_dao.findByDoc(document_id)
+
+    async def getPermissionsByUser(self, user_id: str) -> List[Permission]:
+        return await self.permission_dao.findByUser(user_id)
+
+    async def getPermissionsByUserPage(self, user_id: str, after: Optional[str] = None,
+                                       limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return await self.permission_dao.findByUserPage(user_id, after, limit)
+
+    async def getDocIdsByUserPermission(self, user_id: str, required: str,
+                                        doc_ids: Optional[List[str]] = None) -> List[str]:
+        return await self.permission_dao.findDocIdsByUser(user_id, required, doc_ids)
+
+    async def getPermissionsByUserDoc(self, user_id: str, doc_id: str) -> Optional[Permission]:
+        permission = self.permission_cache.get((user_id, doc_id), _MISSING)
+        if permission is _MISSING:
+            permission = await self.permission_dao.findByUserDoc(user_id, doc_id)
+            self.permission_cache.set((user_id, doc_id), permission)
+        return permission.model_copy(deep=True) if permission else None
+
+    # ActivityLog
+    async def saveActivitylog(self, log: ActivityLog) -> bool:
+        return await self.activity_log_dao.save(log)
+
+    async def findActivitylogsByDocument(self, document_id: str, since: Optional[datetime] = None,
+                                         until: Optional[datetime] = None, limit: int = 100) -> List[ActivityLog]:
+        return await self.activity_log_dao.findByDocument(document_id, since, until, limit)
+
+    async def findActivitylogsByUser(self, user_id: str, since: Optional[datetime] = None,
+                                     until: Optional[datetime] = None, limit: int = 100) -> List[ActivityLog]:
+        return await self.activity_log_dao.findByUser(user_id, since, until, limit)
+
+    async def findActivityRollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                                  action: Optional[str] = None, since: Optional[datetime] = None,
+                                  until: Optional[datetime] = None) -> List[Dict[str, object]]:
+        return await self.activity_log_dao.findRollups(granularity, dimension, key, action, since, until)
+
+    # Department
+    async def saveDepartment(self, department: Department) -> bool:
+        return await self.department_dao.save(department)
+
+    async def findDepartmentById(self, department_id: str) -> Optional[Department]:
+        return await self.department_dao.findById(department_id)
+
+    async def findAllDepartments(self) -> List[Department]:
+        return await self.department_dao.findAll()
+
+    async def updateDepartment(self, department: Department) -> bool:
+        return await self.department_dao.update(department)
+
+    async def deleteDepartment(self, department_id: str) -> bool:
+        return await self.department_dao.delete(department_id)
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from dao.blob_module.iblob import IBlob
+
+
+class Blob(BaseModel, IBlob):
+    checksum: str = Field(..., description="SHA-256 hex digest of the content, also the blob identifier")
+    size: int = Field(..., description="Size of the content in bytes")
+    contentType: str = Field("application/octet-stream", description="Content type of the first upload")
+    codec: Optional[str] = Field(None, description="Compression of the stored object, size is the original size")
+    refCount: int = Field(1, description="Number of document versions pointing at this blob")
+    createdAt: datetime = Field(default_factory=datetime.now, description="Date and time of the first upload")
+
+    def __init__(
+            self,
+            checksum: str,
+            size: int,
+            **kwargs
+    ):
+        super().__init__(
+            checksum=checksum,
+            size=size,
+            **kwargs
+        )
+
+    @staticmethod
+    def object_name_for(checksum: str, codec: Optional[str] = None) -> str:
+        # compressed copies get their own name, so the same bytes stored both ways never overwrite each other
+        return f"blobs/{checksum}.{codec}" if codec else f"blobs/{checksum}"
+
+    def to_json(self) -> str:
+        return self.model_dump_json()
+
+    def get_object_name(self) -> str:
+        return self.object_name_for(self.checksum, self.codec)
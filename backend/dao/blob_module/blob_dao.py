@@ -0,0 +1,76 @@
+from typing import List, Optional
+from pymongo import MongoClient, ReturnDocument, ASCENDING
+from pymongo.errors import DuplicateKeyError
+from dao.blob_module.iblob_dao import IBlobDAO
+from dao.blob_module.blob import Blob
+
+
+class BlobDAO(IBlobDAO):
+    # one record per stored blob, keyed by checksum, counting the versions that point at it
+
+    def __init__(self, mongo_client: MongoClient, database_name: str, collection_name: str):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection_name]
+
+    def save(self, blob: Blob) -> Optional[Blob]:
+        # returns the record now holding the reference. a concurrent upload of the same bytes may have
+        # created it first, possibly with another codec
+        blob_dict = blob.dict()
+        blob_dict["_id"] = blob_dict["checksum"]
+        del blob_dict["checksum"]
+        try:
+            return blob if self.collection.insert_one(blob_dict).acknowledged else None
+        except DuplicateKeyError:
+            acquired = self.acquire(blob.checksum)
+            if acquired:
+                return acquired
+            # the record is at zero and about to be dropped, take it over
+            doc = self.collection.find_one_and_update(
+                {"_id": blob.checksum, "refCount": {"$lte": 0}},
+                {"$set": {"refCount": blob.refCount, "codec": blob.codec}},
+                return_document=ReturnDocument.AFTER
+            )
+            return self._convert_blob(doc)
+
+    def findById(self, checksum: str) -> Optional[Blob]:
+        doc = self.collection.find_one({"_id": checksum})
+        return self._convert_blob(doc)
+
+    def findRange(self, after: Optional[str], until: Optional[str]) -> List[Blob]:
+        # checksums in (after, until], in the order storage lists blobs/<checksum>
+        query = {}
+        if after is not None:
+            query["$gt"] = after
+        if until is not None:
+            query["$lte"] = until
+        docs = self.collection.find({"_id": query} if query else {}).sort("_id", ASCENDING)
+        return [self._convert_blob(doc) for doc in docs]
+
+    def acquire(self, checksum: str) -> Optional[Blob]:
+        # only a live blob can gain a reference, one at zero is being deleted
+        doc = self.collection.find_one_and_update(
+            {"_id": checksum, "refCount": {"$gt": 0}},
+            {"$inc": {"refCount": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+        return self._convert_blob(doc)
+
+    def release(self, checksum: str) -> int:
+        doc = self.collection.find_one_and_update(
+            {"_id": checksum, "refCount": {"$gt": 0}},
+            {"$inc": {"refCount": -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        return doc["refCount"] if doc else 0
+
+    def deleteUnreferenced(self, checksum: str) -> bool:
+        result = self.collection.delete_one({"_id": checksum, "refCount": {"$lte": 0}})
+        return result.deleted_count > 0
+
+    @staticmethod
+    def _convert_blob(doc: dict) -> Optional[Blob]:
+        if doc:
+            doc["checksum"] = doc["_id"]
+            del doc["_id"]
+            return Blob(**doc)
+        return None
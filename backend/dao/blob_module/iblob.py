@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+
+
+class IBlob(ABC):
+    @abstractmethod
+    def to_json(self) -> str: pass
+
+    @abstractmethod
+    def get_object_name(self) -> str: pass
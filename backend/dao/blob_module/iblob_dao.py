@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from pymongo import IndexModel
+from typing import List, Optional
+from dao.blob_module.blob import Blob
+
+
+class IBlobDAO(ABC):
+    # indexes the queries of this dao rely on, provisioned by ManagementDAO.ensure_indexes
+    INDEXES: List[IndexModel] = []
+
+    @abstractmethod
+    def save(self, blob: Blob) -> Optional[Blob]: pass
+
+    @abstractmethod
+    def findById(self, checksum: str) -> Optional[Blob]: pass
+
+    @abstractmethod
+    def findRange(self, after: Optional[str], until: Optional[str]) -> List[Blob]: pass
+
+    @abstractmethod
+    def acquire(self, checksum: str) -> Optional[Blob]: pass
+
+    @abstractmethod
+    def release(self, checksum: str) -> int: pass
+
+    @abstractmethod
+    def deleteUnreferenced(self, checksum: str) -> bool: pass
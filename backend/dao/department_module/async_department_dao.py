@@ -0,0 +1,43 @@
+from typing import List, Optional
+from pymongo import AsyncMongoClient
+from bson import ObjectId
+from dao.department_module.iasync_department_dao import IAsyncDepartmentDAO
+from dao.department_module.department import Department
+from dao.department_module.department_dao import DepartmentDAO
+
+
+class AsyncDepartmentDAO(IAsyncDepartmentDAO):
+    def __init__(self, mongo_client: AsyncMongoClient, database_name: str, collection_name: str):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection_name]
+
+    async def save(self, department: Department) -> bool:
+        dept_dict = department.dict()
+        dept_dict["_id"] = ObjectId(dept_dict["departmentId"])
+        del dept_dict["departmentId"]
+        result = await self.collection.insert_one(dept_dict)
+        return result.acknowledged
+
+    async def findById(self, departmentId: str) -> Optional[Department]:
+        doc = await self.collection.find_one({"_id": ObjectId(departmentId)})
+        if doc:
+            return DepartmentDAO._convert_dept(doc)
+        return None
+
+    async def findAll(self) -> List[Department]:
+        docs = self.collection.find({})
+        return [DepartmentDAO._convert_dept(doc) async for doc in docs]
+
+    async def update(self, department: Department) -> bool:
+        dept_dict = department.dict()
+        departmentId = ObjectId(dept_dict["departmentId"])
+        del dept_dict["departmentId"]
+        result = await self.collection.update_one(
+            {"_id": departmentId},
+            {"$set": dept_dict}
+        )
+        return result.modified_count > 0
+
+    async def delete(self, departmentId: str) -> bool:
+        result = await self.collection.delete_one({"_id": ObjectId(departmentId)})
+        return result.deleted_count > 0
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from dao.department_module.department import Department
+
+
+class IAsyncDepartmentDAO(ABC):
+    @abstractmethod
+    async def save(self, department: Department) -> bool: pass
+
+    @abstractmethod
+    async def findById(self, departmentId: str) -> Optional[Department]: pass
+
+    @abstractmethod
+    async def findAll(self) -> List[Department]: pass
+
+    @abstractmethod
+    async def update(self, department: Department) -> bool: pass
+
+    @abstractmethod
+    async def delete(self, departmentId: str) -> bool: pass
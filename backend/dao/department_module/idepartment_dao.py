@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
+from pymongo import IndexModel
 from typing import List, Optional
 from dao.department_module.department import Department
 
 
 class IDepartmentDAO(ABC):
+    # indexes the queries of this dao rely on, provisioned by ManagementDAO.ensure_indexes
+    INDEXES: List[IndexModel] = []
+
     @abstractmethod
     def save(self, department: Department) -> bool: pass
 
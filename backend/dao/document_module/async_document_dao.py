@@ -0,0 +1,94 @@
+from typing import AsyncIterator, List, Optional
+from pymongo import AsyncMongoClient
+from bson import ObjectId
+from dao.document_module.iasync_document_dao import IAsyncDocumentDAO
+from dao.document_module.document import Document, Version
+from dao.document_module.document_dao import DocumentDAO
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, async_find_page, async_iter_all
+
+
+class AsyncDocumentDAO(IAsyncDocumentDAO):
+    def __init__(self, mongo_client: AsyncMongoClient, database_name: str, collection: str):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection]
+
+    async def save(self, document: Document) -> bool:
+        doc_dict = document.dict()
+        doc_dict["_id"] = ObjectId(doc_dict["documentId"])  # string to ObjectId
+        del doc_dict["documentId"]
+        doc_dict["versions"] = doc_dict["versions"][:1]
+        doc_dict[DocumentDAO.VERSIONS_MOVED] = True
+        doc_dict[DocumentDAO.VERSION_COUNTER] = doc_dict["currentNumber"]
+        result = await self.collection.insert_one(doc_dict)
+        return result.acknowledged
+
+    async def findById(self, documentId: str) -> Optional[Document]:
+        doc = await self.collection.find_one({"_id": ObjectId(documentId)})
+        return DocumentDAO._convert_meta(doc) if doc else None
+
+    async def findByIds(self, documentIds: List[str]) -> List[Document]:
+        object_ids = [ObjectId(doc_id) for doc_id in documentIds if ObjectId.is_valid(doc_id)]
+        if not object_ids:
+            return []
+        docs = self.collection.find({"_id": {"$in": object_ids}}, DocumentDAO.META_PROJECTION)
+        found = {str(doc["_id"]): DocumentDAO._convert_meta(doc) async for doc in docs}
+        return [found[doc_id] for doc_id in documentIds if doc_id in found]
+
+    async def findByName(self, name: str) -> Optional[Document]:
+        doc = await self.collection.find_one({"name": name})
+        return DocumentDAO._convert_doc(doc) if doc else None
+
+    async def findByOwner(self, owner: str) -> List[Document]:
+        docs = self.collection.find({"owner": owner})
+        return [DocumentDAO._convert_doc(doc) async for doc in docs]
+
+    async def findByOwnerPage(self, owner: str, after: Optional[str] = None,
+                              limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return await async_find_page(self.collection, {"owner": owner}, after, limit, DocumentDAO._convert_meta,
+                                     DocumentDAO.META_PROJECTION)
+
+    async def findAll(self) -> List[Document]:
+        docs = self.collection.find({})
+        return [DocumentDAO._convert_doc(doc) async for doc in docs]
+
+    async def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return await async_find_page(self.collection, {}, after, limit, DocumentDAO._convert_meta,
+                                     DocumentDAO.META_PROJECTION)
+
+    async def findAllMeta(self) -> List[Document]:
+        return [doc async for doc in self.iterAllMeta()]
+
+    def iterAllMeta(self) -> AsyncIterator[Document]:
+        return async_iter_all(self.collection, {}, DocumentDAO._convert_meta, DocumentDAO.META_PROJECTION)
+
+    async def updateMetaData(self, document: Document) -> bool:
+        doc_dict = document.dict(exclude={"versions"})
+        document_id = ObjectId(doc_dict["documentId"])
+        del doc_dict["documentId"]
+        result = await self.collection.update_one(
+            {"_id": document_id}, {"$set": doc_dict}
+        )
+        return result.modified_count > 0
+
+    async def delete(self, documentId: str, session=None) -> bool:
+        result = await self.collection.delete_one({"_id": ObjectId(documentId)})
+        return result.deleted_count > 0
+
+    async def setCurrentNumber(self, documentId: str, version_number: int) -> bool:
+        result = await self.collection.update_one(
+            {"_id": ObjectId(documentId)}, {"$set": {"currentNumber": version_number}}
+        )
+        return result.matched_count > 0
+
+    async def findEmbeddedVersions(self, documentId: str) -> Optional[List[Version]]:
+        doc = await self.collection.find_one(
+            {"_id": ObjectId(documentId), DocumentDAO.VERSIONS_MOVED: {"$ne": True}}, {"versions": 1}
+        )
+        return [Version(**v) for v in doc.get("versions", [])] if doc else None
+
+    async def markVersionsMoved(self, documentId: str) -> bool:
+        result = await self.collection.update_one(
+            {"_id": ObjectId(documentId)},
+            {"$push": {"versions": {"$each": [], "$slice": 1}}, "$set": {DocumentDAO.VERSIONS_MOVED: True}}
+        )
+        return result.matched_count > 0
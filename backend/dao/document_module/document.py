@@ -10,6 +10,9 @@ class Version(BaseModel):
     modified_by: str = Field(..., description="User ID who modified this version")
     modification_date: datetime = Field(..., description="Date and time of modification")
     file_size: int = Field(..., description="Size of the file in bytes")
+    checksum: Optional[str] = Field(None, description="SHA-256 hex digest of the content")
+    object_name: Optional[str] = Field(None, description="Storage object holding the content, None for {documentId}/v{n}")
+    codec: Optional[str] = Field(None, description="Compression of the stored object, file_size is the original size")
 
 
 class Document(BaseModel, IDocument):
@@ -105,13 +108,17 @@ class Document(BaseModel, IDocument):
             return True
         return False
 
-    def set_version(self, modified_by: str, file_size: int) -> bool:
-        new_version_number = self.set_current_version_number(self.currentNumber + 1)
+    def set_version(self, modified_by: str, file_size: int, checksum: Optional[str] = None,
+                    object_name: Optional[str] = None) -> bool:
+        if not self.set_current_version_number(self.currentNumber + 1):
+            return False
         new_version = Version(
-            version_number=new_version_number,
+            version_number=self.currentNumber,
             modified_by=modified_by,
             modification_date=datetime.now(),
-            size=file_size
+            file_size=file_size,
+            checksum=checksum,
+            object_name=object_name
         )
         self.versions.append(new_version)
 
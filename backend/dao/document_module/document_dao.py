@@ -1,11 +1,24 @@
-from typing import List, Optional
-from pymongo import MongoClient
+from typing import Dict, Iterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, find_page, iter_all
+from pymongo import MongoClient, IndexModel, ASCENDING, ReturnDocument
 from bson import ObjectId
 from dao.document_module.idocument_dao import IDocumentDAO
 from dao.document_module.document import Document, Version
 
 
 class DocumentDAO(IDocumentDAO):
+    INDEXES = [
+        IndexModel([("name", ASCENDING)], name="name"),
+        # owner's documents in _id order, for keyset pages
+        IndexModel([("owner", ASCENDING), ("_id", ASCENDING)], name="owner_id"),
+    ]
+    # metadata reads only carry the first version, the one that records the upload
+    META_PROJECTION = {"versions": {"$slice": 1}}
+    # set once the version history lives in the versions collection, documents without it still embed theirs
+    VERSIONS_MOVED = "versionsMoved"
+    # highest version number handed out, only grows. currentNumber is the version readers get
+    VERSION_COUNTER = "versionCounter"
+
     def __init__(self, mongo_client: MongoClient, database_name: str, collection: str):
         self.db = mongo_client[database_name]
         self.collection = self.db[collection]
@@ -14,35 +27,57 @@ class DocumentDAO(IDocumentDAO):
         doc_dict = document.dict()
         doc_dict["_id"] = ObjectId(doc_dict["documentId"])  # string to ObjectId
         del doc_dict["documentId"]
+        doc_dict["versions"] = doc_dict["versions"][:1]
+        doc_dict[self.VERSIONS_MOVED] = True
+        doc_dict[self.VERSION_COUNTER] = doc_dict["currentNumber"]
         result = self.collection.insert_one(doc_dict)
         return result.acknowledged
 
     def findById(self, documentId: str) -> Optional[Document]:
         doc = self.collection.find_one({"_id": ObjectId(documentId)})
-        if doc:
-            doc["documentId"] = str(doc["_id"])
-            del doc["_id"]
-            doc["file_size"] = doc["versions"][0]["file_size"]
-            doc["modification_date"] = doc["versions"][0]["modification_date"]
-            doc.pop("versions", None)
+        return self._convert_meta(doc) if doc else None
 
-            return Document(**doc)
-        return None
+    def findByIds(self, documentIds: List[str]) -> List[Document]:
+        # one $in query, only the first version is projected to rebuild the metadata
+        object_ids = [ObjectId(doc_id) for doc_id in documentIds if ObjectId.is_valid(doc_id)]
+        if not object_ids:
+            return []
+        docs = self.collection.find({"_id": {"$in": object_ids}}, self.META_PROJECTION)
+        found = {str(doc["_id"]): self._convert_meta(doc) for doc in docs}
+        return [found[doc_id] for doc_id in documentIds if doc_id in found]
 
     def findByName(self, name: str) -> Optional[Document]:
         doc = self.collection.find_one({"name": name})
         return self._convert_doc(doc) if doc else None
 
-    def findByOwner(self, ownerId: str) -> List[Document]:
-        docs = self.collection.find({"owner": ObjectId(ownerId)})
-        return [self._convert_doc(doc) for doc in docs]
+    def findByOwner(self, owner: str) -> List[Document]:
+        return list(self.iterByOwner(owner))
+
+    def findByOwnerPage(self, owner: str, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        # owner is the uploader's email, as stored on the document
+        return find_page(self.collection, {"owner": owner}, after, limit, self._convert_meta, self.META_PROJECTION)
+
+    def iterByOwner(self, owner: str) -> Iterator[Document]:
+        return iter_all(self.collection, {"owner": owner}, self._convert_doc)
 
     def findAll(self) -> List[Document]:
-        docs = self.collection.find({})
-        return [self._convert_doc(doc) for doc in docs]
+        return list(self.iterAll())
+
+    def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return find_page(self.collection, {}, after, limit, self._convert_meta, self.META_PROJECTION)
+
+    def iterAll(self) -> Iterator[Document]:
+        return iter_all(self.collection, {}, self._convert_doc)
+
+    def findAllMeta(self) -> List[Document]:
+        return list(self.iterAllMeta())
+
+    def iterAllMeta(self) -> Iterator[Document]:
+        # metadata of every document without the version history
+        return iter_all(self.collection, {}, self._convert_meta, self.META_PROJECTION)
 
     def updateMetaData(self, document: Document) -> bool:
-        doc_dict = document.dict()
+        doc_dict = document.dict(exclude={"versions"})  # metadata objects only carry the first version
         document_id = ObjectId(doc_dict["documentId"])
         del doc_dict["documentId"]
         result = self.collection.update_one(
@@ -54,34 +89,98 @@ class DocumentDAO(IDocumentDAO):
         result = self.collection.delete_one({"_id": ObjectId(documentId)})
         return result.deleted_count > 0
 
-    def addVersion(self, documentId: str, version: Version) -> bool:
-        result = self.collection.update_one(
-            {"_id": ObjectId(documentId)},
-            {"$push": {"versions": version.dict()}}
+    def claimNextVersion(self, documentId: str, expected: Optional[int] = None) -> Optional[dict]:
+        # one round trip, $inc hands every writer its own number; with expected, only a writer that saw it gets one.
+        # currentNumber is left alone until the version record is written
+        query = {"_id": ObjectId(documentId)}
+        if expected is not None:
+            query["currentNumber"] = expected
+        return self.collection.find_one_and_update(
+            query, {"$inc": {self.VERSION_COUNTER: 1}},
+            projection={"currentNumber": 1, self.VERSION_COUNTER: 1, self.VERSIONS_MOVED: 1},
+            return_document=ReturnDocument.AFTER
         )
-        return result.modified_count > 0
 
-    def getVersions(self, documentId: str) -> List[Version]:
-        doc = self.collection.find_one({"_id": ObjectId(documentId)}, {"versions": 1})  # only versions
-        versions = doc.get("versions", []) if doc else []
-        return [Version(**v) for v in versions]  # mongo_dict -> version object
+    def raiseVersionCounter(self, documentId: str, version_number: int) -> bool:
+        # documents stored before the counter start it from their highest version
+        result = self.collection.update_one({"_id": ObjectId(documentId)},
+                                            {"$max": {self.VERSION_COUNTER: version_number}})
+        return result.matched_count > 0
 
-    def restoreVersion(self, documentId: str, version_number: int) -> bool:
-        doc = self.collection.find_one({"_id": ObjectId(documentId)}, {"versions": 1})
+    def advanceCurrentNumber(self, documentId: str, version_number: int,
+                             expected: Optional[int] = None) -> Optional[int]:
+        # points the document at a version whose record is already written. with expected, only a writer that
+        # saw it wins; without, the number only grows, so a slower writer never moves it back.
+        # returns currentNumber afterwards, None once the document is gone
+        query = {"_id": ObjectId(documentId)}
+        query["currentNumber"] = expected if expected is not None else {"$lt": version_number}
+        doc = self.collection.find_one_and_update(query, {"$set": {"currentNumber": version_number}},
+                                                  projection={"currentNumber": 1},
+                                                  return_document=ReturnDocument.AFTER)
         if doc:
-            for version in doc.get("versions", []):
-                if version["version_number"] == version_number:
-                    result = self.collection.update_one(
-                        {"_id": ObjectId(documentId)},
-                        {"$set": {"currentNumber": version_number}}
-                    )
-                    return result.modified_count > 0
-        return False
+            return doc["currentNumber"]
+        return self.findCurrentNumber(documentId)
+
+    def findCurrentNumber(self, documentId: str) -> Optional[int]:
+        doc = self.collection.find_one({"_id": ObjectId(documentId)}, {"currentNumber": 1})
+        return doc["currentNumber"] if doc else None
+
+    def setCurrentNumber(self, documentId: str, version_number: int) -> bool:
+        result = self.collection.update_one(
+            {"_id": ObjectId(documentId)}, {"$set": {"currentNumber": version_number}}
+        )
+        return result.matched_count > 0
+
+    def findEmbeddedVersions(self, documentId: str) -> Optional[List[Version]]:
+        # None once the history has moved to the versions collection
+        doc = self.collection.find_one({"_id": ObjectId(documentId), self.VERSIONS_MOVED: {"$ne": True}},
+                                       {"versions": 1})
+        return [Version(**v) for v in doc.get("versions", [])] if doc else None
+
+    def findEmbeddedVersionNumbers(self, documentIds: List[str]) -> Dict[str, Optional[List[int]]]:
+        # one $in query over the existing documents, None for those whose history has moved
+        object_ids = [ObjectId(doc_id) for doc_id in documentIds if ObjectId.is_valid(doc_id)]
+        docs = self.collection.find({"_id": {"$in": object_ids}},
+                                    {"versions.version_number": 1, self.VERSIONS_MOVED: 1})
+        return {
+            str(doc["_id"]): None if doc.get(self.VERSIONS_MOVED)
+            else [v["version_number"] for v in doc.get("versions", [])]
+            for doc in docs
+        }
+
+    def markVersionsMoved(self, documentId: str) -> bool:
+        # the upload version stays embedded, metadata reads rebuild the document from it
+        result = self.collection.update_one(
+            {"_id": ObjectId(documentId)},
+            {"$push": {"versions": {"$each": [], "$slice": 1}}, "$set": {self.VERSIONS_MOVED: True}}
+        )
+        return result.matched_count > 0
+
+    # mong_dict -> metadata object rebuilt from the initial version
+    @staticmethod
+    def _convert_meta(doc: dict) -> Document:
+        doc["documentId"] = str(doc["_id"])
+        del doc["_id"]
+        doc.pop(DocumentDAO.VERSIONS_MOVED, None)
+        doc.pop(DocumentDAO.VERSION_COUNTER, None)
+        initial = doc.pop("versions")[0]
+        doc["file_size"] = initial["file_size"]
+        doc["modification_date"] = initial["modification_date"]
+        document = Document(**doc)
+        document.versions = [Version(**initial)]  # keeps checksum and object_name
+        return document
 
     # mong_dict -> object
     @staticmethod
     def _convert_doc(doc: dict) -> Document:
         doc["documentId"] = str(doc["_id"])
         del doc["_id"]
-        return Document(**doc)
+        doc.pop(DocumentDAO.VERSIONS_MOVED, None)
+        doc.pop(DocumentDAO.VERSION_COUNTER, None)
+        versions = doc.pop("versions")
+        doc["file_size"] = versions[0]["file_size"]
+        doc["modification_date"] = versions[0]["modification_date"]
+        document = Document(**doc)
+        document.versions = [Version(**v) for v in versions]
+        return document
 
@@ -0,0 +1,7 @@
+class VersionConflictError(Exception):
+    # the document moved past the version an edit was based on
+    def __init__(self, document_id: str, expected: int, current: int):
+        super().__init__(f"Document {document_id} is at version {current}, not {expected}")
+        self.document_id = document_id
+        self.expected = expected
+        self.current = current
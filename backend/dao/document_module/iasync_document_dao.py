@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+from dao.document_module.document import Document, Version
+
+
+class IAsyncDocumentDAO(ABC):
+    @abstractmethod
+    async def save(self, document: Document) -> bool: pass
+
+    @abstractmethod
+    async def findById(self, documentId: str) -> Optional[Document]: pass
+
+    @abstractmethod
+    async def findByIds(self, documentIds: List[str]) -> List[Document]: pass
+
+    @abstractmethod
+    async def findByName(self, name: str) -> Optional[Document]: pass
+
+    @abstractmethod
+    async def findByOwner(self, owner: str) -> List[Document]: pass
+
+    @abstractmethod
+    async def findByOwnerPage(self, owner: str, after: Optional[str] = None,
+                              limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    async def findAll(self) -> List[Document]: pass
+
+    @abstractmethod
+    async def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    async def findAllMeta(self) -> List[Document]: pass
+
+    @abstractmethod
+    def iterAllMeta(self) -> AsyncIterator[Document]: pass
+
+    @abstractmethod
+    async def updateMetaData(self, document: Document) -> bool: pass
+
+    @abstractmethod
+    async def delete(self, documentId: str, session=None) -> bool: pass
+
+    @abstractmethod
+    async def setCurrentNumber(self, documentId: str, version_number: int) -> bool: pass
+
+    @abstractmethod
+    async def findEmbeddedVersions(self, documentId: str) -> Optional[List[Version]]: pass
+
+    @abstractmethod
+    async def markVersionsMoved(self, documentId: str) -> bool: pass
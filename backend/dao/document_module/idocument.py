@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 
 class IDocument(ABC):
@@ -33,4 +34,5 @@ class IDocument(ABC):
     def set_current_version_number(self, new_version_number: int) -> bool: pass
 
     @abstractmethod
-    def set_version(self, modified_by: str, file_size: int) -> bool: pass
\ No newline at end of file
+    def set_version(self, modified_by: str, file_size: int, checksum: Optional[str] = None,
+                    object_name: Optional[str] = None) -> bool: pass
\ No newline at end of file
@@ -1,24 +1,50 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from pymongo import IndexModel
+from typing import Dict, Iterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
 from dao.document_module.document import Document, Version
 
 
 class IDocumentDAO(ABC):
+    # indexes the queries of this dao rely on, provisioned by ManagementDAO.ensure_indexes
+    INDEXES: List[IndexModel] = []
+
     @abstractmethod
     def save(self, document: Document) -> bool: pass
 
     @abstractmethod
     def findById(self, documentId: str) -> Optional[Document]: pass
 
+    @abstractmethod
+    def findByIds(self, documentIds: List[str]) -> List[Document]: pass
+
     @abstractmethod
     def findByName(self, name: str) -> Optional[Document]: pass
 
     @abstractmethod
-    def findByOwner(self, ownerId: str) -> List[Document]: pass
+    def findByOwner(self, owner: str) -> List[Document]: pass
+
+    @abstractmethod
+    def findByOwnerPage(self, owner: str, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def iterByOwner(self, owner: str) -> Iterator[Document]: pass
 
     @abstractmethod
     def findAll(self) -> List[Document]: pass
 
+    @abstractmethod
+    def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def iterAll(self) -> Iterator[Document]: pass
+
+    @abstractmethod
+    def findAllMeta(self) -> List[Document]: pass
+
+    @abstractmethod
+    def iterAllMeta(self) -> Iterator[Document]: pass
+
     @abstractmethod
     def updateMetaData(self, document: Document) -> bool: pass
 
@@ -26,10 +52,26 @@ class IDocumentDAO(ABC):
     def delete(self, documentId: str, session=None) -> bool: pass
 
     @abstractmethod
-    def addVersion(self, documentId: str, version: Version) -> bool: pass
+    def claimNextVersion(self, documentId: str, expected: Optional[int] = None) -> Optional[dict]: pass
+
+    @abstractmethod
+    def raiseVersionCounter(self, documentId: str, version_number: int) -> bool: pass
+
+    @abstractmethod
+    def advanceCurrentNumber(self, documentId: str, version_number: int,
+                             expected: Optional[int] = None) -> Optional[int]: pass
+
+    @abstractmethod
+    def findCurrentNumber(self, documentId: str) -> Optional[int]: pass
+
+    @abstractmethod
+    def setCurrentNumber(self, documentId: str, version_number: int) -> bool: pass
+
+    @abstractmethod
+    def findEmbeddedVersions(self, documentId: str) -> Optional[List[Version]]: pass
 
     @abstractmethod
-    def getVersions(self, documentId: str) -> List[Version]: pass
+    def findEmbeddedVersionNumbers(self, documentIds: List[str]) -> Dict[str, Optional[List[int]]]: pass
 
     @abstractmethod
-    def restoreVersion(self, documentId: str, version_number: int) -> bool: pass
\ No newline at end of file
+    def markVersionsMoved(self, documentId: str) -> bool: pass
\ No newline at end of file
@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+from dao.user_module.user import User
+from dao.document_module.document import Document, Version
+from dao.department_module.department import Department
+from dao.activitylog_module.activitylog import ActivityLog
+from dao.permission_module.permission import Permission
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+
+
+class IAsyncManagementDAO(ABC):
+    # async counterpart of IManagementDAO for the metadata held in mongo,
+    # object storage (content) stays on the sync dao
+    @abstractmethod
+    async def close_connection(self):
+        pass
+
+    # User
+    @abstractmethod
+    async def saveUser(self, user: User) -> bool: pass
+
+    @abstractmethod
+    async def findUserById(self, user_id: str) -> Optional[User]: pass
+
+    @abstractmethod
+    async def findUserByEmail(self, email: str) -> Optional[User]: pass
+
+    @abstractmethod
+    async def findAllUsers(self) -> List[User]: pass
+
+    @abstractmethod
+    async def updateUser(self, user: User) -> bool: pass
+
+    @abstractmethod
+    async def deleteUser(self, user_id: str) -> bool: pass
+
+    # Document
+    @abstractmethod
+    async def findDocumentById(self, document_id: str) -> Optional[Document]: pass
+
+    @abstractmethod
+    async def findDocumentsByIds(self, document_ids: List[str]) -> List[Document]: pass
+
+    @abstractmethod
+    async def findDocumentsByOwner(self, owner_id: str) -> List[Document]: pass
+
+    @abstractmethod
+    async def findAllDocuments(self) -> List[Document]: pass
+
+    @abstractmethod
+    async def findAllDocumentsMeta(self) -> List[Document]: pass
+
+    @abstractmethod
+    async def updateMetaData(self, document: Document) -> bool: pass
+
+    @abstractmethod
+    async def addVersion(self, document_id: str, version: Version) -> bool: pass
+
+    @abstractmethod
+    async def getVersions(self, document_id: str) -> List[Version]: pass
+
+    @abstractmethod
+    async def getVersionsPage(self, document_id: str, after: Optional[str] = None,
+                              limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    async def findVersion(self, document_id: str, version_number: int) -> Optional[Version]: pass
+
+    @abstractmethod
+    async def restoreVersion(self, document_id: str, version_number: int) -> bool: pass
+
+    # Permission
+    @abstractmethod
+    async def shareDocument(self, document_id: str, user_id: str, permissions: List[str]) -> bool: pass
+
+    @abstractmethod
+    async def removeShareDocument(self, document_id: str, user_id: str, permissions: List[str]) -> bool: pass
+
+    @abstractmethod
+    async def getPermissionsByDoc(self, document_id: str) -> List[Permission]: pass
+
+    @abstractmethod
+    async def getPermissionsByUser(self, user_id: str) -> List[Permission]: pass
+
+    @abstractmethod
+    async def getPermissionsByUserPage(self, user_id: str, after: Optional[str] = None,
+                                       limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    async def getDocIdsByUserPermission(self, user_id: str, required: str,
+                                        doc_ids: Optional[List[str]] = None) -> List[str]: pass
+
+    @abstractmethod
+    async def getPermissionsByUserDoc(self, user_id: str, doc_id: str) -> Optional[Permission]: pass
+
+    # ActivityLog
+    @abstractmethod
+    async def saveActivitylog(self, log: ActivityLog) -> bool: pass
+
+    @abstractmethod
+    async def findActivitylogsByDocument(self, document_id: str, since: Optional[datetime] = None,
+                                         until: Optional[datetime] = None, limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    async def findActivitylogsByUser(self, user_id: str, since: Optional[datetime] = None,
+                                     until: Optional[datetime] = None, limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    async def findActivityRollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                                  action: Optional[str] = None, since: Optional[datetime] = None,
+                                  until: Optional[datetime] = None) -> List[Dict[str, object]]: pass
+
+    # Department
+    @abstractmethod
+    async def saveDepartment(self, department: Department) -> bool: pass
+
+    @abstractmethod
+    async def findDepartmentById(self, department_id: str) -> Optional[Department]: pass
+
+    @abstractmethod
+    async def findAllDepartments(self) -> List[Department]: pass
+
+    @abstractmethod
+    async def updateDepartment(self, department: Department) -> bool: pass
+
+    @abstractmethod
+    async def deleteDepartment(self, department_id: str) -> bool: pass
@@ -1,16 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, BinaryIO
+from typing import List, Optional, BinaryIO, Dict, Iterator, Set, Tuple
+from datetime import datetime, timedelta
 from dao.user_module.user import User
 from dao.document_module.document import Document, Version
 from dao.department_module.department import Department
 from dao.activitylog_module.activitylog import ActivityLog
 from dao.permission_module.permission import Permission
+from dao.text_module.text import DocumentText
+from dao.blob_module.blob import Blob
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
 
 
 class IManagementDAO(ABC):
     @abstractmethod
     def close_connection(self): pass
 
+    @abstractmethod
+    def ensure_indexes(self) -> Dict[str, Dict[str, List[str]]]: pass
+
+    @abstractmethod
+    def cache_stats(self) -> Dict[str, Dict[str, float]]: pass
+
     # User
     @abstractmethod
     def saveUser(self, user: User) -> bool: pass
@@ -24,6 +34,9 @@ class IManagementDAO(ABC):
     @abstractmethod
     def findAllUsers(self) -> List[User]: pass
 
+    @abstractmethod
+    def findAllUsersPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
     @abstractmethod
     def updateUser(self, user: User) -> bool: pass
 
@@ -35,22 +48,52 @@ class IManagementDAO(ABC):
     def saveDocument(self, document: Document, content: Optional[BinaryIO] = None) -> dict: pass
 
     @abstractmethod
-    def get_document_content(self, document_id: str, version_num: Optional[int] = None) -> Optional[BinaryIO]: pass
+    def get_document_content(self, document_id: str, version_num: Optional[int] = None,
+                             offset: int = 0, length: int = 0, decode: bool = True) -> Optional[BinaryIO]: pass
+
+    @abstractmethod
+    def stat_document_content(self, document_id: str, version_num: Optional[int] = None) -> Optional[Dict[str, object]]: pass
+
+    @abstractmethod
+    def get_document_content_url(self, document_id: str, version_num: Optional[int] = None,
+                                 expires: timedelta = timedelta(minutes=5),
+                                 accept_encodings: Tuple[str, ...] = ()) -> Optional[str]: pass
 
     @abstractmethod
     def findDocumentById(self, document_id: str) -> Optional[Document]: pass
 
+    @abstractmethod
+    def findDocumentsByIds(self, document_ids: List[str]) -> List[Document]: pass
+
     @abstractmethod
     def findDocumentsByOwner(self, owner_id: str) -> List[Document]: pass
 
+    @abstractmethod
+    def findDocumentsByOwnerPage(self, owner_id: str, after: Optional[str] = None,
+                                 limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
     @abstractmethod
     def findAllDocuments(self) -> List[Document]: pass
 
+    @abstractmethod
+    def findAllDocumentsPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def findAllDocumentsMeta(self) -> List[Document]: pass
+
+    @abstractmethod
+    def iterAllDocumentsMeta(self) -> Iterator[Document]: pass
+
     @abstractmethod
     def updateMetaData(self, document: Document) -> bool: pass
 
     @abstractmethod
-    def update_content(self, modified_by: str, document_id: str, content: BinaryIO, size: int) -> bool: pass
+    def update_content(self, modified_by: str, document_id: str, content: BinaryIO,
+                       expected_version: Optional[int] = None, content_type: Optional[str] = None) -> Optional[int]: pass
+
+    @abstractmethod
+    def restore_content(self, modified_by: str, document_id: str, version_number: int,
+                        expected_version: Optional[int] = None) -> Optional[int]: pass
 
     @abstractmethod
     def deleteDocument(self, user_id: str, document_id: str) -> bool: pass
@@ -61,6 +104,18 @@ class IManagementDAO(ABC):
     @abstractmethod
     def getVersions(self, document_id: str) -> List[Version]: pass
 
+    @abstractmethod
+    def getVersionsPage(self, document_id: str, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def findVersion(self, document_id: str, version_number: int) -> Optional[Version]: pass
+
+    @abstractmethod
+    def removeVersions(self, document_id: str, versions: List[Version]) -> int: pass
+
+    @abstractmethod
+    def findVersionNumbers(self, document_ids: List[str]) -> Dict[str, Set[int]]: pass
+
     @abstractmethod
     def restoreVersion(self, document_id: str, version_number: int) -> bool: pass
 
@@ -77,6 +132,14 @@ class IManagementDAO(ABC):
     @abstractmethod
     def getPermissionsByUser(self, user_id: str) -> List[Permission]: pass
 
+    @abstractmethod
+    def getPermissionsByUserPage(self, user_id: str, after: Optional[str] = None,
+                                 limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def getDocIdsByUserPermission(self, user_id: str, required: str,
+                                  doc_ids: Optional[List[str]] = None) -> List[str]: pass
+
     @abstractmethod
     def getPermissionsByUserDoc(self, user_id: str, doc_id: str) -> Optional[Permission]: pass
 
@@ -104,16 +167,62 @@ class IManagementDAO(ABC):
     def findActivitylogById(self, log_id: str) -> Optional[ActivityLog]: pass
 
     @abstractmethod
-    def findActivitylogsByUser(self, user_id: str) -> List[ActivityLog]: pass
+    def findActivitylogsByUser(self, user_id: str, since: Optional[datetime] = None,
+                               until: Optional[datetime] = None, limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    def findActivitylogsByDocument(self, document_id: str, since: Optional[datetime] = None,
+                                   until: Optional[datetime] = None, limit: int = 100) -> List[ActivityLog]: pass
+
+    @abstractmethod
+    def findAllActivitylogs(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                            limit: int = 100) -> List[ActivityLog]: pass
 
     @abstractmethod
-    def findActivitylogsByDocument(self, document_id: str) -> List[ActivityLog]: pass
+    def findAllActivitylogsPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
 
     @abstractmethod
-    def findAllActivitylogs(self) -> List[ActivityLog]: pass
+    def findActivityRollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                            action: Optional[str] = None, since: Optional[datetime] = None,
+                            until: Optional[datetime] = None) -> List[Dict[str, object]]: pass
+
+    @abstractmethod
+    def dropExpiredActivityPartitions(self) -> List[str]: pass
 
     @abstractmethod
     def updateActivitylog(self, log: ActivityLog) -> bool: pass
 
     @abstractmethod
-    def deleteActivitylog(self, log_id: str) -> bool: pass
\ No newline at end of file
+    def deleteActivitylog(self, log_id: str) -> bool: pass
+
+    # storage
+    @abstractmethod
+    def deleteDocs(self, object_names: List[str]) -> List[str]: pass
+
+    @abstractmethod
+    def iterStorageObjects(self, prefix: Optional[str] = None) -> Iterator[Dict[str, object]]: pass
+
+    @abstractmethod
+    def findBlobsInRange(self, after: Optional[str], until: Optional[str]) -> List[Blob]: pass
+
+    @abstractmethod
+    def deleteUnreferencedBlob(self, checksum: str) -> bool: pass
+
+    # extracted text
+    @abstractmethod
+    def saveDocumentText(self, text: DocumentText) -> bool: pass
+
+    @abstractmethod
+    def findDocumentText(self, document_id: str, version_number: int) -> Optional[DocumentText]: pass
+
+    @abstractmethod
+    def findLatestDocumentText(self, document_id: str) -> Optional[DocumentText]: pass
+
+    @abstractmethod
+    def findDocumentTextByChecksum(self, checksum: str) -> Optional[DocumentText]: pass
+
+    @abstractmethod
+    def getTextVersionNumbers(self, document_id: str) -> List[int]: pass
+
+    @abstractmethod
+    def iterLatestDocumentTexts(self) -> Iterator[DocumentText]: pass
@@ -1,21 +1,41 @@
-from typing import List, Optional, BinaryIO
+from typing import List, Optional, BinaryIO, Dict, Tuple, Iterator, Set
 from pymongo import MongoClient
 from pymongo.errors import PyMongoError
 from dao.user_module.user import User
 from dao.user_module.user_dao import UserDAO
 from dao.document_module.document import Document, Version
 from dao.document_module.document_dao import DocumentDAO
+from dao.document_module.errors import VersionConflictError
 from dao.department_module.department import Department
 from dao.department_module.department_dao import DepartmentDAO
 from dao.activitylog_module.activitylog import ActivityLog
 from dao.activitylog_module.activitylog_dao import ActivityLogDAO
+from dao.activitylog_module.activitylog_writer import BufferedActivityLogWriter
 from dao.permission_module.permission import Permission
 from dao.permission_module.permission_dao import PermissionDAO
+from dao.blob_module.blob import Blob
+from dao.blob_module.blob_dao import BlobDAO
+from dao.text_module.text import DocumentText
+from dao.text_module.text_dao import TextDAO
+from dao.version_module.version_dao import VersionDAO
 from dao.minio_module.storage import MinIOStorage
-from datetime import timedelta
-from utils.config_loader import get_storage_config, get_collections, get_db_config
+from dao.storage_module.istorage import IStorage
+from dao.storage_module.local_storage import LocalStorage
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+from bson import ObjectId
+from datetime import datetime, timedelta
+from utils.config_loader import get_storage_config, get_collections, get_db_config, get_cache_config, \
+    get_activity_log_config, get_activity_retention_config
+from utils.stream import HashingReader, is_seekable, hash_seekable
+from utils.cache import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
 from dao.imanagement_dao import IManagementDAO
 
+_MISSING = object()
+
 
 class ManagementDAO(IManagementDAO):
     def __init__(self, mongo_client=None, database_name=None):
@@ -31,75 +51,191 @@ class ManagementDAO(IManagementDAO):
         self.mongo_client = mongo_client
         self.database_name = database_name
 
-        minio_config = get_storage_config()
+        storage_config = get_storage_config()
         collects = get_collections()
+        cache_config = get_cache_config()
 
         # daos
         self.user_dao = UserDAO(self.mongo_client, self.database_name, collects['user_dao'])
         self.document_dao = DocumentDAO(self.mongo_client, self.database_name, collects['document_dao'])
         self.department_dao = DepartmentDAO(self.mongo_client, self.database_name, collects['department_dao'])
-        self.activity_log_dao = ActivityLogDAO(self.mongo_client, self.database_name, collects['activity_log_dao'])
+        self.activity_log_dao = ActivityLogDAO(self.mongo_client, self.database_name, collects['activity_log_dao'],
+                                               **get_activity_retention_config())
         self.permission_dao = PermissionDAO(self.mongo_client, self.database_name, collects['permission_dao'])
-
-        # minio_module storage
-        self._minio_storage = MinIOStorage(
-            endpoint=minio_config['endpoint'],
-            access_key=minio_config['access_key'],
-            secret_key=minio_config['secret_key'],
-            bucket_name=minio_config['bucket_name'],
-            secure=minio_config.get('secure')
+        self.blob_dao = BlobDAO(self.mongo_client, self.database_name, collects['blob_dao'])
+        self.text_dao = TextDAO(self.mongo_client, self.database_name, collects['text_dao'])
+        self.version_dao = VersionDAO(self.mongo_client, self.database_name, collects['version_dao'])
+        # audit logs are written in the background, batched
+        self.activity_log_writer = BufferedActivityLogWriter(self.activity_log_dao, **get_activity_log_config())
+
+        # users by id, and email -> user id, so authenticated requests do not hit mongo
+        self.user_cache = TTLCache(cache_config['user_cache_size'], cache_config['user_cache_ttl'])
+        self.user_email_cache = TTLCache(cache_config['user_cache_size'], cache_config['user_cache_ttl'])
+        # effective permissions by (user id, doc id), None is cached too so denials stay in memory
+        self.permission_cache = TTLCache(cache_config['permission_cache_size'], cache_config['permission_cache_ttl'])
+
+        # object storage, minio unless STORAGE_BACKEND=local
+        self._storage: IStorage = self._create_storage(storage_config)
+
+    @staticmethod
+    def _create_storage(config: Dict[str, object]) -> IStorage:
+        codec_config = {
+            "codec": config['codec'],
+            "compress_types": config['compress_types'],
+            "compression_level": config['compression_level']
+        }
+        if config['backend'] == "local":
+            return LocalStorage(config['local_root'], **codec_config)
+        if config['backend'] != "minio":
+            raise ValueError(f"Unknown storage backend: {config['backend']}")
+        return MinIOStorage(
+            endpoint=config['endpoint'],
+            access_key=config['access_key'],
+            secret_key=config['secret_key'],
+            bucket_name=config['bucket_name'],
+            secure=config.get('secure'),
+            part_size=config['part_size'],
+            **codec_config
         )
 
     def close_connection(self):
+        self.activity_log_writer.close()  # queued logs still need the connection
         self.mongo_client.close()
 
+    def ensure_indexes(self) -> Dict[str, Dict[str, List[str]]]:
+        # idempotent, creating an index that already exists is a no-op
+        report = {}
+        daos = (self.user_dao, self.document_dao, self.department_dao, self.activity_log_dao, self.permission_dao,
+                self.blob_dao, self.text_dao, self.version_dao)
+        targets = [(dao.collection, dao.INDEXES) for dao in daos]
+        # activity logs also keep their rollups and one collection per month
+        targets.append((self.activity_log_dao.rollups, self.activity_log_dao.ROLLUP_INDEXES))
+        for name in self.activity_log_dao.partitionNames():
+            targets.append((self.activity_log_dao.db[name], self.activity_log_dao.partitions.indexes()))
+        for collection, indexes in targets:
+            if collection.name in self.activity_log_dao.partitions.filter([collection.name]):
+                # partitions also get their ttl brought in line with the configured retention
+                missing = self.activity_log_dao.preparePartition(collection.name)
+            else:
+                missing = self._create_indexes(collection, indexes)
+            report[collection.name] = {
+                "declared": [index.document["name"] for index in indexes],
+                "missing": missing,
+                "unused": self._unused_indexes(collection)
+            }
+            if missing:
+                logger.warning(f"Missing indexes on {collection.name}: {missing}")
+            if report[collection.name]["unused"]:
+                logger.info(f"Unused indexes on {collection.name}: {report[collection.name]['unused']}")
+        return report
+
+    @staticmethod
+    def _create_indexes(collection, indexes) -> List[str]:
+        missing = []
+        for index in indexes:
+            name = index.document["name"]
+            try:
+                collection.create_indexes([index])
+            except PyMongoError as e:
+                logger.error(f"Failed to create index {name} on {collection.name}: {e}")
+                missing.append(name)
+        return missing
+
+    @staticmethod
+    def _unused_indexes(collection) -> List[str]:
+        # usage counters reset when the server restarts, so this is only a hint
+        try:
+            stats = collection.aggregate([{"$indexStats": {}}])
+            return [stat["name"] for stat in stats if stat["name"] != "_id_" and stat["accesses"]["ops"] == 0]
+        except Exception as e:
+            logger.debug(f"Index usage is not available for {collection.name}: {e}")
+            return []
+
+    def cache_stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            "users": self.user_cache.stats(),
+            "user_emails": self.user_email_cache.stats(),
+            "permissions": self.permission_cache.stats()
+        }
+
     # User
     def saveUser(self, user: User) -> bool:
         return self.user_dao.save(user)
 
     def findUserById(self, user_id: str) -> Optional[User]:
-        return self.user_dao.findById(user_id)
+        user = self.user_cache.get(user_id)
+        if user is None:
+            user = self.user_dao.findById(user_id)
+            if user is None:
+                return None
+            self._cache_user(user)
+        return user.model_copy(deep=True)
 
     def findUserByEmail(self, email: str) -> Optional[User]:
-        return self.user_dao.findByEmail(email)
+        user_id = self.user_email_cache.get(email)
+        user = self.user_cache.get(user_id) if user_id else None
+        if user is None or user.email != email:
+            user = self.user_dao.findByEmail(email)
+            if user is None:
+                return None
+            self._cache_user(user)
+        return user.model_copy(deep=True)
+
+    def _cache_user(self, user: User):
+        self.user_cache.set(user.userId, user)
+        self.user_email_cache.set(user.email, user.userId)
 
     def findAllUsers(self) -> List[User]:
         return self.user_dao.findAll()
 
+    def findAllUsersPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return self.user_dao.findPage(after, limit)
+
     def updateUser(self, user: User) -> bool:
-        return self.user_dao.update(user)
+        updated = self.user_dao.update(user)
+        self.user_cache.pop(user.userId)
+        return updated
 
     def deleteUser(self, user_id: str) -> bool:
-        return self.user_dao.delete(user_id)
+        deleted = self.user_dao.delete(user_id)
+        self.user_cache.pop(user_id)
+        return deleted
 
     # Document
     def saveDocument(self, document: Document, content: Optional[BinaryIO] = None) -> dict:
-        global object_name
         result = {}
+        blob = None
         try:
-            # Save content to MinIO first (if provided)
+            # Save content to storage first (if provided)
             if content is not None:
-                object_name = f"{document.documentId}/v{document.currentNumber}"
-
-                if not self._minio_storage.addDoc(
-                        object_name=object_name,
-                        data=content,
-                        length=document.versions[0].file_size,
-                        content_type=document.dType
-                ):
-                    raise Exception("❌ Failed to store content in MinIO")
-
-                result['content_url'] = self._minio_storage.getDocUrl(
-                    object_name=object_name,
-                    expires=timedelta(hours=24)
-                )
+                blob = self._store_blob(content, document.dType)
+                if not blob:
+                    raise Exception("❌ Failed to store content in object storage")
+                version = document.versions[0]
+                version.file_size = blob.size
+                version.checksum = blob.checksum
+                version.object_name = blob.get_object_name()
+                version.codec = blob.codec
+
+                # compressed content has no url here, the uploader's Accept-Encoding is unknown.
+                # it is served through get_document_content_url or the content route, which negotiate
+                if not version.codec:
+                    result['content_url'] = self._storage.getDocUrl(
+                        object_name=version.object_name,
+                        expires=timedelta(hours=24)
+                    )
 
             # Save metadata to MongoDB
             if not self.document_dao.save(document):
-                # If document fails to save after MinIO, rollback MinIO
-                if 'content_url' in result:
-                    self._minio_storage.deleteDoc(object_name)
+                # If document fails to save after storage, drop the reference taken above
+                if blob:
+                    self._release_blob(blob)
                 raise Exception("❌ Failed to save document metadata to MongoDB")
+            if not self.version_dao.save(document.documentId, document.versions[0]):
+                self.document_dao.delete(document.documentId)
+                if blob:
+                    self._release_blob(blob)
+                raise Exception("❌ Failed to save document version to MongoDB")
 
             # Add permission for owner
             user = self.user_dao.findByEmail(document.owner)
@@ -109,11 +245,13 @@ class ManagementDAO(IManagementDAO):
                 permissions=["read", "write", "share", "delete"]
             )
             if not self.permission_dao.save(permission):
-                # Rollback Mongo and MinIO
+                # Rollback Mongo and storage
                 self.document_dao.delete(document.documentId)
-                if 'content_url' in result:
-                    self._minio_storage.deleteDoc(object_name)
+                self.version_dao.deleteByDocument(document.documentId)
+                if blob:
+                    self._release_blob(blob)
                 raise Exception("❌ Failed to save permission to MongoDB")
+            self.permission_cache.pop((user.userId, document.documentId))
 
             activity_log = ActivityLog(
                 userId=user.userId,
@@ -121,7 +259,7 @@ class ManagementDAO(IManagementDAO):
                 action="upload document",
                 description=f"Document {document.name} uploaded by {document.owner}",
             )
-            self.activity_log_dao.save(activity_log)
+            self.activity_log_writer.submit(activity_log)
 
             result['document'] = document  # use the one already passed
 
@@ -130,49 +268,251 @@ class ManagementDAO(IManagementDAO):
 
         return result
 
-    def get_document_content(self, document_id: str, version_num: Optional[int] = None) -> Optional[BinaryIO]:
-        # get metadata
+    def _store_blob(self, content: BinaryIO, content_type: str) -> Optional[Blob]:
+        # content is stored once under its sha-256, identical uploads only take a reference.
+        # returns the blob now referenced, compressible types are stored compressed
+        codec = self._storage.codec_for(content_type)
+        if is_seekable(content):
+            # hash locally first so a duplicate never leaves the server
+            checksum, size = hash_seekable(content)
+            acquired = self.blob_dao.acquire(checksum)
+            if acquired:
+                return acquired
+            if not self._storage.addDoc(Blob.object_name_for(checksum, codec), content, length=size,
+                                              content_type=content_type, codec=codec):
+                return None
+        else:
+            # the hash is only known once the stream is consumed, stage it and move it into place
+            staging_name = f"staging/{ObjectId()}"
+            reader = HashingReader(content)
+            if not self._storage.addDoc(staging_name, reader, content_type=content_type, codec=codec):
+                return None
+            checksum, size = reader.hexdigest(), reader.bytes_read
+            try:
+                acquired = self.blob_dao.acquire(checksum)
+                if acquired:
+                    return acquired
+                if not self._storage.copyDoc(staging_name, Blob.object_name_for(checksum, codec)):
+                    return None
+            finally:
+                self._storage.deleteDoc(staging_name)
+
+        blob = self.blob_dao.save(Blob(checksum=checksum, size=size, contentType=content_type, codec=codec))
+        if blob and blob.codec != codec:
+            # a concurrent upload stored the same bytes the other way first, this copy is not referenced
+            self._storage.deleteDoc(Blob.object_name_for(checksum, codec))
+        return blob
+
+    def _release_blob(self, blob: Blob):
+        # a blob left at zero keeps its record and object. deleting them here would race an upload of the same
+        # bytes taking the record over, the reconciler removes them once they are past its grace period
+        self.blob_dao.release(blob.checksum)
+
+    def _remove_version_content(self, document_id: str, versions: List[Version]):
+        # shared blobs only lose a reference, see _release_blob
+        object_names = []
+        for version in versions:
+            if version.object_name and version.checksum:
+                self.blob_dao.release(version.checksum)
+            else:
+                # versions stored before content addressing live under the document and are not shared
+                object_names.append(f"{document_id}/v{version.version_number}")
+        failed = self._storage.deleteDocs(object_names) if object_names else []
+        for object_name in failed:
+            logger.warning(f"Failed to delete document content: {object_name}")
+
+    def _find_version(self, document: Document, version_num: Optional[int] = None) -> Optional[Version]:
+        version_num = version_num or document.currentNumber
+        if version_num == document.currentNumber == 1 and document.versions:
+            # the upload version is embedded, its record may be compacted away once it is no longer current
+            return document.versions[0]
+        # findById only carries the initial version, look the rest up
+        return self.findVersion(document.documentId, version_num)
+
+    @staticmethod
+    def _object_name_of(document: Document, version: Version) -> str:
+        # versions stored before content addressing live under the document
+        return version.object_name or f"{document.documentId}/v{version.version_number}"
+
+    def _content_object_name(self, document: Document, version_num: Optional[int] = None) -> Optional[str]:
+        version = self._find_version(document, version_num)
+        return self._object_name_of(document, version) if version else None
+
+    def get_document_content(self, document_id: str, version_num: Optional[int] = None,
+                             offset: int = 0, length: int = 0, decode: bool = True) -> Optional[BinaryIO]:
+        # decode=False hands compressed content out as stored, for clients that accept its encoding
         document = self.findDocumentById(document_id)
         if not document:
             return None
 
-        if version_num:
-            version = next((v for v in document.versions
-                            if v.version_number == version_num), None)
-            if not version:
-                return None
-            object_name = f"{document_id}/v{version_num}"
-        else:
-            # latest version
-            object_name = f"{document_id}/v{document.currentNumber}"
+        version = self._find_version(document, version_num)
+        if not version:
+            return None
+        object_name = self._object_name_of(document, version)
+        if version.codec and not decode:
+            return self._storage.getDoc(object_name)
+        return self._storage.getDoc(object_name, offset=offset, length=length, codec=version.codec)
 
-        return self._minio_storage.getDoc(object_name)
+    def stat_document_content(self, document_id: str, version_num: Optional[int] = None) -> Optional[Dict[str, object]]:
+        document = self.findDocumentById(document_id)
+        if not document:
+            return None
+
+        version = self._find_version(document, version_num)
+        if not version:
+            return None
+        object_name = self._object_name_of(document, version)
+        stat = self._storage.statDoc(object_name)
+        if not stat:
+            return None
+        stat["version_number"] = version.version_number
+        stat["codec"] = version.codec
+        # the stored bytes as a file, when the backend keeps objects on local disk
+        stat["path"] = self._storage.getDocPath(object_name)
+        if version.codec:
+            # size is what the client gets once decoded, stored_size what goes over the wire encoded
+            stat["stored_size"], stat["size"] = stat["size"], version.file_size
+        return stat
+
+    def get_document_content_url(self, document_id: str, version_num: Optional[int] = None,
+                                 expires: timedelta = timedelta(minutes=5),
+                                 accept_encodings: Tuple[str, ...] = ()) -> Optional[str]:
+        # None for compressed content the client cannot decode, it has to be served decompressed instead
+        document = self.findDocumentById(document_id)
+        if not document:
+            return None
+
+        version = self._find_version(document, version_num)
+        if not version or (version.codec and version.codec not in accept_encodings):
+            return None
+        return self._storage.getDocUrl(object_name=self._object_name_of(document, version),
+                                             expires=expires, codec=version.codec)
 
     def findDocumentById(self, document_id: str) -> Optional[Document]:
         return self.document_dao.findById(document_id)
 
+    def findDocumentsByIds(self, document_ids: List[str]) -> List[Document]:
+        return self.document_dao.findByIds(document_ids)
+
     def findDocumentsByOwner(self, owner_id: str) -> List[Document]:
         return self.document_dao.findByOwner(owner_id)
 
+    def findDocumentsByOwnerPage(self, owner_id: str, after: Optional[str] = None,
+                                 limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return self.document_dao.findByOwnerPage(owner_id, after, limit)
+
     def findAllDocuments(self) -> List[Document]:
         return self.document_dao.findAll()
 
+    def findAllDocumentsPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return self.document_dao.findAllPage(after, limit)
+
+    def findAllDocumentsMeta(self) -> List[Document]:
+        return self.document_dao.findAllMeta()
+
+    def iterAllDocumentsMeta(self) -> Iterator[Document]:
+        return self.document_dao.iterAllMeta()
+
     def updateMetaData(self, document: Document) -> bool:
         return self.document_dao.updateMetaData(document)
 
-    def update_content(self, modified_by: str, document_id: str, content: BinaryIO, size: int) -> bool:
+    def update_content(self, modified_by: str, document_id: str, content: BinaryIO,
+                       expected_version: Optional[int] = None, content_type: Optional[str] = None) -> Optional[int]:
+        # returns the new version number, expected_version guards against edits based on an older version
+        if content_type is None:
+            document = self.findDocumentById(document_id)
+            if not document:
+                return None
+            self._check_expected_version(document, expected_version)
+            content_type = document.dType
+        blob = self._store_blob(content, content_type)
+        if not blob:
+            return None
+        return self._commit_version(document_id, modified_by, blob, expected_version)
+
+    @staticmethod
+    def _check_expected_version(document: Document, expected_version: Optional[int]):
+        # fails before any content is stored, _commit_version still has the final word
+        if expected_version is not None and document.currentNumber != expected_version:
+            raise VersionConflictError(document.documentId, expected_version, document.currentNumber)
+
+    def _commit_version(self, document_id: str, modified_by: str, blob: Blob,
+                        expected_version: Optional[int] = None) -> Optional[int]:
+        # the caller holds a reference on the blob, it is handed to the new version or released.
+        # the version record is written before currentNumber points at it, readers never see a missing version
+        claimed = self._claim_version_number(document_id, expected_version)
+        if claimed is None:
+            self._release_blob(blob)
+            current = self.document_dao.findCurrentNumber(document_id) if expected_version is not None else None
+            if current is not None:
+                raise VersionConflictError(document_id, expected_version, current)
+            return None
+        version = Version(
+            version_number=claimed,
+            modified_by=modified_by,
+            modification_date=datetime.now(),
+            file_size=blob.size,
+            checksum=blob.checksum,
+            object_name=blob.get_object_name(),
+            codec=blob.codec
+        )
+        if not self.version_dao.save(document_id, version):
+            self._release_blob(blob)
+            return None
+        current = self.document_dao.advanceCurrentNumber(document_id, version.version_number, expected_version)
+        if current is None or (expected_version is not None and current != version.version_number):
+            # the document was deleted, or another writer moved past expected_version after the claim
+            self.version_dao.deleteVersions(document_id, [version.version_number])
+            self._release_blob(blob)
+            if current is None:
+                return None
+            raise VersionConflictError(document_id, expected_version, current)
+        # without expected_version a newer commit may already be current, this one stays in the history
+        return version.version_number
+
+    def _claim_version_number(self, document_id: str, expected_version: Optional[int] = None) -> Optional[int]:
+        state = self.document_dao.claimNextVersion(document_id, expected_version)
+        if state is None:
+            return None
+        claimed = state.get(DocumentDAO.VERSION_COUNTER)
+        if state.get(DocumentDAO.VERSIONS_MOVED) and claimed > state.get("currentNumber", 1):
+            return claimed
+        # documents stored before the counter, once: move the history and start the counter above it
+        self._move_versions(document_id)
+        latest = max(state.get("currentNumber", 1), self.version_dao.findLatestNumber(document_id))
+        self.document_dao.raiseVersionCounter(document_id, latest)
+        state = self.document_dao.claimNextVersion(document_id, expected_version)
+        return state.get(DocumentDAO.VERSION_COUNTER) if state else None
+
+    def restore_content(self, modified_by: str, document_id: str, version_number: int,
+                        expected_version: Optional[int] = None) -> Optional[int]:
         document = self.findDocumentById(document_id)
         if not document:
-            return False
-        document.set_version(modified_by, size)  # set version
-        object_name = f"{document_id}/v{document.currentNumber}"
-        return self._minio_storage.addDoc(object_name, content, size)
+            return None
+        self._check_expected_version(document, expected_version)
+        version = self._find_version(document, version_number)
+        if not version:
+            return None
+        blob = self.blob_dao.acquire(version.checksum) if version.object_name and version.checksum else None
+        if blob:
+            # same bytes, the new version shares the blob and nothing is transferred
+            return self._commit_version(document_id, modified_by, blob, expected_version)
+
+        # legacy per-document object, store it once under its hash
+        old_content = self._storage.getDoc(self._object_name_of(document, version), codec=version.codec)
+        if not old_content:
+            return None
+        try:
+            return self.update_content(modified_by, document_id, old_content, expected_version, document.dType)
+        finally:
+            old_content.close()
+            old_content.release_conn()
 
     def deleteDocument(self, user_id: str, document_id: str) -> bool:
         document = self.findDocumentById(document_id)
         if not document:
             return False
-        object_name = f"{document_id}/v{document.currentNumber}"
+        versions = self.getVersions(document_id)
         try:
             # start a transaction session
             with self.mongo_client.start_session() as session:
@@ -182,66 +522,109 @@ class ManagementDAO(IManagementDAO):
                     for permission in permissions:
                         if not self.permission_dao.delete(permission.permissionId, session=session):
                             raise Exception(f"Failed to delete permission {permission.permissionId}")
+                        self.permission_cache.pop((permission.userId, document_id))
                     # delete doc meta
                     if not self.document_dao.delete(documentId=document_id, session=session):
                         raise Exception(f"Failed to delete document {document_id}")
-                    # log
-                    activity_log = ActivityLog(
-                        userId=user_id,
-                        docId=document.documentId,
-                        action="delete document",
-                        description=f"Document {document.name} was deleted by {document.owner}",
-                    )
-                    if not self.activity_log_dao.save(activity_log, session=session):
-                        raise Exception("Failed to log activity")
-                    # delete content
-                    if not self._minio_storage.deleteDoc(object_name=object_name):
-                        raise Exception(f"Failed to delete document content: {object_name}")
+            # logged once the delete has committed
+            self.activity_log_writer.submit(ActivityLog(
+                userId=user_id,
+                docId=document.documentId,
+                action="delete document",
+                description=f"Document {document.name} was deleted by {document.owner}",
+            ))
+            # delete content once the metadata is gone, blobs only when no other version uses them
+            self._remove_version_content(document_id, versions)
+            self.text_dao.deleteByDocument(document_id)
+            self.version_dao.deleteByDocument(document_id)
             return True
         except PyMongoError as e:
             return False
         except Exception as e:
             return False
 
+    def _move_versions(self, document_id: str):
+        # documents stored before the versions collection embed their history, it moves on first use.
+        # copying skips versions already there, so a move cut short is finished by the next call
+        embedded = self.document_dao.findEmbeddedVersions(document_id)
+        if embedded is None:
+            return
+        self.version_dao.saveMany(document_id, embedded)
+        self.document_dao.markVersionsMoved(document_id)
+
     def addVersion(self, document_id: str, version: Version) -> bool:
-        return self.document_dao.addVersion(document_id, version)
+        # the insert claims the version number, a concurrent writer with the same number fails
+        self._move_versions(document_id)
+        if not self.version_dao.save(document_id, version):
+            return False
+        return self.document_dao.setCurrentNumber(document_id, version.version_number)
 
     def getVersions(self, document_id: str) -> List[Version]:
-        return self.document_dao.getVersions(document_id)
+        self._move_versions(document_id)
+        return self.version_dao.findByDocument(document_id)
+
+    def getVersionsPage(self, document_id: str, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        self._move_versions(document_id)
+        return self.version_dao.findPage(document_id, after, limit)
+
+    def findVersion(self, document_id: str, version_number: int) -> Optional[Version]:
+        self._move_versions(document_id)
+        return self.version_dao.findOne(document_id, version_number)
+
+    def removeVersions(self, document_id: str, versions: List[Version]) -> int:
+        # records go first, so no reader is handed a version whose content is being removed
+        removed = set(self.version_dao.deleteVersions(document_id, [v.version_number for v in versions]))
+        if not removed:
+            return 0
+        self.text_dao.deleteVersions(document_id, list(removed))
+        self._remove_version_content(document_id, [v for v in versions if v.version_number in removed])
+        return len(removed)
+
+    def findVersionNumbers(self, document_ids: List[str]) -> Dict[str, Set[int]]:
+        # existing documents only, embedded histories that have not moved yet are counted too
+        embedded = self.document_dao.findEmbeddedVersionNumbers(document_ids)
+        stored = self.version_dao.findNumbers(list(embedded))
+        return {doc_id: stored.get(doc_id, set()).union(numbers or []) for doc_id, numbers in embedded.items()}
 
     def restoreVersion(self, document_id: str, version_number: int) -> bool:
-        return self.document_dao.restoreVersion(document_id, version_number)
+        if not self.findVersion(document_id, version_number):
+            return False
+        return self.document_dao.setCurrentNumber(document_id, version_number)
 
     # Permission
     def shareDocument(self, document_id: str, user_id: str, permissions: List[str]) -> bool:
-        # first, find Permission object and update permissions attribute
-        existing = self.permission_dao.findByUserDoc(document_id=document_id, user_id=user_id)
-        if existing:
-            # update
-            perm.permissions = list(set(perm.permissions + permissions))
-            return self.permission_dao.update(perm)
-
-        # create a new Permission object
-        permission = Permission(
-            userID=user_id,
-            docID=document_id,
-            permissions=permissions
-        )
-        return self.permission_dao.save(permission)
+        try:
+            # first, find Permission object and update permissions attribute
+            existing = self.permission_dao.findByUserDoc(user_id, document_id)
+            if existing:
+                # update
+                existing.permissions = sorted(set(existing.permissions + permissions))
+                return self.permission_dao.update(existing)
+
+            # create a new Permission object
+            permission = Permission(
+                userId=user_id,
+                docId=document_id,
+                permissions=permissions
+            )
+            return self.permission_dao.save(permission)
+        finally:
+            self.permission_cache.pop((user_id, document_id))
 
     def removeShareDocument(self, document_id: str, user_id: str, permissions: List[str]) -> bool:
         try:
-            user_permissions = self.getPermissionsByUserDoc(user_id, document_id)
+            user_permissions = self.permission_dao.findByUserDoc(user_id, document_id)
             if not user_permissions:
                 return False
 
-            success = True
             if not user_permissions.remove_permissions(permissions):
-                success = False
+                return False
 
-            return success
+            return self.permission_dao.update(user_permissions)
         except Exception:
             return False
+        finally:
+            self.permission_cache.pop((user_id, document_id))
 
     def getPermissionsByDoc(self, document_id: str) -> List[Permission]:
         return self.permission_dao.findByDoc(document_id)
@@ -249,8 +632,20 @@ class ManagementDAO(IManagementDAO):
     def getPermissionsByUser(self, user_id: str) -> List[Permission]:
         return self.permission_dao.findByUser(user_id)
 
+    def getPermissionsByUserPage(self, user_id: str, after: Optional[str] = None,
+                                 limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return self.permission_dao.findByUserPage(user_id, after, limit)
+
+    def getDocIdsByUserPermission(self, user_id: str, required: str,
+                                  doc_ids: Optional[List[str]] = None) -> List[str]:
+        return self.permission_dao.findDocIdsByUser(user_id, required, doc_ids)
+
     def getPermissionsByUserDoc(self, user_id: str, doc_id: str) -> Optional[Permission]:
-        return self.permission_dao.findByUserDoc(user_id, doc_id)
+        permission = self.permission_cache.get((user_id, doc_id), _MISSING)
+        if permission is _MISSING:
+            permission = self.permission_dao.findByUserDoc(user_id, doc_id)
+            self.permission_cache.set((user_id, doc_id), permission)
+        return permission.model_copy(deep=True) if permission else None
 
     # Department
     def saveDepartment(self, department: Department) -> bool:
@@ -275,14 +670,28 @@ class ManagementDAO(IManagementDAO):
     def findActivitylogById(self, log_id: str) -> Optional[ActivityLog]:
         return self.activity_log_dao.findById(log_id)
 
-    def findActivitylogsByUser(self, user_id: str) -> List[ActivityLog]:
-        return self.activity_log_dao.findByUser(user_id)
+    def findActivitylogsByUser(self, user_id: str, since: Optional[datetime] = None,
+                               until: Optional[datetime] = None, limit: int = 100) -> List[ActivityLog]:
+        return self.activity_log_dao.findByUser(user_id, since, until, limit)
 
-    def findActivitylogsByDocument(self, document_id: str) -> List[ActivityLog]:
-        return self.activity_log_dao.findByDocument(document_id)
+    def findActivitylogsByDocument(self, document_id: str, since: Optional[datetime] = None,
+                                   until: Optional[datetime] = None, limit: int = 100) -> List[ActivityLog]:
+        return self.activity_log_dao.findByDocument(document_id, since, until, limit)
 
-    def findAllActivitylogs(self) -> List[ActivityLog]:
-        return self.activity_log_dao.findAll()
+    def findAllActivitylogs(self, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                            limit: int = 100) -> List[ActivityLog]:
+        return self.activity_log_dao.findAll(since, until, limit)
+
+    def findAllActivitylogsPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return self.activity_log_dao.findAllPage(after, limit)
+
+    def findActivityRollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                            action: Optional[str] = None, since: Optional[datetime] = None,
+                            until: Optional[datetime] = None) -> List[Dict[str, object]]:
+        return self.activity_log_dao.findRollups(granularity, dimension, key, action, since, until)
+
+    def dropExpiredActivityPartitions(self) -> List[str]:
+        return self.activity_log_dao.dropExpiredPartitions()
 
     def updateActivitylog(self, log: ActivityLog) -> bool:
         return self.activity_log_dao.update(log)
@@ -292,4 +701,35 @@ class ManagementDAO(IManagementDAO):
 
     # mino
     def deleteDoc(self, object_name:str) -> bool:
-        return self._minio_storage.deleteDoc(object_name=object_name)
\ No newline at end of file
+        return self._storage.deleteDoc(object_name=object_name)
+
+    def deleteDocs(self, object_names: List[str]) -> List[str]:
+        return self._storage.deleteDocs(object_names)
+
+    def iterStorageObjects(self, prefix: Optional[str] = None) -> Iterator[Dict[str, object]]:
+        return self._storage.listDocs(prefix)
+
+    def findBlobsInRange(self, after: Optional[str], until: Optional[str]) -> List[Blob]:
+        return self.blob_dao.findRange(after, until)
+
+    def deleteUnreferencedBlob(self, checksum: str) -> bool:
+        return self.blob_dao.deleteUnreferenced(checksum)
+
+    # Extracted text
+    def saveDocumentText(self, text: DocumentText) -> bool:
+        return self.text_dao.save(text)
+
+    def findDocumentText(self, document_id: str, version_number: int) -> Optional[DocumentText]:
+        return self.text_dao.findByVersion(document_id, version_number)
+
+    def findLatestDocumentText(self, document_id: str) -> Optional[DocumentText]:
+        return self.text_dao.findLatest(document_id)
+
+    def findDocumentTextByChecksum(self, checksum: str) -> Optional[DocumentText]:
+        return self.text_dao.findByChecksum(checksum)
+
+    def getTextVersionNumbers(self, document_id: str) -> List[int]:
+        return self.text_dao.findVersionNumbers(document_id)
+
+    def iterLatestDocumentTexts(self) -> Iterator[DocumentText]:
+        return self.text_dao.iterLatest()
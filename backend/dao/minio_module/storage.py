@@ -1,12 +1,18 @@
 from minio import Minio
 from minio.error import S3Error
-from typing import Optional, BinaryIO
+from minio.commonconfig import ComposeSource
+from minio.deleteobjects import DeleteObject
+from typing import Optional, BinaryIO, Dict, Iterable, Iterator, List
 import logging
 from datetime import timedelta
+from dao.storage_module import codec as codecs
+from dao.storage_module.istorage import IStorage
 
 
-class MinIOStorage:
-    def __init__(self, endpoint: str, access_key: str, secret_key: str,bucket_name: str, secure: bool = False):
+class MinIOStorage(IStorage):
+    def __init__(self, endpoint: str, access_key: str, secret_key: str,bucket_name: str, secure: bool = False,
+                 part_size: int = 10 * 1024 * 1024, codec: Optional[str] = None,
+                 compress_types: Optional[Iterable[str]] = None, compression_level: int = 3):
         self.client = Minio(
             endpoint=endpoint,
             access_key=access_key,
@@ -14,7 +20,11 @@ class MinIOStorage:
             secure=secure,
         )
         self.bucket_name = bucket_name
+        self.part_size = part_size
         self.logger = logging.getLogger(__name__)
+        self.codec = codecs.usable(codec)
+        self.compress_types = tuple(compress_types or codecs.DEFAULT_COMPRESSIBLE_TYPES)
+        self.compression_level = compression_level
         self.ensure_bucket_exists()
 
     def ensure_bucket_exists(self):
@@ -27,16 +37,29 @@ class MinIOStorage:
             self.logger.error(f"Error ensuring bucket exists: {e}")
             raise
 
-    def addDoc(self, object_name: str, data: BinaryIO, length: int,
-               content_type: str = "application/octet-stream") -> bool:
+    def codec_for(self, content_type: Optional[str]) -> Optional[str]:
+        # the codec new content of this type is stored with, None keeps it as is
+        if self.codec and codecs.compressible(content_type, self.compress_types):
+            return self.codec
+        return None
+
+    def addDoc(self, object_name: str, data: BinaryIO, length: int = -1,
+               content_type: str = "application/octet-stream", codec: Optional[str] = None) -> bool:
+        # length -1 streams the data as a multipart upload, holding at most one part in memory.
+        # with a codec the bytes are compressed on the way, the codec is also kept in the object metadata
+        metadata = None
         try:
+            if codec:
+                data, length, metadata = codecs.encode(codec, data, self.compression_level), -1, {"codec": codec}
             self.logger.info(f"Attempting to upload document: {object_name}, length: {length}")
             self.client.put_object(
                 bucket_name=self.bucket_name,
                 object_name=object_name,
                 data=data,
                 length=length,
-                content_type=content_type
+                content_type=content_type or "application/octet-stream",
+                part_size=self.part_size if length < 0 else 0,
+                metadata=metadata
             )
             self.logger.info(f"Successfully uploaded document: {object_name}")
             return True
@@ -47,14 +70,21 @@ class MinIOStorage:
             self.logger.error(f"Unexpected error adding document {object_name}: {e}")
             return False
 
-    def getDoc(self, object_name: str) -> Optional[BinaryIO]:
+    def getDoc(self, object_name: str, offset: int = 0, length: int = 0,
+               codec: Optional[str] = None) -> Optional[BinaryIO]:
+        # length 0 reads from offset to the end of the object. content stored with a codec is decompressed
+        # while read, offset and length then count decompressed bytes
         try:
-            self.logger.info(f"Attempting to get document: {object_name}")
+            self.logger.info(f"Attempting to get document: {object_name}, offset: {offset}, length: {length}")
             response = self.client.get_object(
                 bucket_name=self.bucket_name,
-                object_name=object_name
+                object_name=object_name,
+                offset=0 if codec else offset,
+                length=0 if codec else length
             )
             self.logger.info(f"Successfully retrieved document: {object_name}")
+            if codec:
+                return codecs.DecodedStream(codec, response, offset, length)
             return response
         except S3Error as e:
             self.logger.error(f"S3Error getting document {object_name}: {e}")
@@ -63,17 +93,61 @@ class MinIOStorage:
             self.logger.error(f"Unexpected error getting document {object_name}: {e}")
             return None
 
-    def getDocUrl(self, object_name: str, expires: timedelta) -> Optional[str]:
+    def copyDoc(self, source_object_name: str, object_name: str) -> bool:
+        # server-side copy, compose also covers sources above the 5 GiB single copy limit
+        try:
+            self.client.compose_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                sources=[ComposeSource(self.bucket_name, source_object_name)]
+            )
+            return True
+        except S3Error as e:
+            self.logger.error(f"S3Error copying document {source_object_name} to {object_name}: {e}")
+            return False
+
+    def statDoc(self, object_name: str) -> Optional[Dict[str, object]]:
+        try:
+            stat = self.client.stat_object(
+                bucket_name=self.bucket_name,
+                object_name=object_name
+            )
+            return {
+                "size": stat.size,
+                "etag": stat.etag,
+                "last_modified": stat.last_modified,
+                "content_type": stat.content_type
+            }
+        except S3Error as e:
+            self.logger.error(f"S3Error getting stat of document {object_name}: {e}")
+            return None
+
+    def getDocPath(self, object_name: str) -> Optional[str]:
+        # objects are only reachable over the network
+        return None
+
+    def getDocUrl(self, object_name: str, expires: timedelta, codec: Optional[str] = None) -> Optional[str]:
+        # compressed content is served as is, labelled with its content encoding
         try:
             return self.client.presigned_get_object(
                 bucket_name=self.bucket_name,
                 object_name=object_name,
-                expires=expires
+                expires=expires,
+                response_headers={"response-content-encoding": codec} if codec else None
             )
         except S3Error as e:
             self.logger.error(f"Error generating URL for {object_name}: {e}")
             return None
 
+    def listDocs(self, prefix: Optional[str] = None) -> Iterator[Dict[str, object]]:
+        # streamed in key order, the client pages through the bucket 1000 names at a time
+        for obj in self.client.list_objects(self.bucket_name, prefix=prefix, recursive=True):
+            yield {
+                "name": obj.object_name,
+                "size": obj.size,
+                "last_modified": obj.last_modified
+            }
+
     def deleteDoc(self, object_name: str) -> bool:
         try:
             self.client.remove_object(
@@ -83,4 +157,19 @@ class MinIOStorage:
             return True
         except S3Error as e:
             self.logger.error(f"Error deleting document {object_name}: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def deleteDocs(self, object_names: List[str]) -> List[str]:
+        # multi-object delete, the client sends up to 1000 names per request. returns the names left behind
+        if not object_names:
+            return []
+        try:
+            errors = self.client.remove_objects(self.bucket_name, [DeleteObject(name) for name in object_names])
+            failed = []
+            for error in errors:  # lazy, the requests are sent while iterating
+                self.logger.error(f"Error deleting document {error.name}: {error.message}")
+                failed.append(error.name)
+            return failed
+        except S3Error as e:
+            self.logger.error(f"Error deleting {len(object_names)} documents: {e}")
+            return list(object_names)
\ No newline at end of file
@@ -0,0 +1,62 @@
+from typing import Any, AsyncIterator, Callable, Iterator, List, NamedTuple, Optional
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+ITER_BATCH_SIZE = 500
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    # _id of the last item, pass it back as after for the next page, None on the last page
+    next_cursor: Optional[str]
+
+
+def keyset_query(query: dict, after: Optional[str], descending: bool = False) -> dict:
+    # pages are ordered by _id, so each one is an index range scan whatever its position
+    if after is None:
+        return query
+    if not ObjectId.is_valid(after):
+        raise ValueError(f"Invalid cursor: {after}")
+    return dict(query, _id={"$lt" if descending else "$gt": ObjectId(after)})
+
+
+def page_size(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def to_page(docs: List[dict], limit: int, convert: Callable[[dict], Any], key: str = "_id") -> Page:
+    # one extra document is read to know whether another page exists
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = str(docs[-1][key]) if has_more else None
+    return Page([convert(doc) for doc in docs], next_cursor)
+
+
+def find_page(collection, query: dict, after: Optional[str], limit: int, convert: Callable[[dict], Any],
+              projection: Optional[dict] = None, descending: bool = False) -> Page:
+    limit = page_size(limit)
+    cursor = collection.find(keyset_query(query, after, descending), projection) \
+        .sort("_id", DESCENDING if descending else ASCENDING).limit(limit + 1)
+    return to_page(list(cursor), limit, convert)
+
+
+def iter_all(collection, query: dict, convert: Callable[[dict], Any], projection: Optional[dict] = None) -> Iterator:
+    # models are built one batch at a time as the caller consumes them
+    for doc in collection.find(query, projection).sort("_id", ASCENDING).batch_size(ITER_BATCH_SIZE):
+        yield convert(doc)
+
+
+async def async_find_page(collection, query: dict, after: Optional[str], limit: int, convert: Callable[[dict], Any],
+                          projection: Optional[dict] = None, descending: bool = False) -> Page:
+    limit = page_size(limit)
+    cursor = collection.find(keyset_query(query, after, descending), projection) \
+        .sort("_id", DESCENDING if descending else ASCENDING).limit(limit + 1)
+    return to_page([doc async for doc in cursor], limit, convert)
+
+
+async def async_iter_all(collection, query: dict, convert: Callable[[dict], Any],
+                         projection: Optional[dict] = None) -> AsyncIterator:
+    async for doc in collection.find(query, projection).sort("_id", ASCENDING).batch_size(ITER_BATCH_SIZE):
+        yield convert(doc)
@@ -0,0 +1,61 @@
+from typing import List, Optional
+from pymongo import AsyncMongoClient
+from bson import ObjectId
+from dao.permission_module.iasync_permission_dao import IAsyncPermissionDAO
+from dao.permission_module.permission import Permission
+from dao.permission_module.permission_dao import PermissionDAO
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, async_find_page
+
+
+class AsyncPermissionDAO(IAsyncPermissionDAO):
+    def __init__(self, mongo_client: AsyncMongoClient, database_name: str, collection_name: str):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection_name]
+
+    async def save(self, permission: Permission) -> bool:
+        per_dict = permission.dict()
+        per_dict['_id'] = ObjectId(per_dict['permissionId'])
+        del per_dict['permissionId']
+        result = await self.collection.insert_one(per_dict)
+        return result.acknowledged
+
+    async def findByUser(self, userId: str) -> List[Permission]:
+        pers = self.collection.find({"userId": userId})
+        return [PermissionDAO._convert_per(per) async for per in pers]
+
+    async def findByUserPage(self, userId: str, after: Optional[str] = None,
+                             limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return await async_find_page(self.collection, {"userId": userId}, after, limit, PermissionDAO._convert_per)
+
+    async def findByDoc(self, docId: str, session=None) -> List[Permission]:
+        pers = self.collection.find({"docId": docId})
+        return [PermissionDAO._convert_per(per) async for per in pers]
+
+    async def findByUserDoc(self, userId: str, docId: str) -> Optional[Permission]:
+        per = await self.collection.find_one({"userId": userId, "docId": docId})
+        return PermissionDAO._convert_per(per)
+
+    async def findDocIdsByUser(self, userId: str, required: str, docIds: Optional[List[str]] = None) -> List[str]:
+        query = {"userId": userId, "permissions": required}
+        if docIds is not None:
+            query["docId"] = {"$in": docIds}
+        pers = self.collection.find(query, {"docId": 1, "_id": 0}).sort("docId", 1)
+        return list(dict.fromkeys([per["docId"] async for per in pers]))
+
+    async def findAll(self) -> List[Permission]:
+        pers = self.collection.find({})
+        return [PermissionDAO._convert_per(per) async for per in pers]
+
+    async def update(self, permission: Permission) -> bool:
+        per_dict = permission.dict()
+        permissionId = ObjectId(per_dict['permissionId'])
+        del per_dict['permissionId']
+        result = await self.collection.update_one(
+            {"_id": permissionId},
+            {"$set": per_dict}
+        )
+        return result.modified_count > 0
+
+    async def delete(self, permissionId: str, session=None) -> bool:
+        result = await self.collection.delete_one({"_id": ObjectId(permissionId)})
+        return result.deleted_count > 0
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from dao.permission_module.permission import Permission
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+
+
+class IAsyncPermissionDAO(ABC):
+    @abstractmethod
+    async def save(self, permission: Permission) -> bool: pass
+
+    @abstractmethod
+    async def findByUser(self, userId: str) -> List[Permission]: pass
+
+    @abstractmethod
+    async def findByUserPage(self, userId: str, after: Optional[str] = None,
+                             limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    async def findByDoc(self, docId: str, session=None) -> List[Permission]: pass
+
+    @abstractmethod
+    async def findByUserDoc(self, userId: str, docId: str) -> Optional[Permission]: pass
+
+    @abstractmethod
+    async def findDocIdsByUser(self, userId: str, required: str, docIds: Optional[List[str]] = None) -> List[str]: pass
+
+    @abstractmethod
+    async def findAll(self) -> List[Permission]: pass
+
+    @abstractmethod
+    async def update(self, permission: Permission) -> bool: pass
+
+    @abstractmethod
+    async def delete(self, permissionId: str, session=None) -> bool: pass
@@ -1,24 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from pymongo import IndexModel
+from typing import Iterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
 from dao.permission_module.permission import Permission
 
 
 class IPermissionDAO(ABC):
+    # indexes the queries of this dao rely on, provisioned by ManagementDAO.ensure_indexes
+    INDEXES: List[IndexModel] = []
+
     @abstractmethod
     def save(self, permission: Permission) -> bool: pass
 
     @abstractmethod
     def findByUser(self, userId: str) -> List[Permission]: pass
 
+    @abstractmethod
+    def findByUserPage(self, userId: str, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def iterByUser(self, userId: str) -> Iterator[Permission]: pass
+
     @abstractmethod
     def findByDoc(self, docId: str, session=None) -> List[Permission]: pass
 
     @abstractmethod
     def findByUserDoc(self, userId: str, docId: str) -> Optional[Permission]: pass
 
+    @abstractmethod
+    def findDocIdsByUser(self, userId: str, required: str, docIds: Optional[List[str]] = None) -> List[str]: pass
+
     @abstractmethod
     def findAll(self) -> List[Permission]: pass
 
+    @abstractmethod
+    def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def iterAll(self) -> Iterator[Permission]: pass
+
     @abstractmethod
     def update(self, permission: Permission) -> bool: pass
 
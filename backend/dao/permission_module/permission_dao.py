@@ -1,11 +1,19 @@
-from typing import List, Optional
-from pymongo import MongoClient
+from typing import Iterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, find_page, iter_all
+from pymongo import MongoClient, IndexModel, ASCENDING
 from bson import ObjectId
 from dao.permission_module.ipermission_dao import IPermissionDAO
 from dao.permission_module.permission import Permission
 
 
 class PermissionDAO(IPermissionDAO):
+    INDEXES = [
+        IndexModel([("userId", ASCENDING), ("docId", ASCENDING)], name="userId_docId_unique", unique=True),
+        IndexModel([("docId", ASCENDING)], name="docId"),
+        # a user's permissions in _id order, for keyset pages
+        IndexModel([("userId", ASCENDING), ("_id", ASCENDING)], name="userId_id"),
+    ]
+
     def __init__(self, mongo_client: MongoClient, database_name: str, collection_name: str):
         self.db = mongo_client[database_name]
         self.collection = self.db[collection_name]
@@ -18,8 +26,13 @@ class PermissionDAO(IPermissionDAO):
         return result.acknowledged
 
     def findByUser(self, userId: str) -> List[Permission]:
-        pers = self.collection.find({"userId": userId})
-        return [self._convert_per(per) for per in pers]
+        return list(self.iterByUser(userId))
+
+    def findByUserPage(self, userId: str, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return find_page(self.collection, {"userId": userId}, after, limit, self._convert_per)
+
+    def iterByUser(self, userId: str) -> Iterator[Permission]:
+        return iter_all(self.collection, {"userId": userId}, self._convert_per)
 
     def findByDoc(self, docId: str, session=None) -> List[Permission]:
         pers = self.collection.find({"docId": docId})
@@ -29,9 +42,22 @@ class PermissionDAO(IPermissionDAO):
         per = self.collection.find_one({"userId": userId, "docId": docId})
         return self._convert_per(per)
 
+    def findDocIdsByUser(self, userId: str, required: str, docIds: Optional[List[str]] = None) -> List[str]:
+        # resolved in one query, filtering on the permission and projecting only docId
+        query = {"userId": userId, "permissions": required}
+        if docIds is not None:
+            query["docId"] = {"$in": docIds}
+        pers = self.collection.find(query, {"docId": 1, "_id": 0}).sort("docId", 1)
+        return list(dict.fromkeys(per["docId"] for per in pers))
+
     def findAll(self) -> List[Permission]:
-        pers = self.collection.find({})
-        return [self._convert_per(per) for per in pers]
+        return list(self.iterAll())
+
+    def findAllPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return find_page(self.collection, {}, after, limit, self._convert_per)
+
+    def iterAll(self) -> Iterator[Permission]:
+        return iter_all(self.collection, {}, self._convert_per)
 
     def update(self, permission: Permission) -> bool:
         per_dict = permission.dict()
@@ -0,0 +1,80 @@
+import logging
+from typing import BinaryIO, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # optional, content is stored uncompressed without it
+    zstandard = None
+
+ZSTD = "zstd"
+CODECS = (ZSTD,)
+# mostly text, office files, pdf and images are already compressed by their own format
+DEFAULT_COMPRESSIBLE_TYPES = (
+    "text/", "application/json", "application/xml", "application/javascript", "application/x-ndjson",
+    "application/x-yaml", "image/svg+xml"
+)
+_READ_SIZE = 64 * 1024
+
+
+def available(codec: Optional[str]) -> bool:
+    return codec == ZSTD and zstandard is not None
+
+
+def usable(codec: Optional[str]) -> Optional[str]:
+    # the configured codec, None when its package is missing
+    if codec and not available(codec):
+        logger.warning(f"Storage codec {codec} is not available, storing content uncompressed")
+        return None
+    return codec or None
+
+
+def compressible(content_type: Optional[str], types: Iterable[str]) -> bool:
+    # entries ending in / match a whole family, e.g. text/
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    return any(content_type.startswith(t) if t.endswith("/") else content_type == t for t in types)
+
+
+def encode(codec: str, stream: BinaryIO, level: int = 3) -> BinaryIO:
+    # compresses while read, the compressed size is only known at the end so uploads stream as multipart
+    if not available(codec):
+        raise ValueError(f"Codec {codec} is not available")
+    return zstandard.ZstdCompressor(level=level).stream_reader(stream, closefd=False)
+
+
+class DecodedStream:
+    # file-like view of a stored object, decompressed while read. offset and length count decoded bytes,
+    # the skipped prefix is decompressed and dropped
+    def __init__(self, codec: str, response, offset: int = 0, length: int = 0):
+        if not available(codec):
+            raise ValueError(f"Codec {codec} is not available")
+        self._response = response
+        self._reader = zstandard.ZstdDecompressor().stream_reader(response, read_across_frames=True, closefd=False)
+        self._remaining = length if length > 0 else None
+        while offset > 0:
+            skipped = self._reader.read(min(offset, _READ_SIZE))
+            if not skipped:
+                break
+            offset -= len(skipped)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read(_READ_SIZE), b""))
+        if self._remaining is not None:
+            size = min(size, self._remaining)
+        if size == 0:
+            return b""
+        data = self._reader.read(size)
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._reader.close()
+        self._response.close()
+
+    def release_conn(self):
+        release_conn = getattr(self._response, "release_conn", None)
+        if release_conn:
+            release_conn()
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+
+class IStorage(ABC):
+    # object storage behind ManagementDAO, selected by STORAGE_BACKEND
+    @abstractmethod
+    def codec_for(self, content_type: Optional[str]) -> Optional[str]: pass
+
+    @abstractmethod
+    def addDoc(self, object_name: str, data: BinaryIO, length: int = -1,
+               content_type: str = "application/octet-stream", codec: Optional[str] = None) -> bool: pass
+
+    @abstractmethod
+    def getDoc(self, object_name: str, offset: int = 0, length: int = 0,
+               codec: Optional[str] = None) -> Optional[BinaryIO]: pass
+
+    @abstractmethod
+    def copyDoc(self, source_object_name: str, object_name: str) -> bool: pass
+
+    @abstractmethod
+    def statDoc(self, object_name: str) -> Optional[Dict[str, object]]: pass
+
+    @abstractmethod
+    def getDocPath(self, object_name: str) -> Optional[str]: pass
+
+    @abstractmethod
+    def getDocUrl(self, object_name: str, expires: timedelta, codec: Optional[str] = None) -> Optional[str]: pass
+
+    @abstractmethod
+    def listDocs(self, prefix: Optional[str] = None) -> Iterator[Dict[str, object]]: pass
+
+    @abstractmethod
+    def deleteDoc(self, object_name: str) -> bool: pass
+
+    @abstractmethod
+    def deleteDocs(self, object_names: List[str]) -> List[str]: pass
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import quote, unquote
+from dao.storage_module import codec as codecs
+from dao.storage_module.istorage import IStorage
+
+_COPY_SIZE = 1024 * 1024
+# temporary files older than this were left by a crashed write
+_STALE_TMP_SECONDS = 24 * 3600
+
+
+class FileRange:
+    # part of an open file, read and closed like a storage response
+    def __init__(self, file: BinaryIO, length: int = 0):
+        self._file = file
+        self._remaining = length if length > 0 else None
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining is not None:
+            size = self._remaining if size is None or size < 0 else min(size, self._remaining)
+        data = self._file.read(size)
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+    def release_conn(self):
+        pass
+
+
+class LocalStorage(IStorage):
+    # objects are files under <root>/objects, spread over two directory levels by the hash of their name.
+    # writes go to <root>/tmp and are renamed into place once complete, so a reader never sees a partial
+    # object. content type, etag and codec are kept beside the data under <root>/meta
+    def __init__(self, root: str, codec: Optional[str] = None, compress_types: Optional[Iterable[str]] = None,
+                 compression_level: int = 3):
+        self.root = os.path.abspath(root)
+        self._objects = os.path.join(self.root, "objects")
+        self._meta = os.path.join(self.root, "meta")
+        self._tmp = os.path.join(self.root, "tmp")
+        self.codec = codecs.usable(codec)
+        self.compress_types = tuple(compress_types or codecs.DEFAULT_COMPRESSIBLE_TYPES)
+        self.compression_level = compression_level
+        self.logger = logging.getLogger(__name__)
+        for directory in (self._objects, self._meta, self._tmp):
+            os.makedirs(directory, exist_ok=True)
+        self._drop_stale_tmp()
+
+    def _drop_stale_tmp(self):
+        # other workers may be writing, only files old enough to be abandoned go
+        cutoff = time.time() - _STALE_TMP_SECONDS
+        for entry in os.scandir(self._tmp):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _path(root: str, object_name: str) -> str:
+        digest = hashlib.sha1(object_name.encode()).hexdigest()
+        return os.path.join(root, digest[:2], digest[2:4], quote(object_name, safe=""))
+
+    def _tmp_path(self) -> str:
+        return os.path.join(self._tmp, uuid.uuid4().hex)
+
+    @staticmethod
+    def _commit(tmp_path: str, path: str):
+        # rename is atomic within one filesystem, tmp/ lives under the same root for that reason
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, object_name: str, meta: Dict[str, object]):
+        tmp_path = self._tmp_path()
+        with open(tmp_path, "w") as out:
+            json.dump(meta, out)
+        self._commit(tmp_path, self._path(self._meta, object_name))
+
+    def _read_meta(self, object_name: str) -> Dict[str, object]:
+        try:
+            with open(self._path(self._meta, object_name)) as meta:
+                return json.load(meta)
+        except (OSError, ValueError):
+            return {}
+
+    def codec_for(self, content_type: Optional[str]) -> Optional[str]:
+        if self.codec and codecs.compressible(content_type, self.compress_types):
+            return self.codec
+        return None
+
+    def addDoc(self, object_name: str, data: BinaryIO, length: int = -1,
+               content_type: str = "application/octet-stream", codec: Optional[str] = None) -> bool:
+        # the data is read to its end, length is only a hint here
+        tmp_path = self._tmp_path()
+        try:
+            source = codecs.encode(codec, data, self.compression_level) if codec else data
+            md5 = hashlib.md5()
+            with open(tmp_path, "wb") as out:
+                for chunk in iter(lambda: source.read(_COPY_SIZE), b""):
+                    md5.update(chunk)
+                    out.write(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+            # metadata first, the data rename is what makes the object visible
+            self._write_meta(object_name, {
+                "content_type": content_type or "application/octet-stream",
+                "etag": md5.hexdigest(),
+                "codec": codec
+            })
+            self._commit(tmp_path, self._path(self._objects, object_name))
+            return True
+        except Exception as e:
+            self.logger.error(f"Error adding document {object_name}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def getDoc(self, object_name: str, offset: int = 0, length: int = 0,
+               codec: Optional[str] = None) -> Optional[BinaryIO]:
+        try:
+            file = open(self._path(self._objects, object_name), "rb")
+        except OSError as e:
+            self.logger.error(f"Error getting document {object_name}: {e}")
+            return None
+        try:
+            if codec:
+                return codecs.DecodedStream(codec, file, offset, length)
+            file.seek(offset)
+            return FileRange(file, length)
+        except Exception as e:
+            file.close()
+            self.logger.error(f"Error reading document {object_name}: {e}")
+            return None
+
+    def copyDoc(self, source_object_name: str, object_name: str) -> bool:
+        tmp_path = self._tmp_path()
+        try:
+            shutil.copyfile(self._path(self._objects, source_object_name), tmp_path)
+            self._write_meta(object_name, self._read_meta(source_object_name))
+            self._commit(tmp_path, self._path(self._objects, object_name))
+            return True
+        except OSError as e:
+            self.logger.error(f"Error copying document {source_object_name} to {object_name}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+    def statDoc(self, object_name: str) -> Optional[Dict[str, object]]:
+        try:
+            stat = os.stat(self._path(self._objects, object_name))
+        except OSError as e:
+            self.logger.error(f"Error getting stat of document {object_name}: {e}")
+            return None
+        meta = self._read_meta(object_name)
+        return {
+            "size": stat.st_size,
+            "etag": meta.get("etag"),
+            "last_modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            "content_type": meta.get("content_type")
+        }
+
+    def getDocPath(self, object_name: str) -> Optional[str]:
+        path = self._path(self._objects, object_name)
+        return path if os.path.isfile(path) else None
+
+    def getDocUrl(self, object_name: str, expires: timedelta, codec: Optional[str] = None) -> Optional[str]:
+        # nothing to sign, callers serve the content themselves
+        return None
+
+    def listDocs(self, prefix: Optional[str] = None) -> Iterator[Dict[str, object]]:
+        # hashed directories carry no order, names are collected and sorted to list in key order like s3
+        names = []
+        for directory, _, files in os.walk(self._objects):
+            for file in files:
+                name = unquote(file)
+                if not prefix or name.startswith(prefix):
+                    names.append(name)
+        for name in sorted(names):
+            try:
+                stat = os.stat(self._path(self._objects, name))
+            except FileNotFoundError:
+                continue  # deleted while listing
+            yield {
+                "name": name,
+                "size": stat.st_size,
+                "last_modified": datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+            }
+
+    def deleteDoc(self, object_name: str) -> bool:
+        # like s3, deleting a missing object succeeds
+        try:
+            for root in (self._objects, self._meta):
+                try:
+                    os.remove(self._path(root, object_name))
+                except FileNotFoundError:
+                    pass
+            return True
+        except OSError as e:
+            self.logger.error(f"Error deleting document {object_name}: {e}")
+            return False
+
+    def deleteDocs(self, object_names: List[str]) -> List[str]:
+        return [name for name in object_names if not self.deleteDoc(name)]
@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+
+
+class IDocumentText(ABC):
+    @abstractmethod
+    def to_json(self) -> str: pass
+
+    @abstractmethod
+    def word_count(self) -> int: pass
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from pymongo import IndexModel
+from typing import Iterator, List, Optional
+from dao.text_module.text import DocumentText
+
+
+class ITextDAO(ABC):
+    # indexes the queries of this dao rely on, provisioned by ManagementDAO.ensure_indexes
+    INDEXES: List[IndexModel] = []
+
+    @abstractmethod
+    def save(self, text: DocumentText) -> bool: pass
+
+    @abstractmethod
+    def findByVersion(self, documentId: str, version_number: int) -> Optional[DocumentText]: pass
+
+    @abstractmethod
+    def findLatest(self, documentId: str) -> Optional[DocumentText]: pass
+
+    @abstractmethod
+    def findByChecksum(self, checksum: str) -> Optional[DocumentText]: pass
+
+    @abstractmethod
+    def findVersionNumbers(self, documentId: str) -> List[int]: pass
+
+    @abstractmethod
+    def iterLatest(self) -> Iterator[DocumentText]: pass
+
+    @abstractmethod
+    def deleteVersions(self, documentId: str, version_numbers: List[int]) -> int: pass
+
+    @abstractmethod
+    def deleteByDocument(self, documentId: str) -> int: pass
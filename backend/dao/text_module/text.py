@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from datetime import datetime
+from typing import List, Optional
+from dao.text_module.itext import IDocumentText
+
+
+class DocumentText(BaseModel, IDocumentText):
+    textId: str = Field(default_factory=lambda: str(ObjectId()), description="Unique identifier")
+    documentId: str = Field(..., description="Reference to the document")
+    version_number: int = Field(..., description="Version the text was extracted from")
+    checksum: Optional[str] = Field(None, description="SHA-256 of the version content, extraction is reused by it")
+    status: str = Field("ok", description="ok, unsupported or too_large")
+    extractor: Optional[str] = Field(None, description="Extractor that produced the text (pdf, docx, text)")
+    text: str = Field("", description="Normalized plain text")
+    word_offsets: List[int] = Field([], description="Character offset of each word in text")
+    truncated: bool = Field(False, description="Whether the text was cut at the extraction limit")
+    extracted_at: datetime = Field(default_factory=datetime.now, description="Date and time of extraction")
+
+    def __init__(
+            self,
+            documentId: str,
+            version_number: int,
+            **kwargs
+    ):
+        super().__init__(
+            documentId=documentId,
+            version_number=version_number,
+            **kwargs
+        )
+
+    def to_json(self) -> str:
+        return self.model_dump_json()
+
+    def word_count(self) -> int:
+        return len(self.word_offsets)
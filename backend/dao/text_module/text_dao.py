@@ -0,0 +1,69 @@
+from typing import Iterator, List, Optional
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING
+from dao.text_module.itext_dao import ITextDAO
+from dao.text_module.text import DocumentText
+
+
+class TextDAO(ITextDAO):
+    INDEXES = [
+        # one text per version, also serves the newest-first scans
+        IndexModel([("documentId", ASCENDING), ("version_number", DESCENDING)],
+                   name="documentId_version_unique", unique=True),
+        IndexModel([("checksum", ASCENDING)], name="checksum"),
+    ]
+
+    def __init__(self, mongo_client: MongoClient, database_name: str, collection_name: str):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection_name]
+
+    def save(self, text: DocumentText) -> bool:
+        # re-extracting a version replaces its text, keeping the record id
+        text_dict = text.dict()
+        del text_dict["textId"]
+        key = {"documentId": text.documentId, "version_number": text.version_number}
+        result = self.collection.replace_one(key, text_dict, upsert=True)
+        return result.acknowledged
+
+    def findByVersion(self, documentId: str, version_number: int) -> Optional[DocumentText]:
+        doc = self.collection.find_one({"documentId": documentId, "version_number": version_number})
+        return self._convert_text(doc)
+
+    def findLatest(self, documentId: str) -> Optional[DocumentText]:
+        doc = self.collection.find_one({"documentId": documentId}, {"word_offsets": 0},
+                                       sort=[("version_number", DESCENDING)])
+        return self._convert_text(doc)
+
+    def findByChecksum(self, checksum: str) -> Optional[DocumentText]:
+        doc = self.collection.find_one({"checksum": checksum})
+        return self._convert_text(doc)
+
+    def findVersionNumbers(self, documentId: str) -> List[int]:
+        docs = self.collection.find({"documentId": documentId}, {"version_number": 1, "_id": 0})
+        return [doc["version_number"] for doc in docs]
+
+    def iterLatest(self) -> Iterator[DocumentText]:
+        # streamed in index order, the first text seen for a document is its newest
+        docs = self.collection.find({}, {"word_offsets": 0}).sort(
+            [("documentId", ASCENDING), ("version_number", DESCENDING)]
+        )
+        last_id = None
+        for doc in docs:
+            if doc["documentId"] != last_id:
+                last_id = doc["documentId"]
+                yield self._convert_text(doc)
+
+    def deleteVersions(self, documentId: str, version_numbers: List[int]) -> int:
+        result = self.collection.delete_many({"documentId": documentId, "version_number": {"$in": version_numbers}})
+        return result.deleted_count
+
+    def deleteByDocument(self, documentId: str) -> int:
+        result = self.collection.delete_many({"documentId": documentId})
+        return result.deleted_count
+
+    @staticmethod
+    def _convert_text(doc: dict) -> Optional[DocumentText]:
+        if doc:
+            doc["textId"] = str(doc["_id"])
+            del doc["_id"]
+            return DocumentText(**doc)
+        return None
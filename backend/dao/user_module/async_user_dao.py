@@ -0,0 +1,55 @@
+from dao.user_module.iasync_user_dao import IAsyncUserDAO
+from dao.user_module.user import User
+from dao.user_module.user_dao import UserDAO
+from pymongo import AsyncMongoClient
+from bson import ObjectId
+from typing import AsyncIterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, async_find_page, async_iter_all
+
+
+class AsyncUserDAO(IAsyncUserDAO):
+    def __init__(self, mongo_client: AsyncMongoClient, database_name: str, collection: str):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection]
+
+    async def save(self, user: User) -> bool:
+        user_dict = dict(user)
+        user_dict["_id"] = ObjectId(user_dict["userId"])  # Convert to ObjectId
+        del user_dict["userId"]
+        result = await self.collection.insert_one(user_dict)
+        return result.acknowledged
+
+    async def findById(self, userId: str) -> Optional[User]:
+        user = await self.collection.find_one({"_id": ObjectId(userId)})
+        if user:
+            return UserDAO._convert_doc(user)
+        return None
+
+    async def findByEmail(self, email: str) -> Optional[User]:
+        user = await self.collection.find_one({"email": email})
+        if user:
+            return UserDAO._convert_doc(user)
+        return None
+
+    async def findAll(self) -> List[User]:
+        return [user async for user in self.iterAll()]
+
+    async def findPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return await async_find_page(self.collection, {}, after, limit, UserDAO._convert_doc)
+
+    def iterAll(self) -> AsyncIterator[User]:
+        return async_iter_all(self.collection, {}, UserDAO._convert_doc)
+
+    async def update(self, user: User) -> bool:
+        user_dict = user.dict()
+        user_id = ObjectId(user_dict["userId"])
+        del user_dict["userId"]
+        result = await self.collection.update_one(
+            {"_id": user_id},
+            {"$set": user_dict}
+        )
+        return result.modified_count > 0
+
+    async def delete(self, userId: str) -> bool:
+        result = await self.collection.delete_one({"_id": ObjectId(userId)})
+        return result.deleted_count > 0
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from dao.user_module.user import User
+from typing import AsyncIterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+
+
+class IAsyncUserDAO(ABC):
+    @abstractmethod
+    async def save(self, user: User) -> bool:
+        pass
+
+    @abstractmethod
+    async def findById(self, userId: str) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def findByEmail(self, email: str) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def findAll(self) -> List[User]:
+        pass
+
+    @abstractmethod
+    async def findPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        pass
+
+    @abstractmethod
+    def iterAll(self) -> AsyncIterator[User]:
+        pass
+
+    @abstractmethod
+    async def update(self, user: User) -> bool:
+        pass
+
+    @abstractmethod
+    async def delete(self, userId: str) -> bool:
+        pass
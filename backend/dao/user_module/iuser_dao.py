@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
+from pymongo import IndexModel
 from dao.user_module.user import User
-from typing import List, Optional
+from typing import Iterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
 
 
 class IUserDAO(ABC):
+    # indexes the queries of this dao rely on, provisioned by ManagementDAO.ensure_indexes
+    INDEXES: List[IndexModel] = []
+
     @abstractmethod
     def save(self, user: User) -> bool:
         pass
@@ -20,6 +25,14 @@ class IUserDAO(ABC):
     def findAll(self) -> List[User]:
         pass
 
+    @abstractmethod
+    def findPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        pass
+
+    @abstractmethod
+    def iterAll(self) -> Iterator[User]:
+        pass
+
     @abstractmethod
     def update(self, user: User) -> bool:
         pass
@@ -1,11 +1,16 @@
 from dao.user_module.iuser_dao import IUserDAO
 from dao.user_module.user import User
-from pymongo import MongoClient
+from pymongo import MongoClient, IndexModel, ASCENDING
 from bson import ObjectId
-from typing import List, Optional
+from typing import Iterator, List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, find_page, iter_all
 
 
 class UserDAO(IUserDAO):
+    INDEXES = [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ]
+
     def __init__(self, mongo_client: MongoClient, database_name: str, collection: str):
         self.db = mongo_client[database_name]
         self.collection = self.db[collection]
@@ -30,8 +35,13 @@ class UserDAO(IUserDAO):
         return None
 
     def findAll(self) -> List[User]:
-        users = self.collection.find({})
-        return [self._convert_doc(user) for user in users]
+        return list(self.iterAll())
+
+    def findPage(self, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        return find_page(self.collection, {}, after, limit, self._convert_doc)
+
+    def iterAll(self) -> Iterator[User]:
+        return iter_all(self.collection, {}, self._convert_doc)
 
     def update(self, user: User) -> bool:
         user_dict = user.dict()
@@ -0,0 +1,45 @@
+from typing import List, Optional
+from pymongo import AsyncMongoClient, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from dao.document_module.document import Version
+from dao.version_module.iasync_version_dao import IAsyncVersionDAO
+from dao.version_module.version_dao import VersionDAO
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, page_size, to_page
+
+
+class AsyncVersionDAO(IAsyncVersionDAO):
+    def __init__(self, mongo_client: AsyncMongoClient, database_name: str, collection_name: str):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection_name]
+
+    async def save(self, documentId: str, version: Version) -> bool:
+        try:
+            result = await self.collection.insert_one(VersionDAO.to_doc(documentId, version))
+        except DuplicateKeyError:
+            return False
+        return result.acknowledged
+
+    async def saveMany(self, documentId: str, versions: List[Version]) -> int:
+        if not versions:
+            return 0
+        try:
+            result = await self.collection.insert_many([VersionDAO.to_doc(documentId, v) for v in versions],
+                                                       ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            return e.details.get("nInserted", 0)
+
+    async def findOne(self, documentId: str, version_number: int) -> Optional[Version]:
+        doc = await self.collection.find_one({"documentId": documentId, "version_number": version_number})
+        return VersionDAO._convert_version(doc) if doc else None
+
+    async def findByDocument(self, documentId: str) -> List[Version]:
+        docs = self.collection.find({"documentId": documentId}).sort("version_number", ASCENDING)
+        return [VersionDAO._convert_version(doc) async for doc in docs]
+
+    async def findPage(self, documentId: str, after: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        limit = page_size(limit)
+        docs = self.collection.find(VersionDAO.page_query(documentId, after)) \
+            .sort("version_number", DESCENDING).limit(limit + 1)
+        return to_page([doc async for doc in docs], limit, VersionDAO._convert_version, key="version_number")
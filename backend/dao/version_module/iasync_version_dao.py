@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from dao.document_module.document import Version
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+
+
+class IAsyncVersionDAO(ABC):
+    @abstractmethod
+    async def save(self, documentId: str, version: Version) -> bool: pass
+
+    @abstractmethod
+    async def saveMany(self, documentId: str, versions: List[Version]) -> int: pass
+
+    @abstractmethod
+    async def findOne(self, documentId: str, version_number: int) -> Optional[Version]: pass
+
+    @abstractmethod
+    async def findByDocument(self, documentId: str) -> List[Version]: pass
+
+    @abstractmethod
+    async def findPage(self, documentId: str, after: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from pymongo import IndexModel
+from typing import Dict, List, Optional, Set
+from dao.document_module.document import Version
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+
+
+class IVersionDAO(ABC):
+    # indexes the queries of this dao rely on, provisioned by ManagementDAO.ensure_indexes
+    INDEXES: List[IndexModel] = []
+
+    @abstractmethod
+    def save(self, documentId: str, version: Version, session=None) -> bool: pass
+
+    @abstractmethod
+    def saveMany(self, documentId: str, versions: List[Version]) -> int: pass
+
+    @abstractmethod
+    def findOne(self, documentId: str, version_number: int) -> Optional[Version]: pass
+
+    @abstractmethod
+    def findByDocument(self, documentId: str) -> List[Version]: pass
+
+    @abstractmethod
+    def findLatestNumber(self, documentId: str) -> int: pass
+
+    @abstractmethod
+    def findNumbers(self, documentIds: List[str]) -> Dict[str, Set[int]]: pass
+
+    @abstractmethod
+    def findPage(self, documentId: str, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
+    @abstractmethod
+    def deleteVersions(self, documentId: str, version_numbers: List[int]) -> List[int]: pass
+
+    @abstractmethod
+    def deleteByDocument(self, documentId: str) -> int: pass
@@ -0,0 +1,95 @@
+from typing import Dict, List, Optional, Set
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from dao.document_module.document import Version
+from dao.version_module.iversion_dao import IVersionDAO
+from dao.pagination import Page, DEFAULT_PAGE_SIZE, page_size, to_page
+
+
+class VersionDAO(IVersionDAO):
+    # one record per document version, the document itself only keeps the version it was uploaded with
+    INDEXES = [
+        # a version number is taken once, also serves the newest-first pages walked backwards
+        IndexModel([("documentId", ASCENDING), ("version_number", ASCENDING)],
+                   name="documentId_version_unique", unique=True),
+    ]
+
+    def __init__(self, mongo_client: MongoClient, database_name: str, collection_name: str):
+        self.db = mongo_client[database_name]
+        self.collection = self.db[collection_name]
+
+    def save(self, documentId: str, version: Version, session=None) -> bool:
+        # a single insert is the append, a concurrent writer holding the same number gets False
+        try:
+            result = self.collection.insert_one(self.to_doc(documentId, version), session=session)
+        except DuplicateKeyError:
+            return False
+        return result.acknowledged
+
+    def saveMany(self, documentId: str, versions: List[Version]) -> int:
+        # versions already stored are skipped, so a migration that was cut short can run again
+        if not versions:
+            return 0
+        try:
+            result = self.collection.insert_many([self.to_doc(documentId, v) for v in versions], ordered=False)
+            return len(result.inserted_ids)
+        except BulkWriteError as e:
+            return e.details.get("nInserted", 0)
+
+    def findOne(self, documentId: str, version_number: int) -> Optional[Version]:
+        doc = self.collection.find_one({"documentId": documentId, "version_number": version_number})
+        return self._convert_version(doc) if doc else None
+
+    def findByDocument(self, documentId: str) -> List[Version]:
+        docs = self.collection.find({"documentId": documentId}).sort("version_number", ASCENDING)
+        return [self._convert_version(doc) for doc in docs]
+
+    def findLatestNumber(self, documentId: str) -> int:
+        # 0 without records, read backwards along the unique index
+        doc = self.collection.find_one({"documentId": documentId}, {"version_number": 1},
+                                       sort=[("version_number", DESCENDING)])
+        return doc["version_number"] if doc else 0
+
+    def findNumbers(self, documentIds: List[str]) -> Dict[str, Set[int]]:
+        # one $in query, the version numbers stored for each document
+        numbers: Dict[str, Set[int]] = {}
+        docs = self.collection.find({"documentId": {"$in": documentIds}},
+                                    {"_id": 0, "documentId": 1, "version_number": 1})
+        for doc in docs:
+            numbers.setdefault(doc["documentId"], set()).add(doc["version_number"])
+        return numbers
+
+    def findPage(self, documentId: str, after: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        # newest first, the cursor is the last version number of the page
+        limit = page_size(limit)
+        docs = self.collection.find(self.page_query(documentId, after)) \
+            .sort("version_number", DESCENDING).limit(limit + 1)
+        return to_page(list(docs), limit, self._convert_version, key="version_number")
+
+    def deleteVersions(self, documentId: str, version_numbers: List[int]) -> List[int]:
+        # one by one, so a version removed concurrently is not reported (and released) twice
+        return [n for n in version_numbers
+                if self.collection.delete_one({"documentId": documentId, "version_number": n}).deleted_count]
+
+    def deleteByDocument(self, documentId: str) -> int:
+        result = self.collection.delete_many({"documentId": documentId})
+        return result.deleted_count
+
+    @staticmethod
+    def page_query(documentId: str, after: Optional[str]) -> dict:
+        query = {"documentId": documentId}
+        if after is not None:
+            if not after.isdigit():
+                raise ValueError(f"Invalid cursor: {after}")
+            query["version_number"] = {"$lt": int(after)}
+        return query
+
+    @staticmethod
+    def to_doc(documentId: str, version: Version) -> dict:
+        return dict(version.dict(), documentId=documentId)
+
+    @staticmethod
+    def _convert_version(doc: dict) -> Version:
+        doc.pop("_id", None)
+        doc.pop("documentId", None)
+        return Version(**doc)
@@ -33,15 +33,18 @@ class AuthManager(IAuthManager):
         return self._dao.saveUser(new_user)
 
     def check_password(self, email: str, password: str) -> bool:
+        return self.authenticate(email, password) is not None
+
+    def authenticate(self, email: str, password: str) -> Optional[User]:
         user = self._dao.findUserByEmail(email)
         if not user:
-            return False
+            return None
 
         try:
             hashed = user.get_password()
         except ValueError:
-            return False
-        return verify_password(password, hashed)
+            return None
+        return user if verify_password(password, hashed) else None
 
     def get_user_information(self, user_id: str) -> Optional[User]:
         try:
@@ -14,6 +14,9 @@ class IAuthManager(ABC):
     @abstractmethod
     def check_password(self, email: str, password: str) -> bool: pass
 
+    @abstractmethod
+    def authenticate(self, email: str, password: str) -> Optional[User]: pass
+
     @abstractmethod
     def get_user_information(self, user_id: str) -> Optional[User]: pass
 
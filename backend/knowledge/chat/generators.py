@@ -0,0 +1,33 @@
+import asyncio
+import re
+from typing import AsyncIterator, Dict, List
+from knowledge.chat.igenerator import IGenerator
+
+_TOKEN_RE = re.compile(r"\S+\s*")
+
+
+class EchoGenerator(IGenerator):
+    # local stand-in for a language model: answers with the retrieved passages, citing each by number
+    def __init__(self, token_delay: float = 0.0):
+        self.token_delay = token_delay
+
+    async def generate(self, question: str, passages: List[Dict[str, object]]) -> AsyncIterator[str]:
+        if not passages:
+            yield "No readable document matches the question."
+            return
+        for number, passage in enumerate(passages, start=1):
+            for token in _TOKEN_RE.findall(passage["text"]):
+                await asyncio.sleep(self.token_delay)
+                yield token
+            yield f" [{number}]\n"
+
+
+GENERATORS = {
+    "echo": EchoGenerator
+}
+
+
+def create_generator(name: str, **kwargs) -> IGenerator:
+    if name not in GENERATORS:
+        raise ValueError(f"Unknown chat generator: {name}")
+    return GENERATORS[name](**kwargs)
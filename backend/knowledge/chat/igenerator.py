@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List
+
+
+class IGenerator(ABC):
+    @abstractmethod
+    def generate(self, question: str, passages: List[Dict[str, object]]) -> AsyncIterator[str]:
+        pass
@@ -1,8 +1,11 @@
-from typing import Dict, List, Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO, Tuple
 from dao.management_dao import Document, Version
 from dao.management_dao import ManagementDAO
 from knowledge.permission.per_manager import PermissionManager
 from knowledge.document.idoc_manager import IDocumentManager
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
+from dao.document_module.errors import VersionConflictError
+from datetime import timedelta
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,13 +24,8 @@ class DocumentManager(IDocumentManager):
             if not owner:
                 logger.error("Upload failed: Owner field is required")
                 return {"error": "Owner field is required"}
-                
-            content.seek(0, 2)
-            file_size = content.tell()
-            content.seek(0)
-            
-            logger.info(f"Document size: {file_size} bytes")
 
+            # size and checksum are filled in while the content is streamed to storage
             doc = Document(
                 name=name,
                 owner=owner,
@@ -35,7 +33,7 @@ class DocumentManager(IDocumentManager):
                 departmentId=department_id,
                 description=description,
                 university=university,
-                file_size=file_size,
+                file_size=0,
                 tags=tags,
                 category=category
             )
@@ -46,7 +44,8 @@ class DocumentManager(IDocumentManager):
             if "error" in result:
                 logger.error(f"Upload failed: {result['error']}")
             else:
-                logger.info(f"Document uploaded successfully with ID: {doc.documentId}")
+                logger.info(f"Document uploaded successfully with ID: {doc.documentId} "
+                            f"({doc.versions[0].file_size} bytes)")
                 
             return result
         except Exception as e:
@@ -57,8 +56,26 @@ class DocumentManager(IDocumentManager):
         doc = self._dao.findDocumentById(document_id)
         return doc.model_dump() if doc else {}
 
-    def get_content(self, document_id: str, user_id: str) -> Optional[BinaryIO]:
-        return self._dao.get_document_content(document_id)
+    def get_metadata_batch(self, document_ids: List[str],
+                           include_versions: bool = False) -> List[Dict[str, object]]:
+        docs = self._dao.findDocumentsByIds(document_ids)
+        exclude = None if include_versions else {'versions'}
+        return [doc.model_dump(exclude=exclude) for doc in docs]
+
+    def get_content(self, document_id: str, user_id: str, version_number: Optional[int] = None,
+                    offset: int = 0, length: int = 0, decode: bool = True) -> Optional[BinaryIO]:
+        return self._dao.get_document_content(document_id, version_number, offset=offset, length=length,
+                                              decode=decode)
+
+    def get_content_info(self, document_id: str, user_id: str,
+                         version_number: Optional[int] = None) -> Optional[Dict[str, object]]:
+        return self._dao.stat_document_content(document_id, version_number)
+
+    def get_content_url(self, document_id: str, user_id: str, version_number: Optional[int] = None,
+                        expires: timedelta = timedelta(minutes=5),
+                        accept_encodings: Tuple[str, ...] = ()) -> Optional[str]:
+        return self._dao.get_document_content_url(document_id, version_number, expires=expires,
+                                                  accept_encodings=accept_encodings)
 
     def update_metadata(self, modified_by: str, document_id: str, new_name: str, new_department_id: str, new_tags: List[str],
                         new_owner: str, new_category: List[str], new_description: str, new_university: str) -> bool:
@@ -77,29 +94,34 @@ class DocumentManager(IDocumentManager):
         doc.university = new_university
         return self._dao.updateMetaData(doc)
 
-    def update_content(self, modified_by: str, document_id: str, new_content: BinaryIO) -> bool:
+    def update_content(self, modified_by: str, document_id: str, new_content: BinaryIO,
+                       expected_version: Optional[int] = None) -> Optional[int]:
         # find doc
         doc = self._dao.findDocumentById(document_id)
 
         if not doc:
-            return False
-        # get file's size
-        new_content.seek(0, 2)
-        file_size = new_content.tell()
-        new_content.seek(0)
+            return None
+        if expected_version is not None and doc.currentNumber != expected_version:
+            # stale before any byte is stored
+            raise VersionConflictError(document_id, expected_version, doc.currentNumber)
 
-        return self._dao.update_content(modified_by, document_id, new_content, file_size)
+        return self._dao.update_content(modified_by, document_id, new_content, expected_version, doc.dType)
 
     def delete(self, deleted_by: str, document_id: str) -> bool:
         return self._dao.deleteDocument(user_id=deleted_by, document_id=document_id)
 
     def get_all_metadata(self) -> Dict[str, Dict[str, object]]:
-        docs = self._dao.findAllDocuments()
+        docs = self._dao.iterAllDocumentsMeta()
         return {doc.documentId: doc.model_dump(exclude={'versions'}) for doc in docs}
 
     def get_all_versions(self, user_id: str, document_id: str) -> List[Version]:
-        doc = self._dao.findDocumentById(document_id)
-        return doc.versions if doc else []
+        return self._dao.getVersions(document_id)
+
+    def get_versions_page(self, user_id: str, document_id: str, after: Optional[str] = None,
+                          limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        if not self._permission_manager.has_permission(user_id=user_id, document_id=document_id, required="read"):
+            raise PermissionError("User does not have permission to read the document.")
+        return self._dao.getVersionsPage(document_id, after, limit)
 
     def get_specific_version(self, user_id: str, document_id: str, version_number: int) -> Optional[Document]:
         # check permission before read document
@@ -111,7 +133,7 @@ class DocumentManager(IDocumentManager):
 
         if not doc:
             return None
-        version = next((v for v in doc.versions if v.version_number == version_number), None)  # find version
+        version = self._dao.findVersion(document_id, int(version_number))  # find version
         if not version:
             return None
         versioned_doc = doc.model_copy()
@@ -119,7 +141,8 @@ class DocumentManager(IDocumentManager):
         versioned_doc.currentNumber = version_number
         return versioned_doc
 
-    def restore_version(self, document_id: str, restored_by: str, version_number: int) -> bool:
+    def restore_version(self, document_id: str, restored_by: str, version_number: int,
+                        expected_version: Optional[int] = None) -> Optional[int]:
         # check permission before read document
         if not self._permission_manager.has_permission(user_id=restored_by, document_id=document_id, required="write"):
             raise PermissionError("User does not have permission to restore the document.")
@@ -128,12 +151,6 @@ class DocumentManager(IDocumentManager):
         doc = self._dao.findDocumentById(document_id)
 
         if not doc:
-            return False
-        version = next((v for v in doc.versions if v.version_number == version_number), None)  # find version
-        if not version:
-            return False
-
-        old_content = self._dao.get_document_content(document_id, version_number)  # find old content
-        if not old_content:
-            return False
-        return self.update_content(document_id=document_id, modified_by=restored_by, new_content=old_content)
+            return None
+        # the restored version is a new version sharing the old content, no bytes are copied
+        return self._dao.restore_content(restored_by, document_id, int(version_number), expected_version)
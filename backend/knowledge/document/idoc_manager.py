@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO, Tuple
+from datetime import timedelta
 from dao.management_dao import Document, Version
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
 
 
 class IDocumentManager(ABC):
@@ -12,14 +14,29 @@ class IDocumentManager(ABC):
     def get_metadata(self, document_id: str, user_id: str) -> Dict[str, object]: pass
 
     @abstractmethod
-    def get_content(self, document_id: str, user_id: str) -> Optional[BinaryIO]: pass
+    def get_metadata_batch(self, document_ids: List[str],
+                           include_versions: bool = False) -> List[Dict[str, object]]: pass
+
+    @abstractmethod
+    def get_content(self, document_id: str, user_id: str, version_number: Optional[int] = None,
+                    offset: int = 0, length: int = 0, decode: bool = True) -> Optional[BinaryIO]: pass
+
+    @abstractmethod
+    def get_content_info(self, document_id: str, user_id: str,
+                         version_number: Optional[int] = None) -> Optional[Dict[str, object]]: pass
+
+    @abstractmethod
+    def get_content_url(self, document_id: str, user_id: str, version_number: Optional[int] = None,
+                        expires: timedelta = timedelta(minutes=5),
+                        accept_encodings: Tuple[str, ...] = ()) -> Optional[str]: pass
 
     @abstractmethod
     def update_metadata(self, modified_by: str, document_id: str, new_name: str, new_department_id: str, new_tags: List[str],
                         new_owner: str, new_category: List[str], new_description: str, new_university: str) -> bool: pass
 
     @abstractmethod
-    def update_content(self, modified_by: str, document_id: str, new_content: BinaryIO) -> bool: pass
+    def update_content(self, modified_by: str, document_id: str, new_content: BinaryIO,
+                       expected_version: Optional[int] = None) -> Optional[int]: pass
 
     @abstractmethod
     def delete(self, deleted_by: str, document_id: str) -> bool: pass
@@ -30,9 +47,14 @@ class IDocumentManager(ABC):
     @abstractmethod
     def get_all_versions(self, user_id: str, document_id: str) -> List[Version]: pass
 
+    @abstractmethod
+    def get_versions_page(self, user_id: str, document_id: str, after: Optional[str] = None,
+                          limit: int = DEFAULT_PAGE_SIZE) -> Page: pass
+
     @abstractmethod
     def get_specific_version(self, user_id: str, document_id: str, version_number: int) -> Optional[Document]: pass
 
     @abstractmethod
-    def restore_version(self, document_id: str, restored_by: str, version_number: int) -> bool: pass
+    def restore_version(self, document_id: str, restored_by: str, version_number: int,
+                        expected_version: Optional[int] = None) -> Optional[int]: pass
 
@@ -0,0 +1,144 @@
+import logging
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from threading import Lock
+from typing import Callable, Dict, Iterable, Optional, Set
+from dao.management_dao import ManagementDAO, Version
+from dao.text_module.text import DocumentText
+from knowledge.extraction.extractors import extract_text, normalize_text, word_offsets
+from knowledge.extraction.iextraction_manager import IExtractionManager
+
+logger = logging.getLogger(__name__)
+
+_SPOOL_SIZE = 8 * 1024 * 1024
+
+
+class ExtractionManager(IExtractionManager):
+    # extracts the text of new versions in a background pool, so uploads return before it runs
+    def __init__(self, management_dao: ManagementDAO, max_workers: int, max_bytes: int, max_chars: int,
+                 on_extracted: Optional[Callable[[str, int], None]] = None):
+        self._dao = management_dao
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self._on_extracted = on_extracted
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kms-extract")
+        self._lock = Lock()
+        self._queued: Set[str] = set()
+        self.extracted = 0
+        self.reused = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def submit(self, document_id: str) -> bool:
+        # a document already waiting picks up every missing version when it runs
+        with self._lock:
+            if document_id in self._queued:
+                return False
+            self._queued.add(document_id)
+        self._pool.submit(self._run, document_id)
+        return True
+
+    def catch_up(self, document_ids: Iterable[str]) -> int:
+        return sum(self.submit(document_id) for document_id in document_ids)
+
+    def _run(self, document_id: str):
+        with self._lock:
+            self._queued.discard(document_id)
+        try:
+            added = self.process_document(document_id)
+            if self._on_extracted:
+                self._on_extracted(document_id, added)
+        except Exception as e:
+            logger.error(f"Text extraction failed for document {document_id}: {e}", exc_info=True)
+
+    def process_document(self, document_id: str) -> int:
+        # only versions without a stored text are processed
+        done = set(self._dao.getTextVersionNumbers(document_id))
+        added = 0
+        for version in self._dao.getVersions(document_id):
+            if version.version_number in done:
+                continue
+            text = self._extract_version(document_id, version)
+            if text is not None and self._dao.saveDocumentText(text):
+                added += 1
+        return added
+
+    def _extract_version(self, document_id: str, version: Version) -> Optional[DocumentText]:
+        if version.checksum:
+            # same bytes as a version already processed, e.g. a restore or a re-upload
+            existing = self._dao.findDocumentTextByChecksum(version.checksum)
+            if existing:
+                self._count("reused")
+                return existing.model_copy(update={"documentId": document_id,
+                                                   "version_number": version.version_number})
+
+        if version.file_size > self.max_bytes:
+            self._count("skipped")
+            return self._build(document_id, version, None, None, status="too_large")
+
+        content = self._dao.get_document_content(document_id, version.version_number)
+        if content is None:
+            self._count("failed")
+            return None
+        try:
+            # pdf and docx need random access, spill to disk past a few megabytes
+            with SpooledTemporaryFile(max_size=_SPOOL_SIZE) as buffer:
+                shutil.copyfileobj(content, buffer)
+                if buffer.tell() > self.max_bytes:
+                    self._count("skipped")
+                    return self._build(document_id, version, None, None, status="too_large")
+                buffer.seek(0)
+                raw, extractor = extract_text(buffer)
+        except Exception as e:
+            logger.warning(f"Could not extract text of {document_id} v{version.version_number}: {e}")
+            raw, extractor = None, None
+        finally:
+            content.close()
+            release_conn = getattr(content, "release_conn", None)
+            if release_conn:
+                release_conn()
+
+        if raw is None:
+            self._count("skipped")
+            return self._build(document_id, version, None, None, status="unsupported")
+        self._count("extracted")
+        return self._build(document_id, version, raw, extractor)
+
+    def _build(self, document_id: str, version: Version, raw: Optional[str], extractor: Optional[str],
+               status: str = "ok") -> DocumentText:
+        if raw is None:
+            # recorded, so the version is not retried on every catch up
+            return DocumentText(documentId=document_id, version_number=version.version_number,
+                                checksum=version.checksum, status=status)
+        text = normalize_text(raw)
+        truncated = len(text) > self.max_chars
+        if truncated:
+            text = text[:self.max_chars]
+        return DocumentText(
+            documentId=document_id,
+            version_number=version.version_number,
+            checksum=version.checksum,
+            extractor=extractor,
+            text=text,
+            word_offsets=word_offsets(text),
+            truncated=truncated
+        )
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "queued": len(self._queued),
+                "extracted": self.extracted,
+                "reused": self.reused,
+                "skipped": self.skipped,
+                "failed": self.failed
+            }
+
+    def shutdown(self):
+        # queued documents are dropped, the next catch up finds them again
+        self._pool.shutdown(wait=True, cancel_futures=True)
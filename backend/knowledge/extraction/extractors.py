@@ -0,0 +1,97 @@
+import re
+import logging
+import unicodedata
+import zipfile
+from typing import BinaryIO, List, Optional, Tuple
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # optional, pdf versions are recorded as unsupported without it
+    PdfReader = None
+
+_WORD_RE = re.compile(r"\w+")
+_SPACES_RE = re.compile(r"[^\S\n]+")
+_BLANK_LINES_RE = re.compile(r"\s*\n\s*")
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_SNIFF_SIZE = 8192
+
+
+def normalize_text(text: str) -> str:
+    # composed unicode, single spaces, one newline between paragraphs
+    text = unicodedata.normalize("NFC", text).replace("\x00", "")
+    text = _SPACES_RE.sub(" ", text)
+    return _BLANK_LINES_RE.sub("\n", text).strip()
+
+
+def word_offsets(text: str) -> List[int]:
+    return [match.start() for match in _WORD_RE.finditer(text)]
+
+
+def _extract_pdf(stream: BinaryIO) -> Optional[str]:
+    if PdfReader is None:
+        logger.warning("pypdf is not installed, skipping pdf text extraction")
+        return None
+    reader = PdfReader(stream)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def _extract_docx(stream: BinaryIO) -> Optional[str]:
+    with zipfile.ZipFile(stream) as archive:
+        if "word/document.xml" not in archive.namelist():
+            return None
+        paragraphs, current = [], []
+        with archive.open("word/document.xml") as xml:
+            # streamed, the document body is never held as a whole tree
+            for event, element in ElementTree.iterparse(xml, events=("end",)):
+                if element.tag == _W_NS + "t":
+                    current.append(element.text or "")
+                elif element.tag in (_W_NS + "tab", _W_NS + "br"):
+                    current.append(" ")
+                elif element.tag == _W_NS + "p":
+                    paragraphs.append("".join(current))
+                    current = []
+                    element.clear()
+        return "\n".join(paragraphs)
+
+
+def _extract_plain(stream: BinaryIO) -> Optional[str]:
+    data = stream.read()
+    for encoding in ("utf-8-sig", "utf-16"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+def _looks_like_text(head: bytes) -> bool:
+    if b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # a multi-byte character cut at the end of the sample is fine
+        return e.start >= len(head) - 3
+    return True
+
+
+def extract_text(stream: BinaryIO) -> Tuple[Optional[str], Optional[str]]:
+    # sniffs the format from the content, returns the raw text and the extractor used
+    head = stream.read(_SNIFF_SIZE)
+    stream.seek(0)
+    if head.startswith(b"%PDF-"):
+        text = _extract_pdf(stream)
+        return (text, "pdf") if text is not None else (None, None)
+    if head.startswith(b"PK\x03\x04"):
+        try:
+            text = _extract_docx(stream)
+        except (zipfile.BadZipFile, ElementTree.ParseError):
+            text = None
+        return (text, "docx") if text is not None else (None, None)
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")) or _looks_like_text(head):
+        text = _extract_plain(stream)
+        return (text, "text") if text is not None else (None, None)
+    return None, None
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable
+
+
+class IExtractionManager(ABC):
+    @abstractmethod
+    def submit(self, document_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    def catch_up(self, document_ids: Iterable[str]) -> int:
+        pass
+
+    @abstractmethod
+    def process_document(self, document_id: str) -> int:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def shutdown(self):
+        pass
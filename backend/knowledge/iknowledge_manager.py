@@ -1,9 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO, Tuple
+from datetime import datetime, timedelta
 from dao.management_dao import User, Document, Version
+from dao.pagination import DEFAULT_PAGE_SIZE
 
 
 class IKnowledgeManager(ABC):
+    # lifecycle
+    @abstractmethod
+    def resume_extraction(self) -> int: pass
+
+    @abstractmethod
+    def shutdown(self): pass
+
     # auth
     @abstractmethod
     def sign_up(self, email: str, password: str, name: str, department_id: str, roles: List[str]) -> bool: pass
@@ -11,6 +20,9 @@ class IKnowledgeManager(ABC):
     @abstractmethod
     def login(self, email: str, password: str) -> bool: pass
 
+    @abstractmethod
+    def authenticate(self, email: str, password: str) -> Optional[User]: pass
+
     @abstractmethod
     def get_user_information(self, user_id: str) -> Optional[User]: pass
 
@@ -27,11 +39,35 @@ class IKnowledgeManager(ABC):
     def get_metadata(self, document_id: str, user_id: str) -> Dict[str, object]: pass
 
     @abstractmethod
-    def get_content(self, document_id: str, user_id: str) -> Optional[BinaryIO]: pass
+    def get_metadata_batch(self, user_id: str, document_ids: Optional[List[str]] = None,
+                           skip: int = 0, limit: int = 50) -> Dict[str, object]: pass
+
+    @abstractmethod
+    def get_content(self, document_id: str, user_id: str, version_number: Optional[int] = None,
+                    offset: int = 0, length: int = 0, decode: bool = True) -> Optional[BinaryIO]: pass
+
+    @abstractmethod
+    def get_content_info(self, document_id: str, user_id: str,
+                         version_number: Optional[int] = None) -> Optional[Dict[str, object]]: pass
+
+    @abstractmethod
+    def get_content_url(self, document_id: str, user_id: str, version_number: Optional[int] = None,
+                        expires: timedelta = timedelta(minutes=5),
+                        accept_encodings: Tuple[str, ...] = ()) -> Optional[str]: pass
 
     @abstractmethod
     def get_doc_ids(self, user_id: str) -> List[str]:pass
 
+    @abstractmethod
+    def get_doc_ids_page(self, user_id: str, after: Optional[str] = None,
+                         limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, object]: pass
+
+    @abstractmethod
+    def get_doc_by_name(self, name: str, user_id: str, skip: int = 0, limit: int = 50) -> List[Dict[str, object]]: pass
+
+    @abstractmethod
+    def hybrid_search(self, query: str, user_id: str, skip: int = 0, limit: int = 50) -> Dict[str, object]: pass
+
     @abstractmethod
     def update_metadata(self, modified_by: str, document_id: str, new_name: str,
                         new_department_id: str, new_tags: List[str],
@@ -39,7 +75,8 @@ class IKnowledgeManager(ABC):
                         new_description: str, new_university: str) -> bool: pass
 
     @abstractmethod
-    def update_content(self, document_id: str, modified_by: str, new_content: BinaryIO) -> bool: pass
+    def update_content(self, document_id: str, modified_by: str, new_content: BinaryIO,
+                       expected_version: Optional[int] = None) -> Optional[int]: pass
 
     @abstractmethod
     def delete(self, deleted_by: str, document_id: str) -> bool: pass
@@ -50,11 +87,16 @@ class IKnowledgeManager(ABC):
     @abstractmethod
     def get_all_versions(self, user_id: str, document_id: str) -> List[Version]: pass
 
+    @abstractmethod
+    def get_versions_page(self, user_id: str, document_id: str, after: Optional[str] = None,
+                          limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, object]: pass
+
     @abstractmethod
     def get_specific_version(self, user_id: str, document_id: str, version_number: int) -> Optional[Document]: pass
 
     @abstractmethod
-    def restore_version(self, document_id: str, restored_by: str, version_number: int) -> bool: pass
+    def restore_version(self, document_id: str, restored_by: str, version_number: int,
+                        expected_version: Optional[int] = None) -> Optional[int]: pass
 
     # permission
     @abstractmethod
@@ -62,3 +104,61 @@ class IKnowledgeManager(ABC):
 
     @abstractmethod
     def remove_permissions(self, removed_by: str, removed_to: str, document_id: str, permissions: List[str]) -> bool: pass
+
+    # retrieval
+    @abstractmethod
+    def retrieve(self, user_id: str, query: str, k: int = 5) -> List[Dict[str, object]]: pass
+
+    # async counterparts
+    @abstractmethod
+    async def get_user_information_async(self, user_id: str) -> Optional[User]: pass
+
+    @abstractmethod
+    async def get_user_by_email_async(self, email: str) -> Optional[User]: pass
+
+    @abstractmethod
+    async def get_metadata_async(self, document_id: str, user_id: str) -> Dict[str, object]: pass
+
+    @abstractmethod
+    async def get_metadata_batch_async(self, user_id: str, document_ids: Optional[List[str]] = None,
+                                       skip: int = 0, limit: int = 50) -> Dict[str, object]: pass
+
+    @abstractmethod
+    async def get_doc_by_name_async(self, name: str, user_id: str, skip: int = 0,
+                                    limit: int = 50) -> List[Dict[str, object]]: pass
+
+    @abstractmethod
+    async def get_doc_ids_async(self, user_id: str) -> List[str]: pass
+
+    @abstractmethod
+    async def get_doc_ids_page_async(self, user_id: str, after: Optional[str] = None,
+                                     limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, object]: pass
+
+    @abstractmethod
+    async def get_activity_rollups_async(self, granularity: str, dimension: str, key: Optional[str] = None,
+                                         action: Optional[str] = None, since: Optional[datetime] = None,
+                                         until: Optional[datetime] = None) -> List[Dict[str, object]]: pass
+
+    # monitoring
+    @abstractmethod
+    def get_cache_stats(self) -> Dict[str, Dict[str, float]]: pass
+
+    @abstractmethod
+    def get_extraction_stats(self) -> Dict[str, int]: pass
+
+    @abstractmethod
+    def get_retrieval_stats(self) -> Dict[str, int]: pass
+
+    @abstractmethod
+    def get_activity_log_stats(self) -> Dict[str, int]: pass
+
+    @abstractmethod
+    def get_compaction_stats(self) -> Dict[str, int]: pass
+
+    @abstractmethod
+    def get_reconciliation_stats(self) -> Dict[str, int]: pass
+
+    @abstractmethod
+    def get_activity_rollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                             action: Optional[str] = None, since: Optional[datetime] = None,
+                             until: Optional[datetime] = None) -> List[Dict[str, object]]: pass
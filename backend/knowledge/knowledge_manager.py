@@ -1,9 +1,27 @@
-from typing import Dict, List, Optional, BinaryIO
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, BinaryIO, Tuple
+from datetime import datetime, timedelta
 from knowledge.auth.auth_manager import AuthManager
 from knowledge.document.doc_manager import DocumentManager
 from knowledge.permission.per_manager import PermissionManager
+from knowledge.search.search_manager import SearchManager
+from knowledge.search.fusion import reciprocal_rank_fusion
+from knowledge.extraction.extraction_manager import ExtractionManager
+from knowledge.retrieval.retrieval_manager import RetrievalManager
+from knowledge.retention.retention_policy import parse_policies
+from knowledge.retention.version_compactor import VersionCompactor
+from knowledge.reconciliation.storage_reconciler import StorageReconciler
 from dao.management_dao import ManagementDAO, User, Document, Version
+from dao.async_management_dao import AsyncManagementDAO
+from dao.pagination import DEFAULT_PAGE_SIZE
 from knowledge.iknowledge_manager import IKnowledgeManager
+from utils.config_loader import get_db_config, get_search_config, get_extraction_config, get_retrieval_config, \
+    get_version_retention_config, get_reconciliation_config
+
+logger = logging.getLogger(__name__)
 
 
 class KnowledgeManager(IKnowledgeManager):
@@ -12,6 +30,59 @@ class KnowledgeManager(IKnowledgeManager):
         self._perms = PermissionManager(self.dao)
         self._auth = AuthManager(self.dao)
         self._docs = DocumentManager(self.dao)
+        search_config = get_search_config()
+        self._search = SearchManager(search_config['refresh_interval'])
+        # rebuilds run here, off the request path
+        self._search_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kms-search")
+        self._hybrid_candidates = search_config['hybrid_candidates']
+        self._rrf_k = search_config['rrf_k']
+        # the vector stage of hybrid searches runs here while the calling thread scores bm25
+        self._hybrid_pool = ThreadPoolExecutor(max_workers=search_config['hybrid_workers'],
+                                               thread_name_prefix="kms-hybrid")
+        self._retrieval = RetrievalManager(**get_retrieval_config())
+        extraction_config = get_extraction_config()
+        self._extraction = ExtractionManager(
+            self.dao,
+            max_workers=extraction_config['max_workers'],
+            max_bytes=extraction_config['max_bytes'],
+            max_chars=extraction_config['max_chars'],
+            on_extracted=self._on_extracted
+        )
+        retention_config = get_version_retention_config()
+        self._compactor = VersionCompactor(self.dao, parse_policies(retention_config['policies']),
+                                           retention_config['interval'])
+        self._compactor.start()
+        self._reconciler = StorageReconciler(self.dao, **get_reconciliation_config())
+        self._reconciler.start()
+        self._refresh_search()
+
+        # optional async dao for the metadata paths, sharing the sync dao's caches
+        self.async_dao: Optional[AsyncManagementDAO] = None
+        if get_db_config()['driver'] == "async":
+            self.async_dao = AsyncManagementDAO(
+                user_cache=self.dao.user_cache,
+                user_email_cache=self.dao.user_email_cache,
+                permission_cache=self.dao.permission_cache
+            )
+
+    @property
+    def is_async(self) -> bool:
+        return self.async_dao is not None
+
+    def resume_extraction(self) -> int:
+        # queues documents with versions left unprocessed by a previous run
+        return self._extraction.catch_up(doc.documentId for doc in self.dao.iterAllDocumentsMeta())
+
+    def shutdown(self):
+        self._compactor.shutdown()
+        self._reconciler.shutdown()
+        self._extraction.shutdown()
+        self._search_pool.shutdown(wait=True)
+        self._hybrid_pool.shutdown(wait=True)
+
+    async def close_async(self):
+        if self.async_dao is not None:
+            await self.async_dao.close_connection()
 
     # Authentication
     def sign_up(self, email: str, password: str, name: str, department_id: str, roles: List[str]) -> bool:
@@ -26,6 +97,9 @@ class KnowledgeManager(IKnowledgeManager):
     def login(self, email: str, password: str) -> bool:
         return self._auth.check_password(email, password)
 
+    def authenticate(self, email: str, password: str) -> Optional[User]:
+        return self._auth.authenticate(email, password)
+
     def get_user_information(self, user_id: str) -> Optional[User]:
         return self._auth.get_user_information(user_id)
 
@@ -36,7 +110,7 @@ class KnowledgeManager(IKnowledgeManager):
     def upload(self, content: BinaryIO, name: str, doc_type: str,
                department_id: str, tags: List[str], owner: str,
                category: str, description: str, university: str) -> dict:
-        return self._docs.upload(
+        result = self._docs.upload(
             content=content,
             name=name,
             doc_type=doc_type,
@@ -47,38 +121,140 @@ class KnowledgeManager(IKnowledgeManager):
             description=description,
             university=university
         )
+        if "document" in result:
+            self._search.index_document(result["document"])
+            self._extraction.submit(result["document"].documentId)
+        return result
 
     def get_metadata(self, document_id: str, user_id: str) -> Dict[str, object]:
         if not self._perms.has_permission(user_id=user_id, document_id=document_id, required="read"):
             raise PermissionError("User does not have permission to read the document.")
         return self._docs.get_metadata(document_id=document_id, user_id=user_id)
 
-    def get_doc_by_name(self, name: str, user_id: str) -> List[Dict[str, object]]:
-        pers_of_user = self._perms.get_permissions_by_user(user_id=user_id)
-        doc_ids = [per.docId for per in pers_of_user]
-        docs = [self._docs.get_metadata(document_id=doc_id, user_id=user_id) for doc_id in doc_ids]
-        found_doc = []
-        for doc in docs:
-            if doc['name'] == name:
-                found_doc.append(doc)
-        return found_doc
-
-    def get_content(self, document_id: str, user_id: str) -> Optional[BinaryIO]:
+    def get_metadata_batch(self, user_id: str, document_ids: Optional[List[str]] = None,
+                           skip: int = 0, limit: int = 50) -> Dict[str, object]:
+        # one permission query and one metadata query per page, inaccessible ids are left out
+        readable = self._perms.get_readable_doc_ids(user_id=user_id, doc_ids=document_ids)
+        if document_ids is not None:
+            readable_set = set(readable)
+            readable = [doc_id for doc_id in dict.fromkeys(document_ids) if doc_id in readable_set]
+        page = readable[skip:skip + limit]
+        return {
+            "documents": self._docs.get_metadata_batch(document_ids=page),
+            "total": len(readable),
+            "skip": skip,
+            "limit": limit
+        }
+
+    def get_doc_by_name(self, name: str, user_id: str, skip: int = 0, limit: int = 50) -> List[Dict[str, object]]:
+        self._refresh_search()
+        self._search.wait_ready()
+        matched = self._search.match(name)
+        if not matched:
+            return []
+        # permissions are resolved for the matching documents only, in one query
+        readable = self._perms.get_readable_doc_ids(user_id=user_id, doc_ids=list(matched))
+        ranked = self._search.rank(name, readable)[skip:skip + limit]
+        return self._docs.get_metadata_batch(document_ids=[doc_id for doc_id, _ in ranked], include_versions=True)
+
+    def hybrid_search(self, query: str, user_id: str, skip: int = 0, limit: int = 50) -> Dict[str, object]:
+        # bm25 over the text index and nearest chunks in the vector index, both limited to readable
+        # documents, fused by reciprocal rank
+        timings = {}
+        started = time.perf_counter()
+        self._refresh_search()
+        if not self._search.wait_ready(timeout=0):
+            # only the first build is waited for, later ones swap in behind the running searches
+            self._search.wait_ready()
+            timings["index_refresh"] = (time.perf_counter() - started) * 1000
+
+        mark = time.perf_counter()
+        readable = self._perms.get_readable_doc_ids(user_id=user_id)
+        timings["permissions"] = (time.perf_counter() - mark) * 1000
+        if not readable:
+            timings["total"] = (time.perf_counter() - started) * 1000
+            return {"results": [], "timings_ms": timings}
+
+        def vector_stage():
+            stage_started = time.perf_counter()
+            ranked = self._retrieval.rank_documents(query, readable, self._hybrid_candidates)
+            return ranked, (time.perf_counter() - stage_started) * 1000
+
+        vector_future = self._hybrid_pool.submit(vector_stage)
+        mark = time.perf_counter()
+        matched = self._search.match(query)
+        keyword_ranked = self._search.rank(query, matched.intersection(readable))[:self._hybrid_candidates]
+        timings["bm25"] = (time.perf_counter() - mark) * 1000
+        vector_ranked, timings["vector"] = vector_future.result()
+
+        mark = time.perf_counter()
+        keyword_ranks = {doc_id: rank for rank, (doc_id, _) in enumerate(keyword_ranked, start=1)}
+        vector_ranks = {doc_id: rank for rank, (doc_id, _) in enumerate(vector_ranked, start=1)}
+        fused = reciprocal_rank_fusion([list(keyword_ranks), list(vector_ranks)], self._rrf_k)[skip:skip + limit]
+        timings["fusion"] = (time.perf_counter() - mark) * 1000
+
+        mark = time.perf_counter()
+        metadata = {
+            doc["documentId"]: doc
+            for doc in self._docs.get_metadata_batch(document_ids=[doc_id for doc_id, _ in fused], include_versions=True)
+        }
+        results = []
+        for doc_id, score in fused:
+            if doc_id in metadata:
+                results.append(dict(metadata[doc_id], score=score,
+                                    ranks={"bm25": keyword_ranks.get(doc_id), "vector": vector_ranks.get(doc_id)}))
+        timings["metadata"] = (time.perf_counter() - mark) * 1000
+        timings["total"] = (time.perf_counter() - started) * 1000
+        return {"results": results, "timings_ms": timings}
+
+    def get_content(self, document_id: str, user_id: str, version_number: Optional[int] = None,
+                    offset: int = 0, length: int = 0, decode: bool = True) -> Optional[BinaryIO]:
         if not self._perms.has_permission(user_id=user_id, document_id=document_id, required="read"):
             raise PermissionError("User does not have permission to read the document.")
-        return self._docs.get_content(document_id=document_id, user_id=user_id)
+        return self._docs.get_content(
+            document_id=document_id,
+            user_id=user_id,
+            version_number=version_number,
+            offset=offset,
+            length=length,
+            decode=decode
+        )
+
+    def get_content_info(self, document_id: str, user_id: str,
+                         version_number: Optional[int] = None) -> Optional[Dict[str, object]]:
+        if not self._perms.has_permission(user_id=user_id, document_id=document_id, required="read"):
+            raise PermissionError("User does not have permission to read the document.")
+        return self._docs.get_content_info(document_id=document_id, user_id=user_id, version_number=version_number)
+
+    def get_content_url(self, document_id: str, user_id: str, version_number: Optional[int] = None,
+                        expires: timedelta = timedelta(minutes=5),
+                        accept_encodings: Tuple[str, ...] = ()) -> Optional[str]:
+        if not self._perms.has_permission(user_id=user_id, document_id=document_id, required="read"):
+            raise PermissionError("User does not have permission to read the document.")
+        return self._docs.get_content_url(
+            document_id=document_id,
+            user_id=user_id,
+            version_number=version_number,
+            expires=expires,
+            accept_encodings=accept_encodings
+        )
 
     def get_doc_ids(self, user_id: str) -> List[str]:
         document_ids = self._perms.get_docId_by_userId(user_id)
         return document_ids
 
+    def get_doc_ids_page(self, user_id: str, after: Optional[str] = None,
+                         limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, object]:
+        page = self._perms.get_docId_page_by_userId(user_id, after, limit)
+        return {"items": page.items, "next_cursor": page.next_cursor}
+
     def update_metadata(self, modified_by: str, document_id: str, new_name: str,
                         new_department_id: str, new_tags: List[str],
                         new_owner: str, new_category: str,
                         new_description: str, new_university: str) -> bool:
         if not self._perms.has_permission(user_id=modified_by, document_id=document_id, required="write"):
             raise PermissionError("User does not have permission to write the document.")
-        return self._docs.update_metadata(
+        updated = self._docs.update_metadata(
             modified_by=modified_by,
             document_id=document_id,
             new_name=new_name,
@@ -89,20 +265,63 @@ class KnowledgeManager(IKnowledgeManager):
             new_description=new_description,
             new_university=new_university
         )
+        if updated:
+            self._reindex_document(document_id)
+        return updated
+
+    def _refresh_search(self):
+        # a stale index is rebuilt in the background, one rebuild at a time
+        if self._search.needs_refresh() and self._search.begin_rebuild():
+            self._search_pool.submit(self._rebuild_search)
+
+    def _rebuild_search(self):
+        try:
+            contents = ((text.documentId, text.text) for text in self.dao.iterLatestDocumentTexts())
+            self._search.rebuild(self.dao.iterAllDocumentsMeta(), contents)
+        except Exception as e:
+            # the old index stays, the next search tries again
+            logger.error(f"Failed to rebuild the search index: {e}")
+
+    def _on_extracted(self, document_id: str, added: int):
+        # also reached for documents with nothing new, so the vector index catches up after a restart
+        if added or not self._retrieval.has_document(document_id):
+            self._reindex_document(document_id)
 
-    def update_content(self, document_id: str, modified_by: str, new_content: BinaryIO) -> bool:
+    def _reindex_document(self, document_id: str):
+        document = self.dao.findDocumentById(document_id)
+        if not document:
+            self._search.remove_document(document_id)
+            self._retrieval.remove_document(document_id)
+            return
+        text = self.dao.findLatestDocumentText(document_id)
+        self._search.index_document(document, text.text if text else None)
+        if text and text.text:
+            self._retrieval.index_document(document_id, text.version_number, text.text)
+        else:
+            self._retrieval.remove_document(document_id)
+
+    def update_content(self, document_id: str, modified_by: str, new_content: BinaryIO,
+                       expected_version: Optional[int] = None) -> Optional[int]:
         if not self._perms.has_permission(user_id=modified_by, document_id=document_id, required="write"):
             raise PermissionError("User does not have permission to write the document.")
-        return self._docs.update_content(
+        updated = self._docs.update_content(
             modified_by=modified_by,
             document_id=document_id,
-            new_content=new_content
+            new_content=new_content,
+            expected_version=expected_version
         )
+        if updated:
+            self._extraction.submit(document_id)
+        return updated
 
     def delete(self, deleted_by: str, document_id: str) -> bool:
         if not self._perms.has_permission(user_id=deleted_by, document_id=document_id, required="delete"):
             raise PermissionError("User does not have permission to delete the document.")
-        return self._docs.delete(deleted_by=deleted_by, document_id=document_id)
+        deleted = self._docs.delete(deleted_by=deleted_by, document_id=document_id)
+        if deleted:
+            self._search.remove_document(document_id)
+            self._retrieval.remove_document(document_id)
+        return deleted
 
     def get_all_metadata(self) -> Dict[str, Dict[str, object]]:
         return self._docs.get_all_metadata()
@@ -110,15 +329,26 @@ class KnowledgeManager(IKnowledgeManager):
     def get_all_versions(self, user_id: str, document_id: str) -> List[Version]:
         return self._docs.get_all_versions(user_id=user_id, document_id=document_id)
 
+    def get_versions_page(self, user_id: str, document_id: str, after: Optional[str] = None,
+                          limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, object]:
+        # newest first, pass next_cursor back as after for older versions
+        page = self._docs.get_versions_page(user_id=user_id, document_id=document_id, after=after, limit=limit)
+        return {"versions": page.items, "next_cursor": page.next_cursor}
+
     def get_specific_version(self, user_id: str, document_id: str, version_number: int) -> Optional[Document]:
         return self._docs.get_specific_version(user_id=user_id, document_id=document_id, version_number=version_number)
 
-    def restore_version(self, document_id: str, restored_by: str, version_number: int) -> bool:
-        return self._docs.restore_version(
+    def restore_version(self, document_id: str, restored_by: str, version_number: int,
+                        expected_version: Optional[int] = None) -> Optional[int]:
+        restored = self._docs.restore_version(
             document_id=document_id,
             restored_by=restored_by,
-            version_number=version_number
+            version_number=version_number,
+            expected_version=expected_version
         )
+        if restored:
+            self._extraction.submit(document_id)
+        return restored
 
     # Permission
     def share_permissions(self, shared_by: str, shared_to: str, document_id: str, permissions: List[str]) -> bool:
@@ -139,4 +369,121 @@ class KnowledgeManager(IKnowledgeManager):
             removed_to=removed_to,
             document_id=document_id,
             permissions=permissions
-        )
\ No newline at end of file
+        )
+
+    # Retrieval
+    def retrieve(self, user_id: str, query: str, k: int = 5) -> List[Dict[str, object]]:
+        # nearest chunks among the documents the user can read, with their text
+        readable = self._perms.get_readable_doc_ids(user_id=user_id)
+        hits = self._retrieval.search(query, readable, k)
+        texts = {}
+        for hit in hits:
+            key = (hit["documentId"], hit["version_number"])
+            if key not in texts:
+                texts[key] = self.dao.findDocumentText(*key)
+            text = texts[key]
+            hit["text"] = text.text[hit["start"]:hit["end"]] if text else ""
+        return hits
+
+    # Async counterparts, only usable when is_async
+    async def get_user_information_async(self, user_id: str) -> Optional[User]:
+        try:
+            return await self.async_dao.findUserById(user_id)
+        except Exception:
+            return None
+
+    async def get_user_by_email_async(self, email: str) -> Optional[User]:
+        try:
+            return await self.async_dao.findUserByEmail(email)
+        except Exception:
+            return None
+
+    async def _has_permission_async(self, user_id: str, document_id: str, required: str) -> bool:
+        try:
+            permission = await self.async_dao.getPermissionsByUserDoc(user_id, document_id)
+            return permission is not None and required in permission.permissions
+        except Exception:
+            return False
+
+    async def get_metadata_async(self, document_id: str, user_id: str) -> Dict[str, object]:
+        # the permission check and the metadata fetch are independent, run them together
+        allowed, doc = await asyncio.gather(
+            self._has_permission_async(user_id, document_id, "read"),
+            self.async_dao.findDocumentById(document_id)
+        )
+        if not allowed:
+            raise PermissionError("User does not have permission to read the document.")
+        return doc.model_dump() if doc else {}
+
+    async def get_metadata_batch_async(self, user_id: str, document_ids: Optional[List[str]] = None,
+                                       skip: int = 0, limit: int = 50) -> Dict[str, object]:
+        try:
+            readable = await self.async_dao.getDocIdsByUserPermission(user_id, "read", document_ids)
+        except Exception:
+            readable = []
+        if document_ids is not None:
+            readable_set = set(readable)
+            readable = [doc_id for doc_id in dict.fromkeys(document_ids) if doc_id in readable_set]
+        page = readable[skip:skip + limit]
+        docs = await self.async_dao.findDocumentsByIds(page) if page else []
+        return {
+            "documents": [doc.model_dump(exclude={'versions'}) for doc in docs],
+            "total": len(readable),
+            "skip": skip,
+            "limit": limit
+        }
+
+    async def get_doc_by_name_async(self, name: str, user_id: str, skip: int = 0,
+                                    limit: int = 50) -> List[Dict[str, object]]:
+        self._refresh_search()
+        if not self._search.wait_ready(timeout=0):
+            await asyncio.to_thread(self._search.wait_ready)
+        # matching and ranking are cpu bound, keep them off the event loop
+        matched = await asyncio.to_thread(self._search.match, name)
+        if not matched:
+            return []
+        try:
+            readable = await self.async_dao.getDocIdsByUserPermission(user_id, "read", list(matched))
+        except Exception:
+            readable = []
+        ranked = (await asyncio.to_thread(self._search.rank, name, readable))[skip:skip + limit]
+        docs = await self.async_dao.findDocumentsByIds([doc_id for doc_id, _ in ranked])
+        return [doc.model_dump() for doc in docs]
+
+    async def get_activity_rollups_async(self, granularity: str, dimension: str, key: Optional[str] = None,
+                                         action: Optional[str] = None, since: Optional[datetime] = None,
+                                         until: Optional[datetime] = None) -> List[Dict[str, object]]:
+        return await self.async_dao.findActivityRollups(granularity, dimension, key, action, since, until)
+
+    async def get_doc_ids_async(self, user_id: str) -> List[str]:
+        user_permissions = await self.async_dao.getPermissionsByUser(user_id)
+        return list({permission.docId for permission in user_permissions})
+
+    async def get_doc_ids_page_async(self, user_id: str, after: Optional[str] = None,
+                                     limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, object]:
+        page = await self.async_dao.getPermissionsByUserPage(user_id, after, limit)
+        return {"items": [permission.docId for permission in page.items], "next_cursor": page.next_cursor}
+
+    # Monitoring
+    def get_cache_stats(self) -> Dict[str, Dict[str, float]]:
+        return self.dao.cache_stats()
+
+    def get_extraction_stats(self) -> Dict[str, int]:
+        return self._extraction.stats()
+
+    def get_retrieval_stats(self) -> Dict[str, int]:
+        return self._retrieval.stats()
+
+    def get_activity_log_stats(self) -> Dict[str, int]:
+        return self.dao.activity_log_writer.stats()
+
+    def get_compaction_stats(self) -> Dict[str, int]:
+        return self._compactor.stats()
+
+    def get_reconciliation_stats(self) -> Dict[str, int]:
+        return self._reconciler.stats()
+
+    def get_activity_rollups(self, granularity: str, dimension: str, key: Optional[str] = None,
+                             action: Optional[str] = None, since: Optional[datetime] = None,
+                             until: Optional[datetime] = None) -> List[Dict[str, object]]:
+        return self.dao.findActivityRollups(granularity, dimension, key, action, since, until)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
 
 
 class IPermissionManager(ABC):
@@ -21,4 +22,13 @@ class IPermissionManager(ABC):
 
     @abstractmethod
     def get_docId_by_userId(self, user_id: str) -> List[str]:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def get_docId_page_by_userId(self, user_id: str, after: Optional[str] = None,
+                                 limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        pass
+
+    @abstractmethod
+    def get_readable_doc_ids(self, user_id: str, doc_ids: Optional[List[str]] = None) -> List[str]:
+        pass
@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional
 from dao.management_dao import ManagementDAO
 from knowledge.permission.iper_manager import IPermissionManager
 from dao.permission_module.permission import Permission
+from dao.pagination import Page, DEFAULT_PAGE_SIZE
 
 
 class PermissionManager(IPermissionManager):
@@ -13,6 +14,18 @@ class PermissionManager(IPermissionManager):
         doc_ids = list({permission.docId for permission in user_permissions})
         return doc_ids
 
+    def get_docId_page_by_userId(self, user_id: str, after: Optional[str] = None,
+                                 limit: int = DEFAULT_PAGE_SIZE) -> Page:
+        # one permission per (user, document), so a page of permissions is a page of distinct ids
+        page = self._dao.getPermissionsByUserPage(user_id, after, limit)
+        return Page([permission.docId for permission in page.items], page.next_cursor)
+
+    def get_readable_doc_ids(self, user_id: str, doc_ids: Optional[List[str]] = None) -> List[str]:
+        try:
+            return self._dao.getDocIdsByUserPermission(user_id, "read", doc_ids)
+        except Exception:
+            return []
+
     def get_permissions_by_user(self, user_id: str) -> List[Permission]:
         try:
             permissions = self._dao.getPermissionsByUser(user_id=user_id)
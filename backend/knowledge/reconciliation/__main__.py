@@ -0,0 +1,38 @@
+import argparse
+import json
+import logging
+import sys
+from dao.management_dao import ManagementDAO
+from knowledge.reconciliation.storage_reconciler import StorageReconciler
+from utils.config_loader import get_reconciliation_config
+
+
+def main(argv=None) -> int:
+    # run from backend/: python -m knowledge.reconciliation [--delete]
+    config = get_reconciliation_config()
+    parser = argparse.ArgumentParser(prog="python -m knowledge.reconciliation",
+                                     description="Find storage objects nothing references and blob records "
+                                                 "whose object is gone.")
+    parser.add_argument("--delete", action="store_true", help="delete the orphans, without it only report them")
+    parser.add_argument("--batch-size", type=int, default=config["batch_size"],
+                        help="objects checked per mongo query and per bulk delete")
+    parser.add_argument("--grace", type=float, default=config["grace"],
+                        help="seconds, younger objects are never treated as orphans")
+    parser.add_argument("--rate", type=float, default=config["deletes_per_second"],
+                        help="deletes per second, 0 for no limit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    dao = ManagementDAO()
+    try:
+        reconciler = StorageReconciler(dao, args.batch_size, args.grace, args.rate)
+        report = reconciler.reconcile(delete=args.delete)
+    finally:
+        dao.close_connection()
+    json.dump(report, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
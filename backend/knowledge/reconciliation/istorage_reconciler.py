@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class IStorageReconciler(ABC):
+    @abstractmethod
+    def start(self) -> bool:
+        pass
+
+    @abstractmethod
+    def reconcile(self, delete: bool = False, now: Optional[datetime] = None) -> Dict[str, object]:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def shutdown(self):
+        pass
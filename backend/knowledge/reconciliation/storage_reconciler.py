@@ -0,0 +1,181 @@
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Tuple
+from dao.management_dao import ManagementDAO
+from knowledge.reconciliation.istorage_reconciler import IStorageReconciler
+
+logger = logging.getLogger(__name__)
+
+BLOB_PREFIX = "blobs/"
+STAGING_PREFIX = "staging/"
+# content stored before blobs were content addressed
+_LEGACY_VERSION = re.compile(r"^([0-9a-f]{24})/v(\d+)$")
+# names listed in a report, the counts cover everything
+_REPORTED_NAMES = 100
+
+
+def _blob_key(obj: Dict[str, object]) -> Tuple[str, Optional[str]]:
+    # blobs/<checksum> or blobs/<checksum>.<codec>
+    checksum, _, codec = obj["name"][len(BLOB_PREFIX):].partition(".")
+    return checksum, codec or None
+
+
+class StorageReconciler(IStorageReconciler):
+    # compares the bucket with mongo. objects nothing points at are orphans and are deleted in bulk,
+    # blob records whose object is gone are dangling and only reported. the listing is streamed and checked
+    # one batch at a time, objects younger than the grace period may belong to an upload still in flight
+    def __init__(self, management_dao: ManagementDAO, batch_size: int = 1000, grace: float = 86400,
+                 deletes_per_second: float = 100, interval: float = 0):
+        self._dao = management_dao
+        self.batch_size = max(1, batch_size)
+        self.grace = grace
+        self.deletes_per_second = deletes_per_second
+        self.interval = interval
+        self._stopping = Event()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        self.runs = 0
+        self.deleted = 0
+        self.reclaimed_bytes = 0
+        self.failed = 0
+        self.dangling = 0
+
+    def start(self) -> bool:
+        if self.interval <= 0:
+            return False
+        self._thread = Thread(target=self._run, name="kms-reconciler", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.reconcile(delete=True)
+            except Exception as e:
+                logger.error(f"Storage reconciliation failed: {e}", exc_info=True)
+
+    def reconcile(self, delete: bool = False, now: Optional[datetime] = None) -> Dict[str, object]:
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=self.grace)
+        report = {
+            "started": now, "dry_run": not delete, "scanned": 0, "scanned_bytes": 0, "orphans": 0,
+            "orphan_bytes": 0, "deleted": 0, "reclaimed_bytes": 0, "failed": 0, "dangling": 0,
+            "unrecognized": 0, "interrupted": False, "orphan_names": [], "dangling_checksums": []
+        }
+        blobs, legacy, orphans = [], [], []
+        after = None
+        for obj in self._dao.iterStorageObjects():
+            if self._stopping.is_set():
+                report["interrupted"] = True
+                break
+            report["scanned"] += 1
+            report["scanned_bytes"] += obj["size"]
+            name = obj["name"]
+            if name.startswith(BLOB_PREFIX):
+                # a batch never splits the copies of one checksum, their record is in a single range
+                if len(blobs) >= self.batch_size and _blob_key(obj)[0] != _blob_key(blobs[-1])[0]:
+                    after = self._check_blobs(blobs, after, False, delete, cutoff, report, orphans)
+                    blobs = []
+                # recent blobs still take part, their records must not look dangling
+                blobs.append(obj)
+            elif obj["last_modified"] > cutoff:
+                continue
+            elif name.startswith(STAGING_PREFIX):
+                # a staged upload is moved into place and dropped within the request that wrote it
+                orphans.append(obj)
+            elif _LEGACY_VERSION.match(name):
+                legacy.append(obj)
+                if len(legacy) >= self.batch_size:
+                    self._check_legacy(legacy, orphans)
+                    legacy = []
+            else:
+                report["unrecognized"] += 1
+            if len(orphans) >= self.batch_size:
+                self._remove(orphans, delete, report)
+                orphans = []
+        if not report["interrupted"]:
+            # the last range is open ended, records past the last listed blob have no object
+            self._check_blobs(blobs, after, True, delete, cutoff, report, orphans)
+            self._check_legacy(legacy, orphans)
+            self._remove(orphans, delete, report)
+        report["finished"] = datetime.now(timezone.utc)
+        with self._lock:
+            self.runs += 1
+            self.deleted += report["deleted"]
+            self.reclaimed_bytes += report["reclaimed_bytes"]
+            self.failed += report["failed"]
+            self.dangling = report["dangling"]
+        return report
+
+    def _check_blobs(self, objects: List[Dict[str, object]], after: Optional[str], final: bool, delete: bool,
+                     cutoff: datetime, report: Dict[str, object], orphans: List[Dict[str, object]]) -> Optional[str]:
+        # storage lists keys in order, so the records of a batch are one range query on the checksum
+        until = None if final else _blob_key(objects[-1])[0]
+        records = {blob.checksum: blob for blob in self._dao.findBlobsInRange(after, until)}
+        listed = set()
+        for obj in objects:
+            checksum, codec = _blob_key(obj)
+            blob = records.get(checksum)
+            # a copy stored with another codec than its record is never read
+            own = blob is not None and blob.codec == codec
+            if own:
+                listed.add(checksum)
+                if blob.refCount > 0:
+                    continue
+            if obj["last_modified"] > cutoff:
+                continue
+            # a record left at zero goes first, unless an upload of the same content has taken it over
+            if own and delete and not self._dao.deleteUnreferencedBlob(checksum):
+                continue
+            orphans.append(obj)
+        created_cutoff = cutoff.astimezone().replace(tzinfo=None)  # records are stamped in local time
+        for blob in records.values():
+            if blob.checksum not in listed and blob.refCount > 0 and blob.createdAt < created_cutoff:
+                report["dangling"] += 1
+                if len(report["dangling_checksums"]) < _REPORTED_NAMES:
+                    report["dangling_checksums"].append(blob.checksum)
+        return until
+
+    def _check_legacy(self, objects: List[Dict[str, object]], orphans: List[Dict[str, object]]):
+        # {documentId}/v{n} is referenced while the document still has version n
+        if not objects:
+            return
+        keys = [_LEGACY_VERSION.match(obj["name"]).groups() for obj in objects]
+        numbers = self._dao.findVersionNumbers(list({doc_id for doc_id, _ in keys}))
+        for obj, (doc_id, number) in zip(objects, keys):
+            if int(number) not in numbers.get(doc_id, ()):
+                orphans.append(obj)
+
+    def _remove(self, orphans: List[Dict[str, object]], delete: bool, report: Dict[str, object]):
+        if not orphans:
+            return
+        sizes = {obj["name"]: obj["size"] for obj in orphans}
+        report["orphans"] += len(sizes)
+        report["orphan_bytes"] += sum(sizes.values())
+        report["orphan_names"].extend(list(sizes)[:_REPORTED_NAMES - len(report["orphan_names"])])
+        if not delete:
+            return
+        failed = set(self._dao.deleteDocs(list(sizes)))
+        report["failed"] += len(failed)
+        report["deleted"] += len(sizes) - len(failed)
+        report["reclaimed_bytes"] += sum(size for name, size in sizes.items() if name not in failed)
+        if self.deletes_per_second > 0:
+            # paced per batch, shutdown cuts the wait short
+            self._stopping.wait(len(sizes) / self.deletes_per_second)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "deleted": self.deleted,
+                "reclaimed_bytes": self.reclaimed_bytes,
+                "failed": self.failed,
+                "dangling": self.dangling
+            }
+
+    def shutdown(self):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join()
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Optional
+
+
+class IVersionCompactor(ABC):
+    @abstractmethod
+    def start(self) -> bool:
+        pass
+
+    @abstractmethod
+    def compact(self, now: Optional[datetime] = None) -> int:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        pass
+
+    @abstractmethod
+    def shutdown(self):
+        pass
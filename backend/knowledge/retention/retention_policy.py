@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+from dao.document_module.document import Version
+
+
+class RetentionPolicy(NamedTuple):
+    # the newest keep_last versions are always kept, then the newest version of each day for daily_days,
+    # then the newest of each month for monthly_months more months, 0 keeps monthly snapshots forever
+    keep_last: int = 10
+    daily_days: int = 30
+    monthly_months: int = 0
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, int]) -> "RetentionPolicy":
+        unknown = set(values) - set(cls._fields)
+        if unknown:
+            raise ValueError(f"Unknown retention settings: {sorted(unknown)}")
+        policy = cls(**{key: int(value) for key, value in values.items()})
+        if min(policy) < 0:
+            raise ValueError(f"Retention settings cannot be negative: {values}")
+        return policy
+
+    def expired(self, versions: List[Version], current_number: int, now: Optional[datetime] = None) -> List[Version]:
+        # pure, the versions to remove; the current version is never one of them
+        now = now or datetime.now()
+        daily_cutoff = now - timedelta(days=self.daily_days)
+        monthly_cutoff = daily_cutoff - timedelta(days=30 * self.monthly_months) if self.monthly_months else None
+        newest_first = sorted(versions, key=lambda v: v.version_number, reverse=True)
+        keep = {current_number}
+        keep.update(v.version_number for v in newest_first[:self.keep_last])
+        days, months = set(), set()
+        for version in newest_first:
+            date = version.modification_date
+            if date >= daily_cutoff:
+                bucket, seen = date.date(), days
+            elif monthly_cutoff is None or date >= monthly_cutoff:
+                bucket, seen = (date.year, date.month), months
+            else:
+                continue
+            if bucket not in seen:
+                seen.add(bucket)
+                keep.add(version.version_number)
+        return [v for v in newest_first if v.version_number not in keep]
+
+
+def parse_policies(raw: Dict[str, Dict[str, int]]) -> Dict[str, RetentionPolicy]:
+    # category -> policy, "default" covers categories without their own
+    return {category: RetentionPolicy.from_dict(values) for category, values in raw.items()}
@@ -0,0 +1,90 @@
+import logging
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Dict, Optional
+from dao.management_dao import ManagementDAO
+from knowledge.retention.iversion_compactor import IVersionCompactor
+from knowledge.retention.retention_policy import RetentionPolicy
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = 100
+
+
+class VersionCompactor(IVersionCompactor):
+    # applies the per-category retention policies in a background thread, one pass every interval seconds
+    def __init__(self, management_dao: ManagementDAO, policies: Dict[str, RetentionPolicy], interval: float):
+        self._dao = management_dao
+        self.policies = policies
+        self.interval = interval
+        self._stopping = Event()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        self.passes = 0
+        self.documents = 0
+        self.removed = 0
+        self.failed = 0
+
+    def start(self) -> bool:
+        if not self.policies or self.interval <= 0:
+            return False
+        self._thread = Thread(target=self._run, name="kms-compactor", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Version compaction failed: {e}", exc_info=True)
+
+    def policy_for(self, category: Optional[str]) -> Optional[RetentionPolicy]:
+        return self.policies.get(category) or self.policies.get("default")
+
+    def compact(self, now: Optional[datetime] = None) -> int:
+        # documents are walked in pages, so a long pass never holds a cursor open
+        removed, after = 0, None
+        while not self._stopping.is_set():
+            page = self._dao.findAllDocumentsPage(after, _PAGE_SIZE)
+            for document in page.items:
+                policy = self.policy_for(document.category)
+                # numbers are never reused, a document at version n has at most n versions
+                if policy is None or document.currentNumber <= policy.keep_last:
+                    continue
+                removed += self._compact_document(document.documentId, document.currentNumber, policy, now)
+            if page.next_cursor is None:
+                break
+            after = page.next_cursor
+        with self._lock:
+            self.passes += 1
+            self.removed += removed
+        return removed
+
+    def _compact_document(self, document_id: str, current_number: int, policy: RetentionPolicy,
+                          now: Optional[datetime]) -> int:
+        try:
+            expired = policy.expired(self._dao.getVersions(document_id), current_number, now)
+            removed = self._dao.removeVersions(document_id, expired) if expired else 0
+        except Exception as e:
+            logger.error(f"Version compaction failed for document {document_id}: {e}")
+            with self._lock:
+                self.failed += 1
+            return 0
+        with self._lock:
+            self.documents += 1
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "passes": self.passes,
+                "documents": self.documents,
+                "removed": self.removed,
+                "failed": self.failed
+            }
+
+    def shutdown(self):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join()
@@ -0,0 +1,42 @@
+import hashlib
+import re
+import zlib
+from typing import List, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+# words that decide whether a chunk may end after the last of them
+_BOUNDARY_WINDOW = 3
+
+
+def chunk_spans(text: str, chunk_words: int, overlap: int) -> List[Tuple[int, int]]:
+    # content-defined chunks of about chunk_words words, each also covering the overlap words before it.
+    # a chunk ends where the hash of the words around it hits a fixed pattern, so an edit only moves the
+    # boundaries next to it and the other chunks of a new version come out identical
+    words = [(match.start(), match.end()) for match in _WORD_RE.finditer(text)]
+    if not words:
+        return []
+    min_words = max(chunk_words // 4, 1)
+    max_words = max(chunk_words * 2, 1)
+    divisor = max(chunk_words - min_words, 1)
+
+    ends, first = [], 0
+    for i in range(len(words)):
+        length = i - first + 1
+        if length < min_words:
+            continue
+        window = " ".join(text[start:end].lower() for start, end in words[max(i - _BOUNDARY_WINDOW + 1, 0):i + 1])
+        if length >= max_words or zlib.crc32(window.encode()) % divisor == 0:
+            ends.append(i)
+            first = i + 1
+    if first < len(words):
+        ends.append(len(words) - 1)
+
+    spans, first = [], 0
+    for last in ends:
+        spans.append((words[max(first - overlap, 0)][0], words[last][1]))
+        first = last + 1
+    return spans
+
+
+def chunk_hash(chunk: str) -> int:
+    return int.from_bytes(hashlib.blake2b(chunk.encode(), digest_size=8).digest(), "little")
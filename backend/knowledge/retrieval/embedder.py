@@ -0,0 +1,39 @@
+import hashlib
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import List
+import numpy as np
+from knowledge.search.inverted_index import tokenize
+
+
+@lru_cache(maxsize=200000)
+def _bucket(feature: str, dim: int):
+    # stable across processes, unlike hash()
+    value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+class HashingEmbedder:
+    # cpu-only embedding, word unigrams and bigrams hashed into dim signed buckets
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _features(self, text: str) -> Counter:
+        tokens = tokenize(text)
+        features = Counter(tokens)
+        features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in self._features(text).items():
+            index, sign = _bucket(feature, self.dim)
+            vector[index] += sign * (1.0 + math.log(count))  # sublinear tf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self.embed(text) for text in texts])
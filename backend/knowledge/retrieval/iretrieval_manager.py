@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class IRetrievalManager(ABC):
+    @abstractmethod
+    def index_document(self, document_id: str, version_number: int, text: str) -> int:
+        pass
+
+    @abstractmethod
+    def remove_document(self, document_id: str):
+        pass
+
+    @abstractmethod
+    def has_document(self, document_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    def search(self, query: str, document_ids: Optional[Iterable[str]], k: int) -> List[Dict[str, object]]:
+        pass
+
+    @abstractmethod
+    def rank_documents(self, query: str, document_ids: Optional[Iterable[str]], k: int) -> List[Tuple[str, float]]:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        pass
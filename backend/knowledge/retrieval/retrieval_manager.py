@@ -0,0 +1,77 @@
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from knowledge.retrieval.chunker import chunk_spans, chunk_hash
+from knowledge.retrieval.embedder import HashingEmbedder
+from knowledge.retrieval.vector_index import VectorIndex
+from knowledge.retrieval.iretrieval_manager import IRetrievalManager
+
+
+class RetrievalManager(IRetrievalManager):
+    def __init__(self, index_path: str, dim: int, chunk_words: int, chunk_overlap: int, nprobe: int = 8):
+        self._embedder = HashingEmbedder(dim)
+        self._index = VectorIndex(index_path, dim, nprobe)
+        self.chunk_words = chunk_words
+        self.chunk_overlap = chunk_overlap
+        self.embedded_chunks = 0
+        self.reused_chunks = 0
+        # extraction workers index documents concurrently
+        self._stats_lock = Lock()
+
+    def index_document(self, document_id: str, version_number: int, text: str) -> int:
+        # the latest extracted version of a document replaces its previous chunks. chunks whose hash is
+        # already indexed for the document keep their vector, only the changed ones are embedded
+        if self._index.version_of(document_id) == version_number:
+            return 0
+        spans = chunk_spans(text, self.chunk_words, self.chunk_overlap)
+        if not spans:
+            self._index.remove(document_id)
+            return 0
+        chunks = [text[start:end] for start, end in spans]
+        hashes = np.array([chunk_hash(chunk) for chunk in chunks], dtype=np.uint64)
+
+        previous = self._index.rows_of(document_id)
+        known = dict(zip(previous[1].tolist(), previous[0])) if previous else {}
+        vectors = np.empty((len(chunks), self._embedder.dim), dtype=np.float32)
+        changed = [i for i, value in enumerate(hashes.tolist()) if value not in known]
+        vectors[changed] = self._embedder.embed_many([chunks[i] for i in changed])
+        for i, value in enumerate(hashes.tolist()):
+            if value in known:
+                vectors[i] = known[value]
+
+        self._index.add(document_id, version_number, vectors, np.asarray(spans, dtype=np.int32), hashes)
+        with self._stats_lock:
+            self.embedded_chunks += len(changed)
+            self.reused_chunks += len(chunks) - len(changed)
+        return len(changed)
+
+    def remove_document(self, document_id: str):
+        self._index.remove(document_id)
+
+    def has_document(self, document_id: str) -> bool:
+        return self._index.version_of(document_id) is not None
+
+    def search(self, query: str, document_ids: Optional[Iterable[str]], k: int) -> List[Dict[str, object]]:
+        hits = self._index.search(self._embedder.embed(query), document_ids, k)
+        return [
+            {
+                "documentId": document_id,
+                "version_number": version_number,
+                "score": score,
+                "start": start,
+                "end": end
+            }
+            for document_id, version_number, score, start, end in hits
+        ]
+
+    def rank_documents(self, query: str, document_ids: Optional[Iterable[str]], k: int) -> List[Tuple[str, float]]:
+        # documents ordered by their best chunk among the k nearest chunks
+        best: Dict[str, float] = {}
+        for document_id, _, score, _, _ in self._index.search(self._embedder.embed(query), document_ids, k):
+            best.setdefault(document_id, score)
+        return list(best.items())
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            counters = {"embedded_chunks": self.embedded_chunks, "reused_chunks": self.reused_chunks}
+        return dict(self._index.stats(), **counters)
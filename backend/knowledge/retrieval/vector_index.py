@@ -0,0 +1,304 @@
+import json
+import logging
+import os
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 1024
+# up to this many candidate rows are scored exactly, larger searches probe the coarse lists
+EXACT_SEARCH_ROWS = 32768
+# the coarse quantizer is (re)trained once the index holds this many rows, and again each time it doubles
+TRAIN_MIN_ROWS = 65536
+_TRAIN_SAMPLE = 32768
+_TRAIN_ITERATIONS = 8
+_ASSIGN_BLOCK = 65536
+
+
+class VectorIndex:
+    # unit vectors in a memory-mapped float32 matrix, each document owning one contiguous row range.
+    # a search only touches the rows of the documents it is restricted to, and once there are many
+    # of them only the rows in the coarse lists (ivf) closest to the query
+    def __init__(self, path: str, dim: int, nprobe: int = 8):
+        self.path = path
+        self.dim = dim
+        self.nprobe = nprobe
+        self._lock = RLock()
+        self._meta_path = os.path.join(path, "index.json")
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._spans_path = os.path.join(path, "spans.i32")
+        self._lists_path = os.path.join(path, "lists.i16")
+        self._hashes_path = os.path.join(path, "hashes.u64")
+        self._centroids_path = os.path.join(path, "centroids.npy")
+        os.makedirs(path, exist_ok=True)
+
+        # document id -> [first row, row count, version number]
+        self._documents: Dict[str, List[int]] = {}
+        self._size = 0
+        self._capacity = _INITIAL_CAPACITY
+        self._garbage = 0
+        self._trained_size = 0
+        self._centroids: Optional[np.ndarray] = None
+        # rows of every coarse list, stale rows of dropped documents included until the next compaction
+        self._postings: List[np.ndarray] = []
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            if meta["dim"] == dim:
+                self._documents = meta["documents"]
+                self._size = meta["size"]
+                self._capacity = meta["capacity"]
+                self._garbage = meta["garbage"]
+                self._trained_size = meta["trained_size"]
+                if self._trained_size:
+                    self._centroids = np.load(self._centroids_path)
+            else:
+                logger.warning(f"Vector index at {path} has dim {meta['dim']}, rebuilding with dim {dim}")
+        self._open(create=not self._documents)
+        self._build_postings()
+
+    def _open(self, create: bool):
+        mode = "w+" if create else "r+"
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode=mode, shape=(self._capacity, self.dim))
+        # character span of every row in the extracted text it came from
+        self._spans = np.memmap(self._spans_path, dtype=np.int32, mode=mode, shape=(self._capacity, 2))
+        # coarse list of every row, -1 until the quantizer is trained
+        self._lists = np.memmap(self._lists_path, dtype=np.int16, mode=mode, shape=(self._capacity,))
+        # content hash of every row's chunk, indexes written before it was kept start with zeros
+        if not create and not os.path.exists(self._hashes_path):
+            with open(self._hashes_path, "wb") as f:
+                f.truncate(self._capacity * 8)
+        self._hashes = np.memmap(self._hashes_path, dtype=np.uint64, mode=mode, shape=(self._capacity,))
+        if create:
+            self._size = 0
+            self._garbage = 0
+            self._trained_size = 0
+            self._centroids = None
+
+    def _build_postings(self):
+        if self._centroids is None:
+            self._postings = []
+            return
+        lists = np.asarray(self._lists[:self._size])
+        order = np.argsort(lists, kind="stable")
+        bounds = np.searchsorted(lists[order], np.arange(len(self._centroids) + 1))
+        self._postings = [order[bounds[i]:bounds[i + 1]] for i in range(len(self._centroids))]
+
+    def _grow(self, needed: int):
+        if needed <= self._capacity:
+            return
+        self._flush_arrays()
+        capacity = max(self._capacity * 2, needed)
+        del self._vectors, self._spans, self._lists, self._hashes
+        for file_path, row_bytes in ((self._vectors_path, self.dim * 4), (self._spans_path, 8), (self._lists_path, 2),
+                                     (self._hashes_path, 8)):
+            with open(file_path, "r+b") as f:
+                f.truncate(capacity * row_bytes)
+        self._capacity = capacity
+        self._open(create=False)
+
+    def _flush_arrays(self):
+        self._vectors.flush()
+        self._spans.flush()
+        self._lists.flush()
+        self._hashes.flush()
+
+    def _save_meta(self):
+        self._flush_arrays()
+        meta = {
+            "dim": self.dim,
+            "size": self._size,
+            "capacity": self._capacity,
+            "garbage": self._garbage,
+            "trained_size": self._trained_size,
+            "documents": self._documents
+        }
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def __len__(self) -> int:
+        return self._size - self._garbage
+
+    def version_of(self, document_id: str) -> Optional[int]:
+        entry = self._documents.get(document_id)
+        return entry[2] if entry else None
+
+    def rows_of(self, document_id: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        # copies of the document's vectors and chunk hashes
+        with self._lock:
+            entry = self._documents.get(document_id)
+            if entry is None:
+                return None
+            start, count, _ = entry
+            return np.array(self._vectors[start:start + count]), np.array(self._hashes[start:start + count])
+
+    def add(self, document_id: str, version_number: int, vectors: np.ndarray, spans: np.ndarray,
+            hashes: Optional[np.ndarray] = None):
+        # replaces the document's rows, the old ones are left behind until the next compaction
+        with self._lock:
+            self._drop(document_id)
+            count = len(vectors)
+            self._grow(self._size + count)
+            self._vectors[self._size:self._size + count] = vectors
+            self._spans[self._size:self._size + count] = spans
+            self._hashes[self._size:self._size + count] = 0 if hashes is None else hashes
+            assigned = self._assign(vectors)
+            self._lists[self._size:self._size + count] = assigned
+            if self._centroids is not None:
+                for list_id in np.unique(assigned):
+                    rows = np.flatnonzero(assigned == list_id) + self._size
+                    self._postings[list_id] = np.concatenate([self._postings[list_id], rows])
+            self._documents[document_id] = [self._size, count, version_number]
+            self._size += count
+            self._compact_if_needed()
+            if len(self) >= max(TRAIN_MIN_ROWS, 2 * self._trained_size):
+                self.train()
+            self._save_meta()
+
+    def remove(self, document_id: str):
+        with self._lock:
+            if self._drop(document_id):
+                self._compact_if_needed()
+                self._save_meta()
+
+    def _drop(self, document_id: str) -> bool:
+        entry = self._documents.pop(document_id, None)
+        if entry:
+            self._garbage += entry[1]
+        return entry is not None
+
+    def _compact_if_needed(self):
+        if self._garbage > _INITIAL_CAPACITY and self._garbage * 2 > self._size:
+            self.compact()
+
+    def compact(self):
+        # rewrites the live rows back to back, in place, in order of their current position
+        with self._lock:
+            row = 0
+            for document_id, entry in sorted(self._documents.items(), key=lambda item: item[1][0]):
+                start, count, _ = entry
+                if start != row:
+                    self._vectors[row:row + count] = self._vectors[start:start + count]
+                    self._spans[row:row + count] = self._spans[start:start + count]
+                    self._lists[row:row + count] = self._lists[start:start + count]
+                    self._hashes[row:row + count] = self._hashes[start:start + count]
+                    entry[0] = row
+                row += count
+            self._size = row
+            self._garbage = 0
+            self._build_postings()
+            self._save_meta()
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if self._centroids is None:
+            return np.full(len(vectors), -1, dtype=np.int16)
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int16)
+
+    def _live_rows(self) -> np.ndarray:
+        return np.concatenate([np.arange(start, start + count) for start, count, _ in self._documents.values()]
+                              or [np.zeros(0, dtype=np.int64)])
+
+    def train(self):
+        # spherical k-means on a sample of the live rows, then every row is assigned to its closest list
+        with self._lock:
+            rows = self._live_rows()
+            if not len(rows):
+                return
+            nlist = int(min(4096, max(16, np.sqrt(len(rows)))))
+            rng = np.random.default_rng(0)
+            sample = self._vectors[np.sort(rng.choice(rows, min(len(rows), _TRAIN_SAMPLE), replace=False))]
+            centroids = sample[rng.choice(len(sample), min(nlist, len(sample)), replace=False)].copy()
+            for _ in range(_TRAIN_ITERATIONS):
+                assignment = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, sample)
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                empty = norms[:, 0] == 0
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]  # reseed empty lists
+                centroids = sums / np.linalg.norm(sums, axis=1, keepdims=True)
+            self._centroids = centroids.astype(np.float32)
+
+            for first in range(0, len(rows), _ASSIGN_BLOCK):
+                block = rows[first:first + _ASSIGN_BLOCK]
+                self._lists[block] = self._assign(self._vectors[block])
+            tmp_path = self._centroids_path + ".tmp.npy"
+            np.save(tmp_path, self._centroids)
+            os.replace(tmp_path, self._centroids_path)
+            self._trained_size = len(rows)
+            self._build_postings()
+            self._save_meta()
+
+    def search(self, query: np.ndarray, document_ids: Optional[Iterable[str]] = None,
+               k: int = 10) -> List[Tuple[str, int, float, int, int]]:
+        # top k rows by cosine similarity as (document id, version, score, span start, span end)
+        with self._lock:
+            if document_ids is None:
+                entries = [(entry, doc_id) for doc_id, entry in self._documents.items()]
+            else:
+                entries = [(self._documents[doc_id], doc_id) for doc_id in set(document_ids)
+                           if doc_id in self._documents]
+            entries = [item for item in entries if item[0][1]]
+            if not entries or k <= 0:
+                return []
+            entries.sort(key=lambda item: item[0][0])
+
+            # adjacent documents are read as one slice of the matrix
+            blocks, total = [], 0
+            for (start, count, _), _ in entries:
+                total += count
+                if blocks and blocks[-1][1] == start:
+                    blocks[-1][1] = start + count
+                else:
+                    blocks.append([start, start + count])
+
+            rows = None
+            if total > EXACT_SEARCH_ROWS and self._centroids is not None:
+                rows = self._probe(query, blocks)
+                if len(rows) < k:
+                    rows = None
+            if rows is None:
+                scores = np.concatenate([self._vectors[start:end] @ query for start, end in blocks])
+                block_offsets = np.cumsum([0] + [end - start for start, end in blocks])
+            else:
+                scores = self._vectors[rows] @ query
+
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            if rows is None:
+                owner_blocks = np.searchsorted(block_offsets, top, side="right") - 1
+                top_rows = np.asarray(blocks)[owner_blocks, 0] + top - block_offsets[owner_blocks]
+            else:
+                top_rows = rows[top]
+
+            starts = [entry[0] for entry, _ in entries]
+            hits = []
+            for position, row in zip(top, top_rows):
+                (_, _, version_number), doc_id = entries[np.searchsorted(starts, row, side="right") - 1]
+                span_start, span_end = self._spans[row]
+                hits.append((doc_id, version_number, float(scores[position]), int(span_start), int(span_end)))
+            return hits
+
+    def _probe(self, query: np.ndarray, blocks: List[List[int]]) -> np.ndarray:
+        # rows of the nprobe lists closest to the query that fall in the given blocks
+        nprobe = min(self.nprobe, len(self._centroids))
+        probe = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        rows = np.sort(np.concatenate([self._postings[list_id] for list_id in probe]))
+        bounds = np.asarray(blocks)
+        owner = np.searchsorted(bounds[:, 0], rows, side="right") - 1
+        inside = (owner >= 0) & (rows < bounds[np.maximum(owner, 0), 1])
+        return rows[inside]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "documents": len(self._documents),
+            "rows": len(self),
+            "garbage": self._garbage,
+            "capacity": self._capacity,
+            "dim": self.dim,
+            "lists": 0 if self._centroids is None else len(self._centroids)
+        }
@@ -0,0 +1,204 @@
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from threading import RLock
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# relative importance of a term by the field it appears in
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "tags": 2.0,
+    "category": 1.5,
+    "university": 1.0,
+    "description": 1.0,
+    "content": 0.5
+}
+
+# how much a non-exact expansion of a query term counts
+PREFIX_WEIGHT = 0.8
+FUZZY_WEIGHT = 0.6
+MAX_EXPANSIONS = 32
+EXACT_NAME_BONUS = 10.0
+
+
+def normalize(text: str) -> str:
+    # lowercase and strip diacritics, so "Giáo trình" matches "giao trinh"
+    text = unicodedata.normalize("NFKD", text.lower().replace("đ", "d"))
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def _deletes(term: str) -> Set[str]:
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _max_edits(term: str) -> int:
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    # levenshtein, giving up once every cell of a row is past the limit
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class InvertedIndex:
+    # in-memory postings over document metadata, ranked with bm25 on field-weighted term frequencies
+    def __init__(self, field_weights: Optional[Dict[str, float]] = None, k1: float = 1.2, b: float = 0.75):
+        self.field_weights = field_weights or FIELD_WEIGHTS
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._doc_len: Dict[str, float] = {}
+        self._names: Dict[str, str] = {}
+        self._total_len = 0.0
+        # deletion neighbourhood of every term, for fuzzy lookups without scanning the vocabulary
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+        self._vocab: List[str] = []
+        self._vocab_dirty = False
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, doc_id: str, fields: Dict[str, Union[str, Iterable[str], None]]):
+        frequencies: Dict[str, float] = defaultdict(float)
+        for field, weight in self.field_weights.items():
+            value = fields.get(field)
+            if not value:
+                continue
+            text = value if isinstance(value, str) else " ".join(value)
+            for term in tokenize(text):
+                frequencies[term] += weight
+
+        with self._lock:
+            self.remove(doc_id)
+            for term, frequency in frequencies.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    self._add_term(term)
+                postings[doc_id] = frequency
+            self._doc_terms[doc_id] = set(frequencies)
+            self._doc_len[doc_id] = sum(frequencies.values())
+            self._total_len += self._doc_len[doc_id]
+            self._names[doc_id] = " ".join(tokenize(fields.get("name") or ""))
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            for term in self._doc_terms.pop(doc_id, ()):
+                postings = self._postings[term]
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._remove_term(term)
+            self._total_len -= self._doc_len.pop(doc_id, 0.0)
+            self._names.pop(doc_id, None)
+
+    def _add_term(self, term: str):
+        self._vocab_dirty = True
+        for variant in _deletes(term) | {term}:
+            self._deletes[variant].add(term)
+
+    def _remove_term(self, term: str):
+        self._vocab_dirty = True
+        for variant in _deletes(term) | {term}:
+            terms = self._deletes.get(variant)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self._deletes[variant]
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        start = bisect_left(self._vocab, prefix)
+        terms = []
+        for term in self._vocab[start:]:
+            if not term.startswith(prefix):
+                break
+            if term != prefix:
+                terms.append(term)
+        return terms
+
+    def _expand(self, token: str) -> Dict[str, float]:
+        # exact term, longer terms it prefixes and terms within a small edit distance
+        expansions = {}
+        if token in self._postings:
+            expansions[token] = 1.0
+        extra = {}
+        if len(token) >= 2:
+            for term in self._prefixed(token):
+                extra[term] = PREFIX_WEIGHT
+        limit = _max_edits(token)
+        if limit:
+            candidates = set()
+            for variant in _deletes(token) | {token}:
+                candidates |= self._deletes.get(variant, set())
+            for term in candidates:
+                if term not in extra and term != token and _edit_distance(token, term, limit) <= limit:
+                    extra[term] = FUZZY_WEIGHT
+        # keep the most common expansions, a short prefix can match much of the vocabulary
+        best = sorted(extra, key=lambda term: len(self._postings[term]), reverse=True)[:MAX_EXPANSIONS]
+        expansions.update({term: extra[term] for term in best})
+        return expansions
+
+    def match(self, query: str) -> Set[str]:
+        # ids of every document matching at least one query term
+        with self._lock:
+            doc_ids = set()
+            for token in set(tokenize(query)):
+                for term in self._expand(token):
+                    doc_ids.update(self._postings[term])
+            return doc_ids
+
+    def rank(self, query: str, doc_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        # scores only the given documents, so unreadable ones never enter the ranking
+        with self._lock:
+            allowed = set(doc_ids) if doc_ids is not None else None
+            total = len(self._doc_len)
+            if not total:
+                return []
+            avg_len = self._total_len / total
+            scores: Dict[str, float] = defaultdict(float)
+            for token in set(tokenize(query)):
+                best: Dict[str, float] = {}
+                for term, weight in self._expand(token).items():
+                    postings = self._postings[term]
+                    idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, frequency in postings.items():
+                        if allowed is not None and doc_id not in allowed:
+                            continue
+                        norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                        score = weight * idf * frequency * (self.k1 + 1) / (frequency + norm)
+                        if score > best.get(doc_id, 0.0):
+                            best[doc_id] = score
+                # a document counts each query term once, through its best expansion
+                for doc_id, score in best.items():
+                    scores[doc_id] += score
+
+            name = " ".join(tokenize(query))
+            for doc_id in scores:
+                if self._names.get(doc_id) == name:
+                    scores[doc_id] += EXACT_NAME_BONUS
+            return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
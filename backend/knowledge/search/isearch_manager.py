@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Set, Tuple
+from dao.document_module.document import Document
+
+
+class ISearchManager(ABC):
+    @abstractmethod
+    def needs_refresh(self) -> bool:
+        pass
+
+    @abstractmethod
+    def begin_rebuild(self) -> bool:
+        pass
+
+    @abstractmethod
+    def rebuild(self, documents: Iterable[Document], contents: Iterable[Tuple[str, str]] = ()):
+        pass
+
+    @abstractmethod
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        pass
+
+    @abstractmethod
+    def index_document(self, document: Document, content: Optional[str] = None):
+        pass
+
+    @abstractmethod
+    def remove_document(self, document_id: str):
+        pass
+
+    @abstractmethod
+    def match(self, query: str) -> Set[str]:
+        pass
+
+    @abstractmethod
+    def rank(self, query: str, doc_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        pass
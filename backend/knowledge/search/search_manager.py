@@ -0,0 +1,97 @@
+import time
+from threading import Event, Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from dao.document_module.document import Document
+from knowledge.search.inverted_index import InvertedIndex
+from knowledge.search.isearch_manager import ISearchManager
+
+
+class SearchManager(ISearchManager):
+    def __init__(self, refresh_interval: float):
+        self._index = InvertedIndex()
+        # writes made by other processes are picked up by a periodic rebuild
+        self._refresh_interval = refresh_interval
+        self._built_at: Optional[float] = None
+        self._lock = Lock()
+        self._ready = Event()
+        self._building = False
+        # changes made while a rebuild runs, replayed onto the new index before it is swapped in
+        self._journal: Optional[Dict[str, Optional[Tuple[Document, Optional[str]]]]] = None
+
+    def needs_refresh(self) -> bool:
+        if self._building:
+            return False
+        if self._built_at is None:
+            return True
+        return self._refresh_interval > 0 and time.monotonic() - self._built_at > self._refresh_interval
+
+    def begin_rebuild(self) -> bool:
+        # single flight, only the caller that gets True runs the rebuild
+        with self._lock:
+            if self._building:
+                return False
+            self._building = True
+            self._journal = {}
+            return True
+
+    def rebuild(self, documents: Iterable[Document], contents: Iterable[Tuple[str, str]] = ()):
+        # built aside and swapped in, searches keep using the old index meanwhile
+        if not self._building:
+            self.begin_rebuild()
+        try:
+            index = InvertedIndex()
+            pending = {document.documentId: document for document in documents}
+            # contents are streamed as (document id, text), only one body is held at a time
+            for document_id, content in contents:
+                document = pending.pop(document_id, None)
+                if document:
+                    index.add(document_id, self._fields(document, content))
+            for document in pending.values():
+                index.add(document.documentId, self._fields(document))
+            with self._lock:
+                # the scan may have read a document before a change the journal holds
+                for document_id, entry in self._journal.items():
+                    if entry is None:
+                        index.remove(document_id)
+                    else:
+                        index.add(document_id, self._fields(*entry))
+                self._index = index
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._building = False
+                self._journal = None
+            self._ready.set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        # True once the first rebuild has finished, successful or not
+        return self._ready.wait(timeout)
+
+    def index_document(self, document: Document, content: Optional[str] = None):
+        with self._lock:
+            self._index.add(document.documentId, self._fields(document, content))
+            if self._journal is not None:
+                self._journal[document.documentId] = (document, content)
+
+    def remove_document(self, document_id: str):
+        with self._lock:
+            self._index.remove(document_id)
+            if self._journal is not None:
+                self._journal[document_id] = None
+
+    def match(self, query: str) -> Set[str]:
+        return self._index.match(query)
+
+    def rank(self, query: str, doc_ids: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        return self._index.rank(query, doc_ids)
+
+    @staticmethod
+    def _fields(document: Document, content: Optional[str] = None) -> dict:
+        return {
+            "content": content,
+            "name": document.name,
+            "tags": document.tags,
+            "category": document.category,
+            "description": document.description,
+            "university": document.university
+        }
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+import unittest
+from fastapi import HTTPException
+from api.blocking_executor import BlockingExecutor
+
+
+class BlockingExecutorTest(unittest.TestCase):
+
+    def test_slow_calls_run_concurrently(self):
+        executor = BlockingExecutor(max_workers=4, max_queue=0)
+
+        async def main():
+            start = time.monotonic()
+            results = await asyncio.gather(*(executor.run(time.sleep, 0.2) for _ in range(4)))
+            return results, time.monotonic() - start
+
+        results, elapsed = asyncio.run(main())
+        executor.shutdown()
+        self.assertEqual(results, [None] * 4)
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(executor.stats()["completed"], 4)
+
+    def test_rejects_when_full(self):
+        executor = BlockingExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        async def main():
+            first = asyncio.ensure_future(executor.run(release.wait))
+            second = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            stats = executor.stats()
+            with self.assertRaises(HTTPException) as ctx:
+                await executor.run(release.wait)
+            release.set()
+            await asyncio.gather(first, second)
+            return stats, ctx.exception.status_code
+
+        stats, status_code = asyncio.run(main())
+        executor.shutdown()
+        self.assertEqual(status_code, 503)
+        self.assertEqual((stats["active"], stats["queued"], stats["saturation"]), (1, 1, 1.0))
+        self.assertEqual(executor.stats()["rejected"], 1)
+
+    def test_exceptions_propagate(self):
+        executor = BlockingExecutor(max_workers=1, max_queue=0)
+
+        def fail():
+            raise PermissionError("denied")
+
+        with self.assertRaises(PermissionError):
+            asyncio.run(executor.run(fail))
+        executor.shutdown()
+        self.assertEqual(executor.stats()["failed"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
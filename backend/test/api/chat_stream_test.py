@@ -0,0 +1,74 @@
+import asyncio
+import json
+import unittest
+from api.sse import chat_events
+from knowledge.chat.generators import EchoGenerator, create_generator
+
+
+class FakeRequest:
+    def __init__(self, disconnect_after: int = None):
+        self.disconnect_after = disconnect_after
+        self.polls = 0
+
+    async def is_disconnected(self) -> bool:
+        self.polls += 1
+        return self.disconnect_after is not None and self.polls > self.disconnect_after
+
+
+def parse(events):
+    parsed = []
+    for event in events:
+        name, data = event.strip().split("\n")
+        parsed.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return parsed
+
+
+async def collect(request, passages, tokens):
+    return [event async for event in chat_events(request, passages, tokens)]
+
+
+class ChatStreamTest(unittest.TestCase):
+    passages = [
+        {"documentId": "d1", "version_number": 2, "score": 0.8, "start": 0, "end": 11, "text": "round robin"},
+        {"documentId": "d2", "version_number": 1, "score": 0.5, "start": 4, "end": 9, "text": "quantum"}
+    ]
+
+    def test_citations_then_tokens_then_done(self):
+        generator = EchoGenerator()
+        events = parse(asyncio.run(collect(FakeRequest(), self.passages, generator.generate("q", self.passages))))
+
+        self.assertEqual(events[0][0], "citations")
+        self.assertEqual([(c["number"], c["documentId"]) for c in events[0][1]], [(1, "d1"), (2, "d2")])
+        tokens = [data["text"] for name, data in events if name == "token"]
+        self.assertEqual("".join(tokens), "round robin [1]\nquantum [2]\n")
+        self.assertEqual(events[-1], ("done", {"tokens": len(tokens)}))
+
+    def test_disconnect_stops_generation(self):
+        closed = []
+
+        async def endless():
+            try:
+                while True:
+                    yield "tok "
+            finally:
+                closed.append(True)
+
+        events = parse(asyncio.run(collect(FakeRequest(disconnect_after=3), [], endless())))
+        self.assertEqual([name for name, _ in events], ["citations", "token", "token", "token"])
+        self.assertEqual(closed, [True])
+
+    def test_generator_errors_end_the_stream(self):
+        async def failing():
+            yield "partial "
+            raise RuntimeError("model unavailable")
+
+        events = parse(asyncio.run(collect(FakeRequest(), [], failing())))
+        self.assertEqual(events[-1], ("error", {"detail": "model unavailable"}))
+
+    def test_unknown_generator(self):
+        with self.assertRaises(ValueError):
+            create_generator("gpt")
+
+
+if __name__ == '__main__':
+    unittest.main()
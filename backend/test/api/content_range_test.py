@@ -0,0 +1,67 @@
+import unittest
+from datetime import datetime, timezone
+from api.content_range import parse_range_header, if_range_matches, http_date, parse_if_match, accepted_encodings
+
+
+class ParseRangeHeader(unittest.TestCase):
+
+    def test_closed_range(self):
+        self.assertEqual(parse_range_header("bytes=0-99", 1000), (0, 99))
+
+    def test_open_range(self):
+        self.assertEqual(parse_range_header("bytes=500-", 1000), (500, 999))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_range_header("bytes=-200", 1000), (800, 999))
+        self.assertEqual(parse_range_header("bytes=-5000", 1000), (0, 999))
+
+    def test_end_is_clamped_to_size(self):
+        self.assertEqual(parse_range_header("bytes=900-5000", 1000), (900, 999))
+
+    def test_ignored_headers(self):
+        self.assertIsNone(parse_range_header(None, 1000))
+        self.assertIsNone(parse_range_header("items=0-1", 1000))
+        self.assertIsNone(parse_range_header("bytes=0-1,5-6", 1000))
+        self.assertIsNone(parse_range_header("bytes=abc", 1000))
+
+    def test_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            parse_range_header("bytes=1000-", 1000)
+        with self.assertRaises(ValueError):
+            parse_range_header("bytes=20-10", 1000)
+        with self.assertRaises(ValueError):
+            parse_range_header("bytes=-0", 1000)
+
+
+class IfRangeMatches(unittest.TestCase):
+
+    def test_etag_and_date(self):
+        modified = datetime(2025, 4, 1, 8, 30, tzinfo=timezone.utc)
+        self.assertTrue(if_range_matches(None, "abc", modified))
+        self.assertTrue(if_range_matches('"abc"', "abc", modified))
+        self.assertFalse(if_range_matches('"old"', "abc", modified))
+        self.assertFalse(if_range_matches('W/"abc"', "abc", modified))
+        self.assertTrue(if_range_matches(http_date(modified), "abc", modified))
+
+
+class ParseIfMatch(unittest.TestCase):
+
+    def test_version_validators(self):
+        self.assertIsNone(parse_if_match(None))
+        self.assertIsNone(parse_if_match("*"))
+        self.assertEqual(parse_if_match('"3"'), 3)
+        self.assertEqual(parse_if_match('W/"12"'), 12)
+        with self.assertRaises(ValueError):
+            parse_if_match('"abc"')
+
+
+class AcceptedEncodings(unittest.TestCase):
+
+    def test_codings_and_weights(self):
+        self.assertEqual(accepted_encodings(None), ())
+        self.assertEqual(accepted_encodings("gzip, deflate, br, zstd"), ("gzip", "deflate", "br", "zstd"))
+        self.assertEqual(accepted_encodings("ZSTD;q=0.5, gzip;q=0, *"), ("zstd",))
+
+
+if __name__ == '__main__':
+    unittest.main()
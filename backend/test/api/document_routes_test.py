@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.api_router import KMS_APIRouter
+from api.blocking_executor import BlockingExecutor
+from dao.user_module.user import User
+
+
+class DocumentRoutesTest(unittest.TestCase):
+
+    def setUp(self):
+        secret = patch("api.api_router.SECRET_KEY", "test-secret")
+        secret.start()
+        self.addCleanup(secret.stop)
+        self.knowledge = MagicMock()
+        self.knowledge.is_async = False
+        self.user = User(userId="u1", email="a@example.com", password="x", name="a", departmentId="d", roles=["user"])
+        self.knowledge.get_user_information.side_effect = lambda user_id: self.user if user_id == "u1" else None
+        executor = BlockingExecutor(2, 8)
+        self.addCleanup(executor.shutdown)
+        router = KMS_APIRouter(self.knowledge, executor=executor, generator=MagicMock())
+        app = FastAPI()
+        app.include_router(router.router)
+        self.client = TestClient(app)
+        token = KMS_APIRouter.create_access_token({"sub": "a@example.com", "uid": "u1", "roles": ["user"]})
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def test_the_acting_user_comes_from_the_token(self):
+        self.knowledge.update_content.return_value = 4
+        response = self.client.put("/kms/document/d1/content", headers=self.headers,
+                                   data={"modified_by": "someone-else"}, files={"document": ("a.txt", b"v4")})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.knowledge.update_content.call_args.kwargs["modified_by"], "u1")
+
+        self.knowledge.restore_version.return_value = 5
+        response = self.client.post("/kms/document/d1/versions/2", headers=self.headers,
+                                    data={"version_number": "2", "restored_by": "someone-else"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.knowledge.restore_version.call_args.kwargs["restored_by"], "u1")
+
+    def test_missing_permission_is_forbidden(self):
+        self.knowledge.get_specific_version.side_effect = PermissionError("no read permission")
+        response = self.client.get("/kms/document/d1/versions/2?version_number=2", headers=self.headers)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.knowledge.get_specific_version.call_args.kwargs["user_id"], "u1")
+
+    def test_version_history_is_read_as_the_token_user(self):
+        self.knowledge.get_versions_page.return_value = {"versions": [{"version_number": 1}], "next_cursor": None}
+        response = self.client.get("/kms/document/d1/versions?user_id=owner", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.knowledge.get_versions_page.call_args.kwargs["user_id"], "u1")
+
+        self.knowledge.get_versions_page.side_effect = PermissionError("no read permission")
+        self.assertEqual(self.client.get("/kms/document/d1/versions", headers=self.headers).status_code, 403)
+
+    def test_sharing_reports_the_token_user(self):
+        self.knowledge.share_permissions.return_value = True
+        response = self.client.post("/kms/document/permission", headers=self.headers,
+                                    data={"shared_to": "u2", "document_id": "d1", "permissions": ["read"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["message"], "Permissions shared with user u2 on document d1 by u1")
+        self.assertEqual(self.knowledge.share_permissions.call_args.kwargs["shared_by"], "u1")
+
+        self.knowledge.remove_permissions.return_value = True
+        response = self.client.request("DELETE", "/kms/document/permission", headers=self.headers,
+                                       data={"removed_to": "u2", "document_id": "d1", "permissions": ["read"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["message"], "Permissions removed for user u2 on document d1 by u1")
+        self.assertEqual(self.knowledge.remove_permissions.call_args.kwargs["removed_by"], "u1")
+
+    def test_deleted_or_demoted_users_lose_access_before_their_token_expires(self):
+        admin = KMS_APIRouter.create_access_token({"sub": "a@example.com", "uid": "u1", "roles": ["admin"]})
+        headers = {"Authorization": f"Bearer {admin}"}
+        # the token claims admin, the stored user does not
+        self.assertEqual(self.client.get("/kms/activity/rollups", headers=headers).status_code, 403)
+        self.user = None
+        self.assertEqual(self.client.get("/kms/document/d1/versions", headers=self.headers).status_code, 401)
+        self.knowledge.get_versions_page.assert_not_called()
+
+    def test_metrics_are_for_admins_only(self):
+        self.assertEqual(self.client.get("/kms/metrics", headers=self.headers).status_code, 403)
+        self.user = self.user.copy(update={"roles": ["admin"]})
+        self.assertEqual(self.client.get("/kms/metrics", headers=self.headers).status_code, 200)
+
+    def test_requests_without_a_token_are_rejected(self):
+        response = self.client.put("/kms/document/d1/content", files={"document": ("a.txt", b"v4")})
+        self.assertIn(response.status_code, (401, 403))
+        self.knowledge.update_content.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
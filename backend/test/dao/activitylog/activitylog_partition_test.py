@@ -0,0 +1,97 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+import mongomock
+from pymongo.errors import OperationFailure
+from bson import ObjectId
+from dao.activitylog_module.activitylog import ActivityLog
+from dao.activitylog_module.activitylog_dao import ActivityLogDAO
+from test.support.dao import apply_bulk
+
+
+def _log(user: str, doc: str, action: str, date: datetime) -> ActivityLog:
+    return ActivityLog(userId=user, docId=doc, action=action, description=action, date=date,
+                       activityLogId=str(ObjectId.from_datetime(date)))
+
+
+class ActivityLogPartitionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = ActivityLogDAO(mongomock.MongoClient(), "testdb", "activity_logs", hourly_rollup_days=30)
+        self.dao.rollups.bulk_write = apply_bulk(self.dao.rollups)
+        self.logs = [
+            _log("u1", "d1", "upload document", datetime(2026, 1, 31, 23, 30)),
+            _log("u1", "d1", "delete document", datetime(2026, 2, 1, 9, 5)),
+            _log("u2", "d1", "upload document", datetime(2026, 2, 1, 9, 40)),
+            _log("u1", "d2", "upload document", datetime(2026, 3, 15, 12, 0)),
+        ]
+        self.assertEqual(self.dao.saveMany(self.logs), 4)
+
+    def test_logs_are_partitioned_by_month(self):
+        self.assertEqual(self.dao.partitionNames(), ["activity_logs_202603", "activity_logs_202602",
+                                                     "activity_logs_202601"])
+        self.assertIn("docId_date", self.dao.db["activity_logs_202602"].index_information())
+
+        # newest first, limited, and only the months inside the window are read
+        self.assertEqual([log.docId for log in self.dao.findByUser("u1", limit=2)], ["d2", "d1"])
+        february = self.dao.findByDocument("d1", since=datetime(2026, 2, 1), until=datetime(2026, 3, 1))
+        self.assertEqual([log.userId for log in february], ["u2", "u1"])
+        self.assertEqual(self.dao.findById(self.logs[0].activityLogId).date, datetime(2026, 1, 31, 23, 30))
+
+    def test_pages_walk_the_partitions_newest_first(self):
+        first = self.dao.findAllPage(limit=3)
+        self.assertEqual([log.date.month for log in first.items], [3, 2, 2])
+        last = self.dao.findAllPage(after=first.next_cursor, limit=3)
+        self.assertEqual([log.activityLogId for log in last.items], [self.logs[0].activityLogId])
+        self.assertIsNone(last.next_cursor)
+
+    def test_logs_from_before_partitioning_are_still_read(self):
+        legacy = _log("u1", "d0", "upload document", datetime(2025, 6, 1))
+        self.dao.collection.insert_one(ActivityLogDAO._to_doc(legacy))
+        self.assertEqual(self.dao.findByUser("u1", limit=10)[-1].docId, "d0")
+        self.assertTrue(self.dao.delete(legacy.activityLogId))
+
+    def test_rollups_count_per_bucket(self):
+        daily = self.dao.findRollups("day", "document", key="d1")
+        self.assertEqual([(r["bucket"], r["action"], r["count"]) for r in daily], [
+            (datetime(2026, 1, 31), "upload document", 1),
+            (datetime(2026, 2, 1), "delete document", 1),
+            (datetime(2026, 2, 1), "upload document", 1),
+        ])
+        hourly = self.dao.findRollups("hour", "user", key="u1", since=datetime(2026, 2, 1))
+        self.assertEqual([(r["bucket"], r["count"]) for r in hourly],
+                         [(datetime(2026, 2, 1, 9), 1), (datetime(2026, 3, 15, 12), 1)])
+
+        self.dao.saveMany([_log("u3", "d1", "upload document", datetime(2026, 2, 1, 20, 0))])
+        uploads = self.dao.findRollups("day", "document", key="d1", action="upload document",
+                                       since=datetime(2026, 2, 1))
+        self.assertEqual(uploads[0]["count"], 2)
+        self.assertIn("expire_at", self.dao.rollups.find_one({"granularity": "hour"}))
+        self.assertNotIn("expire_at", self.dao.rollups.find_one({"granularity": "day"}))
+
+    def test_expired_months_are_dropped(self):
+        self.assertEqual(self.dao.dropExpiredPartitions(), [])  # no retention, nothing expires
+        self.dao.partitions.retention_days = 90
+        self.assertIn("date_ttl", [index.document["name"] for index in self.dao.partitions.indexes()])
+        dropped = self.dao.dropExpiredPartitions(now=datetime(2026, 5, 15))
+        self.assertEqual(dropped, ["activity_logs_202601"])
+        self.assertEqual(self.dao.partitionNames(), ["activity_logs_202603", "activity_logs_202602"])
+
+    def test_retention_change_moves_the_ttl_and_keeps_writing(self):
+        self.dao.partitions.retention_days = 30
+        self.dao.db.command = MagicMock()
+        conflict = OperationFailure("Index with name: date_ttl already exists with different options", code=85)
+        with patch.object(mongomock.collection.Collection, "create_indexes", side_effect=conflict):
+            self.assertEqual(self.dao.saveMany([_log("u1", "d1", "upload document", datetime(2026, 4, 2))]), 1)
+        self.dao.db.command.assert_called_once_with("collMod", "activity_logs_202604",
+                                                    index={"name": "date_ttl", "expireAfterSeconds": 30 * 86400})
+        self.assertEqual(self.dao.findByDocument("d1", since=datetime(2026, 4, 1))[0].userId, "u1")
+
+    def test_logs_are_dated_in_utc(self):
+        log = ActivityLog(userId="u1", docId="d1", action="upload document", description="upload document")
+        self.assertIsNone(log.date.tzinfo)
+        self.assertLess(abs((log.date - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds()), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+import mongomock
+from dao.activitylog_module.activitylog import ActivityLog
+from dao.activitylog_module.activitylog_dao import ActivityLogDAO
+from dao.activitylog_module.activitylog_writer import BufferedActivityLogWriter
+from test.support.dao import apply_bulk
+
+
+def _log(i: int) -> ActivityLog:
+    return ActivityLog(userId="u1", docId=f"d{i}", action="upload document", description=f"log {i}")
+
+
+class BufferedActivityLogWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = ActivityLogDAO(mongomock.MongoClient(), "testdb", "activity_logs")
+        self.dao.rollups.bulk_write = apply_bulk(self.dao.rollups)
+
+    def test_logs_are_batched_and_drained_on_close(self):
+        writer = BufferedActivityLogWriter(self.dao, max_queue=100, batch_size=10, flush_interval=60,
+                                           block_timeout=0.01)
+        for i in range(25):
+            self.assertTrue(writer.submit(_log(i)))
+        writer.close()
+
+        self.assertEqual(len(self.dao.findAll(limit=100)), 25)
+        stats = writer.stats()
+        self.assertEqual((stats["written"], stats["dropped"], stats["queued"]), (25, 0, 0))
+        self.assertLessEqual(stats["batches"], 4)
+        self.assertEqual({log.docId for log in self.dao.findByUser("u1")}, {f"d{i}" for i in range(25)})
+
+    def test_full_queue_blocks_then_drops(self):
+        release = threading.Event()
+        dao = MagicMock()
+        dao.saveMany.side_effect = lambda logs: release.wait() and len(logs)
+        writer = BufferedActivityLogWriter(dao, max_queue=2, batch_size=1, flush_interval=0, block_timeout=0.01)
+
+        results = [writer.submit(_log(i)) for i in range(10)]
+        self.assertFalse(all(results))
+        stats = writer.stats()
+        self.assertGreater(stats["dropped"], 0)
+        self.assertGreaterEqual(stats["blocked"], stats["dropped"])
+
+        release.set()
+        writer.close()
+        self.assertEqual(writer.stats()["written"], results.count(True))
+
+    def test_failed_batches_are_counted(self):
+        dao = MagicMock()
+        dao.saveMany.side_effect = RuntimeError("mongo down")
+        writer = BufferedActivityLogWriter(dao, max_queue=10, batch_size=5, flush_interval=0, block_timeout=0.01)
+        writer.submit(_log(1))
+        writer.close()
+        self.assertEqual(writer.stats()["failed"], 1)
+
+        # after close logs are written directly
+        dao.save.return_value = True
+        self.assertTrue(writer.submit(_log(2)))
+        dao.save.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
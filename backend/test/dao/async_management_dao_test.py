@@ -0,0 +1,89 @@
+import unittest
+from unittest import mock
+import mongomock
+from dao.async_management_dao import AsyncManagementDAO
+from test.support.dao import management_dao, COLLECTIONS
+
+
+class _AsyncCursor:
+    # mongomock cursor exposed through the async iteration protocol of pymongo's AsyncCursor
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor.sort(*args, **kwargs)
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._cursor)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class _AsyncCollection:
+    def __init__(self, collection):
+        self._collection = collection
+
+    def find(self, *args, **kwargs):
+        return _AsyncCursor(self._collection.find(*args, **kwargs))
+
+    def __getattr__(self, name):
+        method = getattr(self._collection, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+        return call
+
+
+class _AsyncClient:
+    def __init__(self, client):
+        self._client = client
+
+    def __getitem__(self, database_name):
+        database = self._client[database_name]
+
+        class _Database:
+            def __getitem__(self, collection_name):
+                return _AsyncCollection(database[collection_name])
+        return _Database()
+
+
+class AsyncManagementDAOTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        client = mongomock.MongoClient()
+        self.dao = management_dao(client)
+        with mock.patch("dao.async_management_dao.get_collections", return_value=COLLECTIONS):
+            self.async_dao = AsyncManagementDAO(
+                _AsyncClient(client), "testdb",
+                user_cache=self.dao.user_cache,
+                user_email_cache=self.dao.user_email_cache,
+                permission_cache=self.dao.permission_cache
+            )
+
+    async def test_reads_what_the_sync_dao_wrote(self):
+        self.dao.shareDocument("d2", "u1", ["read"])
+        self.dao.shareDocument("d1", "u1", ["read", "write"])
+        self.dao.shareDocument("d3", "u1", ["write"])
+
+        self.assertEqual(await self.async_dao.getDocIdsByUserPermission("u1", "read"), ["d1", "d2"])
+        self.assertEqual(await self.async_dao.getDocIdsByUserPermission("u1", "read", ["d2", "d3"]), ["d2"])
+        permission = await self.async_dao.getPermissionsByUserDoc("u1", "d1")
+        self.assertEqual(permission.permissions, ["read", "write"])
+
+    async def test_caches_are_shared_with_the_sync_dao(self):
+        self.assertIsNone(await self.async_dao.getPermissionsByUserDoc("u2", "d1"))
+        # the sync write invalidates the entry the async read cached
+        self.dao.shareDocument("d1", "u2", ["read"])
+        self.assertEqual((await self.async_dao.getPermissionsByUserDoc("u2", "d1")).permissions, ["read"])
+
+        self.assertTrue(await self.async_dao.removeShareDocument("d1", "u2", ["read"]))
+        self.assertEqual(self.dao.getPermissionsByUserDoc("u2", "d1").permissions, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import hashlib
+import unittest
+from dao.document_module.document import Document
+from dao.user_module.user import User
+from test.support.dao import management_dao
+
+
+CONTENT = b"syllabus " * 1000
+CHECKSUM = hashlib.sha256(CONTENT).hexdigest()
+
+
+class _Stream:
+    # non-seekable, like a storage response being restored
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._data.read(size)
+
+
+class ContentDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = management_dao()
+        self.storage = self.dao._storage
+        for email in ("a@example.com", "b@example.com"):
+            self.dao.saveUser(User(email=email, password="x", name=email, departmentId="d", roles=["user"]))
+
+    def _upload(self, owner: str, content) -> Document:
+        doc = Document(name="syllabus", owner=owner, dType="application/pdf", departmentId="d",
+                       description="", university="ttu", file_size=0, tags=[], category="course")
+        self.assertNotIn("error", self.dao.saveDocument(doc, content))
+        return doc
+
+    def _ref_count(self) -> int:
+        return self.dao.blob_dao.findById(CHECKSUM).refCount
+
+    def test_duplicate_upload_is_not_transferred(self):
+        first = self._upload("a@example.com", io.BytesIO(CONTENT))
+        second = self._upload("b@example.com", io.BytesIO(CONTENT))
+
+        self.assertEqual(self.storage.addDoc.call_count, 1)
+        self.assertEqual(self._ref_count(), 2)
+        stored = self.dao.findDocumentById(second.documentId).versions[0]
+        self.assertEqual(stored.checksum, CHECKSUM)
+        self.assertEqual(stored.file_size, len(CONTENT))
+        self.assertEqual(self.dao._content_object_name(first), f"blobs/{CHECKSUM}")
+
+    def test_unseekable_upload_is_staged_then_deduplicated(self):
+        self._upload("a@example.com", _Stream(CONTENT))
+        self.storage.copyDoc.assert_called_once()
+        self._upload("b@example.com", _Stream(CONTENT))
+
+        self.assertEqual(self.storage.copyDoc.call_count, 1)
+        self.assertEqual(self._ref_count(), 2)
+        staged = [c.args[0] for c in self.storage.deleteDoc.call_args_list]
+        self.assertTrue(staged and all(name.startswith("staging/") for name in staged))
+
+    def test_restore_shares_the_blob(self):
+        doc = self._upload("a@example.com", io.BytesIO(CONTENT))
+        self.assertTrue(self.dao.update_content("a@example.com", doc.documentId, io.BytesIO(b"edited")))
+        self.assertTrue(self.dao.restore_content("a@example.com", doc.documentId, 1))
+
+        self.assertEqual(self.storage.addDoc.call_count, 2)
+        versions = self.dao.getVersions(doc.documentId)
+        self.assertEqual([v.version_number for v in versions], [1, 2, 3])
+        self.assertEqual(versions[2].object_name, versions[0].object_name)
+        self.assertEqual(self._ref_count(), 2)
+
+    def test_unreferenced_blob_is_left_to_the_reconciler(self):
+        first = self._upload("a@example.com", io.BytesIO(CONTENT))
+        second = self._upload("b@example.com", io.BytesIO(CONTENT))
+
+        self.assertTrue(self.dao.deleteDocument("u", first.documentId))
+        self.storage.deleteDocs.assert_not_called()
+        self.assertEqual(self._ref_count(), 1)
+
+        # the object stays, an upload of the same bytes may be taking the record over right now
+        self.assertTrue(self.dao.deleteDocument("u", second.documentId))
+        self.storage.deleteDocs.assert_not_called()
+        self.storage.deleteDoc.assert_not_called()
+        self.assertEqual(self._ref_count(), 0)
+        self._upload("a@example.com", io.BytesIO(CONTENT))
+        self.assertEqual(self._ref_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
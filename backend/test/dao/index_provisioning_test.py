@@ -0,0 +1,31 @@
+import unittest
+from test.support.dao import management_dao
+
+
+class IndexProvisioning(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = management_dao()
+
+    def test_declared_indexes_are_created(self):
+        report = self.dao.ensure_indexes()
+        self.assertEqual(report["users"]["missing"], [])
+        self.assertIn("email_unique", self.dao.user_dao.collection.index_information())
+        self.assertIn("userId_docId_unique", self.dao.permission_dao.collection.index_information())
+        self.assertIn("docId_date", self.dao.activity_log_dao.collection.index_information())
+        self.assertEqual(set(report["documents"]["declared"]), {"name", "owner_id"})
+
+    def test_ensure_indexes_is_idempotent(self):
+        self.dao.ensure_indexes()
+        report = self.dao.ensure_indexes()
+        self.assertTrue(all(not entry["missing"] for entry in report.values()))
+
+    def test_conflicting_data_is_reported_as_missing(self):
+        users = self.dao.user_dao.collection
+        users.insert_many([{"email": "dup@example.com"}, {"email": "dup@example.com"}])
+        report = self.dao.ensure_indexes()
+        self.assertEqual(report["users"]["missing"], ["email_unique"])
+
+
+if __name__ == '__main__':
+    unittest.main()
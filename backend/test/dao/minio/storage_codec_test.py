@@ -0,0 +1,103 @@
+import io
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import mock
+from dao.storage_module import codec
+from dao.minio_module.storage import MinIOStorage
+from dao.document_module.document import Document
+from dao.user_module.user import User
+from test.support.dao import management_dao
+
+
+CSV = b"course,credits,lecturer\n" + b"databases,4,nguyen\n" * 2000
+
+
+class _Response(io.BytesIO):
+    def release_conn(self):
+        pass
+
+
+class FakeMinio:
+    # keeps objects in memory, enough of the client for MinIOStorage
+    def __init__(self, **kwargs):
+        self.objects = {}
+
+    def bucket_exists(self, bucket_name):
+        return True
+
+    def put_object(self, bucket_name, object_name, data, length, content_type, part_size, metadata=None):
+        self.objects[object_name] = (b"".join(iter(lambda: data.read(64 * 1024), b"")), metadata)
+
+    def get_object(self, bucket_name, object_name, offset=0, length=0):
+        data = self.objects[object_name][0]
+        return _Response(data[offset:offset + length] if length else data[offset:])
+
+    def stat_object(self, bucket_name, object_name):
+        return SimpleNamespace(size=len(self.objects[object_name][0]), etag="e", last_modified=datetime.now(),
+                               content_type="text/csv")
+
+    def presigned_get_object(self, bucket_name, object_name, expires, response_headers=None):
+        return f"https://storage/{object_name}?{response_headers}"
+
+
+@unittest.skipIf(codec.zstandard is None, "zstandard is not installed")
+class StorageCodec(unittest.TestCase):
+
+    def setUp(self):
+        with mock.patch("dao.minio_module.storage.Minio", FakeMinio):
+            storage = MinIOStorage("minio:9000", "k", "s", "kms", codec=codec.ZSTD)
+        self.dao = management_dao(storage=storage)
+        self.objects = storage.client.objects
+        self.dao.saveUser(User(email="a@example.com", password="x", name="a", departmentId="d", roles=["user"]))
+
+    def _upload(self, content_type: str, content) -> Document:
+        doc = Document(name="timetable", owner="a@example.com", dType=content_type, departmentId="d",
+                       description="", university="ttu", file_size=0, tags=[], category="course")
+        self.assertNotIn("error", self.dao.saveDocument(doc, content))
+        return doc
+
+    def test_compressible_types(self):
+        types = codec.DEFAULT_COMPRESSIBLE_TYPES
+        self.assertTrue(codec.compressible("text/csv; charset=utf-8", types))
+        self.assertTrue(codec.compressible("application/json", types))
+        self.assertFalse(codec.compressible("application/pdf", types))
+        self.assertFalse(codec.compressible(None, types))
+
+    def test_text_is_stored_compressed_and_read_back_decoded(self):
+        doc = self._upload("text/csv", io.BytesIO(CSV))
+        version = self.dao.findVersion(doc.documentId, 1)
+        self.assertEqual((version.codec, version.file_size), (codec.ZSTD, len(CSV)))
+        stored, metadata = self.objects[version.object_name]
+        self.assertTrue(version.object_name.endswith(".zstd"))
+        self.assertEqual(metadata, {"codec": codec.ZSTD})
+        self.assertLess(len(stored), len(CSV) // 10)
+
+        self.assertEqual(self.dao.get_document_content(doc.documentId).read(), CSV)
+        self.assertEqual(self.dao.get_document_content(doc.documentId, offset=24, length=19).read(),
+                         b"databases,4,nguyen\n")
+        self.assertEqual(self.dao.get_document_content(doc.documentId, decode=False).read(), stored)
+        stat = self.dao.stat_document_content(doc.documentId)
+        self.assertEqual((stat["size"], stat["stored_size"], stat["codec"]), (len(CSV), len(stored), codec.ZSTD))
+
+    def test_urls_need_a_client_that_decodes(self):
+        doc = Document(name="timetable", owner="a@example.com", dType="text/csv", departmentId="d",
+                       description="", university="ttu", file_size=0, tags=[], category="course")
+        self.assertNotIn("content_url", self.dao.saveDocument(doc, io.BytesIO(CSV)))
+        self.assertIsNone(self.dao.get_document_content_url(doc.documentId))
+        url = self.dao.get_document_content_url(doc.documentId, accept_encodings=("gzip", codec.ZSTD))
+        self.assertIn("response-content-encoding", url)
+
+    def test_other_types_and_duplicates_keep_the_stored_codec(self):
+        pdf = self._upload("application/pdf", io.BytesIO(b"%PDF-1.7 binary"))
+        self.assertIsNone(self.dao.findVersion(pdf.documentId, 1).codec)
+        csv = self._upload("text/csv", io.BytesIO(CSV))
+        # the same bytes under a type that is not compressed share the compressed blob
+        copy = self._upload("application/octet-stream", io.BytesIO(CSV))
+        self.assertEqual(self.dao.findVersion(copy.documentId, 1).object_name,
+                         self.dao.findVersion(csv.documentId, 1).object_name)
+        self.assertEqual(self.dao.get_document_content(copy.documentId).read(), CSV)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import types
+import unittest
+import mongomock
+from dao.pagination import MAX_PAGE_SIZE
+from dao.user_module.user import User
+from dao.user_module.user_dao import UserDAO
+from dao.document_module.document import Document
+from dao.document_module.document_dao import DocumentDAO
+from dao.permission_module.permission import Permission
+from dao.permission_module.permission_dao import PermissionDAO
+
+
+def _document(owner: str, name: str) -> Document:
+    return Document(name=name, owner=owner, dType="application/pdf", departmentId="d", description="",
+                    university="ttu", file_size=1, tags=[], category="course")
+
+
+class KeysetPagination(unittest.TestCase):
+
+    def setUp(self):
+        client = mongomock.MongoClient()
+        self.users = UserDAO(client, "testdb", "users")
+        self.documents = DocumentDAO(client, "testdb", "documents")
+        # mongomock reads a lone $slice as an inclusion projection and drops the other fields, mongodb does not
+        self.documents.META_PROJECTION = None
+        self.permissions = PermissionDAO(client, "testdb", "permissions")
+        for i in range(7):
+            self.users.save(User(name=f"user{i}", email=f"user{i}@example.com", password="x", departmentId="d"))
+            self.documents.save(_document("a@example.com" if i % 2 else "b@example.com", f"doc{i}"))
+            self.permissions.save(Permission(userId="u1", docId=f"d{i}", permissions=["read"]))
+        self.permissions.save(Permission(userId="u2", docId="d0", permissions=["read"]))
+
+    def _walk(self, fetch, limit: int):
+        pages, after = [], None
+        while True:
+            page = fetch(after=after, limit=limit)
+            pages.append(page.items)
+            if page.next_cursor is None:
+                return pages
+            after = page.next_cursor
+
+    def test_pages_cover_every_user_once(self):
+        pages = self._walk(self.users.findPage, 3)
+        self.assertEqual([len(items) for items in pages], [3, 3, 1])
+        self.assertEqual([user.name for items in pages for user in items], [f"user{i}" for i in range(7)])
+
+    def test_exact_multiple_ends_without_an_empty_page(self):
+        pages = self._walk(lambda after, limit: self.permissions.findByUserPage("u1", after, limit), 7)
+        self.assertEqual([len(items) for items in pages], [7])
+
+    def test_owner_pages_only_hold_the_owners_documents(self):
+        pages = self._walk(lambda after, limit: self.documents.findByOwnerPage("a@example.com", after, limit), 2)
+        self.assertEqual([doc.name for items in pages for doc in items], ["doc1", "doc3", "doc5"])
+        self.assertEqual([doc.name for doc in self.documents.findByOwner("b@example.com")],
+                         ["doc0", "doc2", "doc4", "doc6"])
+
+    def test_cursor_is_the_last_item_id(self):
+        page = self.documents.findAllPage(limit=1)
+        self.assertEqual(page.next_cursor, page.items[0].documentId)
+        self.assertEqual(self.documents.findAllPage(after=page.next_cursor, limit=1).items[0].name, "doc1")
+
+    def test_invalid_cursor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.users.findPage(after="not-an-id")
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(len(self.permissions.findAllPage(limit=0).items), 1)
+        self.assertEqual(len(self.permissions.findAllPage(limit=MAX_PAGE_SIZE * 10).items), 8)
+
+    def test_iterators_are_lazy(self):
+        users = self.users.iterAll()
+        self.assertIsInstance(users, types.GeneratorType)
+        self.assertEqual(next(users).name, "user0")
+        self.assertEqual(len(list(self.permissions.iterByUser("u1"))), 7)
+        self.assertEqual(len(self.documents.findAllMeta()), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
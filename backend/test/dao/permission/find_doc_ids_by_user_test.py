@@ -0,0 +1,27 @@
+import unittest
+import mongomock
+from dao.permission_module.permission import Permission
+from dao.permission_module.permission_dao import PermissionDAO
+
+
+class FindDocIdsByUser(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = PermissionDAO(mongomock.MongoClient(), 'testdb', 'permissions')
+        self.dao.save(Permission(userId="u1", docId="d2", permissions=["read", "write"]))
+        self.dao.save(Permission(userId="u1", docId="d1", permissions=["read"]))
+        self.dao.save(Permission(userId="u1", docId="d3", permissions=["write"]))
+        self.dao.save(Permission(userId="u2", docId="d4", permissions=["read"]))
+
+    def test_all_readable_docs_sorted(self):
+        self.assertEqual(self.dao.findDocIdsByUser("u1", "read"), ["d1", "d2"])
+
+    def test_restricted_to_requested_ids(self):
+        self.assertEqual(self.dao.findDocIdsByUser("u1", "read", ["d2", "d3", "d4"]), ["d2"])
+
+    def test_unknown_user(self):
+        self.assertEqual(self.dao.findDocIdsByUser("nobody", "read"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
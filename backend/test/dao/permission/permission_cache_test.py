@@ -0,0 +1,37 @@
+import unittest
+from unittest import mock
+from test.support.dao import management_dao
+
+
+class PermissionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = management_dao()
+
+    def test_repeated_checks_are_served_from_memory(self):
+        self.dao.shareDocument("d1", "u1", ["read"])
+        with mock.patch.object(self.dao.permission_dao, "findByUserDoc",
+                               wraps=self.dao.permission_dao.findByUserDoc) as find:
+            for _ in range(5):
+                self.assertEqual(self.dao.getPermissionsByUserDoc("u1", "d1").permissions, ["read"])
+            self.assertEqual(find.call_count, 1)
+        self.assertEqual(self.dao.cache_stats()["permissions"]["hits"], 4)
+
+    def test_denials_are_cached_and_share_invalidates(self):
+        self.assertIsNone(self.dao.getPermissionsByUserDoc("u2", "d1"))
+        self.assertIsNone(self.dao.getPermissionsByUserDoc("u2", "d1"))
+
+        self.assertTrue(self.dao.shareDocument("d1", "u2", ["read", "write"]))
+        self.assertEqual(self.dao.getPermissionsByUserDoc("u2", "d1").permissions, ["read", "write"])
+
+        self.assertTrue(self.dao.removeShareDocument("d1", "u2", ["write"]))
+        self.assertEqual(self.dao.getPermissionsByUserDoc("u2", "d1").permissions, ["read"])
+
+    def test_cached_permission_is_not_shared(self):
+        self.dao.shareDocument("d1", "u1", ["read"])
+        self.dao.getPermissionsByUserDoc("u1", "d1").permissions.append("delete")
+        self.assertEqual(self.dao.getPermissionsByUserDoc("u1", "d1").permissions, ["read"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import io
+import os
+import tempfile
+import unittest
+from dao.storage_module import codec
+from dao.storage_module.local_storage import LocalStorage
+from dao.document_module.document import Document
+from dao.user_module.user import User
+from test.support.dao import management_dao
+
+
+class _Failing:
+    # a client that disconnects half way through the upload
+    def __init__(self):
+        self._sent = False
+
+    def read(self, size: int = -1) -> bytes:
+        if self._sent:
+            raise ConnectionError("client went away")
+        self._sent = True
+        return b"partial"
+
+
+class LocalStorageTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.storage = LocalStorage(self.root.name)
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def test_objects_round_trip(self):
+        self.assertTrue(self.storage.addDoc("blobs/abc", io.BytesIO(b"0123456789"), content_type="text/plain"))
+        self.assertEqual(self.storage.getDoc("blobs/abc").read(), b"0123456789")
+        self.assertEqual(self.storage.getDoc("blobs/abc", offset=2, length=3).read(), b"234")
+        stat = self.storage.statDoc("blobs/abc")
+        self.assertEqual((stat["size"], stat["content_type"]), (10, "text/plain"))
+        self.assertEqual(stat["etag"], "781e5e245d69b566979b86e28d23f2c7")
+        with open(self.storage.getDocPath("blobs/abc"), "rb") as file:
+            self.assertEqual(file.read(), b"0123456789")
+        self.assertIsNone(self.storage.getDocUrl("blobs/abc", expires=None))
+
+    def test_failed_writes_leave_nothing_behind(self):
+        self.assertTrue(self.storage.addDoc("blobs/abc", io.BytesIO(b"complete")))
+        self.assertFalse(self.storage.addDoc("blobs/abc", _Failing()))
+        self.assertEqual(self.storage.getDoc("blobs/abc").read(), b"complete")
+        self.assertEqual(os.listdir(os.path.join(self.root.name, "tmp")), [])
+        self.assertIsNone(self.storage.getDoc("blobs/missing"))
+
+    def test_listing_is_in_key_order(self):
+        for name in ("staging/1", "blobs/b", "6650a1/v1", "blobs/a.zstd"):
+            self.storage.addDoc(name, io.BytesIO(name.encode()))
+        self.assertEqual([o["name"] for o in self.storage.listDocs()],
+                         ["6650a1/v1", "blobs/a.zstd", "blobs/b", "staging/1"])
+        self.assertEqual([o["name"] for o in self.storage.listDocs("blobs/")], ["blobs/a.zstd", "blobs/b"])
+
+    def test_copy_and_delete(self):
+        self.storage.addDoc("staging/1", io.BytesIO(b"data"), content_type="text/csv")
+        self.assertTrue(self.storage.copyDoc("staging/1", "blobs/abc"))
+        self.assertEqual(self.storage.statDoc("blobs/abc")["content_type"], "text/csv")
+        self.assertEqual(self.storage.deleteDocs(["staging/1", "staging/never-written"]), [])
+        self.assertIsNone(self.storage.getDocPath("staging/1"))
+        self.assertEqual(self.storage.getDoc("blobs/abc").read(), b"data")
+
+    @unittest.skipIf(codec.zstandard is None, "zstandard is not installed")
+    def test_codec(self):
+        storage = LocalStorage(self.root.name, codec=codec.ZSTD)
+        data = b"lecture notes " * 1000
+        self.assertEqual(storage.codec_for("text/markdown"), codec.ZSTD)
+        self.assertTrue(storage.addDoc("blobs/abc.zstd", io.BytesIO(data), codec=codec.ZSTD))
+        self.assertLess(storage.statDoc("blobs/abc.zstd")["size"], len(data))
+        self.assertEqual(storage.getDoc("blobs/abc.zstd", offset=14, length=8, codec=codec.ZSTD).read(), b"lecture ")
+
+
+class LocalBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        config = {"backend": "local", "local_root": self.root.name, "codec": None, "compress_types": None,
+                  "compression_level": 3}
+        self.dao = management_dao(storage_config=config)
+        self.dao.saveUser(User(email="a@example.com", password="x", name="a", departmentId="d", roles=["user"]))
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def test_documents_are_served_from_disk(self):
+        doc = Document(name="syllabus", owner="a@example.com", dType="application/pdf", departmentId="d",
+                       description="", university="ttu", file_size=0, tags=[], category="course")
+        result = self.dao.saveDocument(doc, io.BytesIO(b"%PDF-1.7"))
+        self.assertNotIn("error", result)
+        self.assertIsNone(result["content_url"])
+        stat = self.dao.stat_document_content(doc.documentId)
+        with open(stat["path"], "rb") as file:
+            self.assertEqual(file.read(), b"%PDF-1.7")
+        self.assertTrue(self.dao.deleteDocument("a@example.com", doc.documentId))
+        # unreferenced blobs are removed by the reconciler
+        self.assertTrue(os.path.exists(stat["path"]))
+        self.assertEqual([blob.refCount for blob in self.dao.findBlobsInRange(None, None)], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
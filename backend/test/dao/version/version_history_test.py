@@ -0,0 +1,135 @@
+import io
+import hashlib
+import unittest
+from datetime import datetime
+from unittest import mock
+from bson import ObjectId
+from dao.document_module.document import Document, Version
+from dao.document_module.errors import VersionConflictError
+from dao.user_module.user import User
+from test.support.dao import management_dao
+
+
+class VersionHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = management_dao()
+        self.storage = self.dao._storage
+        self.dao.saveUser(User(email="a@example.com", password="x", name="a", departmentId="d", roles=["user"]))
+        self.doc = Document(name="syllabus", owner="a@example.com", dType="application/pdf", departmentId="d",
+                            description="", university="ttu", file_size=0, tags=[], category="course")
+        self.assertNotIn("error", self.dao.saveDocument(self.doc, io.BytesIO(b"v1")))
+        for content in (b"v2", b"v3"):
+            self.assertTrue(self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(content)))
+
+    def test_versions_live_outside_the_document(self):
+        stored = self.dao.document_dao.collection.find_one({"_id": ObjectId(self.doc.documentId)})
+        self.assertEqual([v["version_number"] for v in stored["versions"]], [1])
+        self.assertEqual(self.dao.findDocumentById(self.doc.documentId).currentNumber, 3)
+        self.assertEqual([v.version_number for v in self.dao.getVersions(self.doc.documentId)], [1, 2, 3])
+        self.assertEqual(self.dao.findVersion(self.doc.documentId, 2).file_size, 2)
+
+    def test_pages_are_newest_first(self):
+        first = self.dao.getVersionsPage(self.doc.documentId, limit=2)
+        self.assertEqual([v.version_number for v in first.items], [3, 2])
+        last = self.dao.getVersionsPage(self.doc.documentId, after=first.next_cursor, limit=2)
+        self.assertEqual([v.version_number for v in last.items], [1])
+        self.assertIsNone(last.next_cursor)
+        with self.assertRaises(ValueError):
+            self.dao.getVersionsPage(self.doc.documentId, after="latest")
+
+    def test_a_version_number_is_appended_once(self):
+        self.dao.ensure_indexes()
+        taken = Version(version_number=3, modified_by="b@example.com", modification_date=datetime.now(), file_size=1)
+        self.assertFalse(self.dao.addVersion(self.doc.documentId, taken))
+        self.assertEqual(self.dao.findVersion(self.doc.documentId, 3).modified_by, "a@example.com")
+
+    def test_stale_expected_version_is_rejected(self):
+        self.assertEqual(self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(b"v4"),
+                                                 expected_version=3), 4)
+        with self.assertRaises(VersionConflictError) as raised:
+            self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(b"v5"), expected_version=3)
+        self.assertEqual(raised.exception.current, 4)
+        self.assertEqual(self.dao.findDocumentById(self.doc.documentId).currentNumber, 4)
+
+    def test_racing_writers_never_share_a_number(self):
+        # both writers read version 3 before either committed, only the first commit is accepted
+        self.assertEqual(self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(b"left"),
+                                                 expected_version=3, content_type="text/plain"), 4)
+        with self.assertRaises(VersionConflictError):
+            self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(b"right"),
+                                    expected_version=3, content_type="text/plain")
+        self.assertEqual(self.dao.blob_dao.findById(hashlib.sha256(b"right").hexdigest()).refCount, 0)
+        # without a guard, each writer gets the next number
+        numbers = [self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(data),
+                                           content_type="text/plain") for data in (b"x", b"y")]
+        self.assertEqual(numbers, [5, 6])
+        self.assertEqual([v.version_number for v in self.dao.getVersions(self.doc.documentId)], [1, 2, 3, 4, 5, 6])
+
+    def test_current_version_is_always_readable(self):
+        # a commit that wrote its record but stopped before pointing the document at it
+        self.dao.ensure_indexes()
+        claimed = self.dao.document_dao.claimNextVersion(self.doc.documentId)["versionCounter"]
+        left = Version(version_number=claimed, modified_by="b@example.com", modification_date=datetime.now(),
+                       file_size=1)
+        self.assertTrue(self.dao.version_dao.save(self.doc.documentId, left))
+        self.assertEqual(self.dao.findDocumentById(self.doc.documentId).currentNumber, 3)
+        self.assertEqual(self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(b"v5"),
+                                                 expected_version=3), 5)
+        self.assertEqual(self.dao.findVersion(self.doc.documentId, 5).file_size, 2)
+        # a record that cannot be written never becomes current
+        with mock.patch.object(self.dao.version_dao, "save", return_value=False):
+            self.assertIsNone(self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(b"v6")))
+        self.assertEqual(self.dao.findDocumentById(self.doc.documentId).currentNumber, 5)
+        self.assertEqual(self.dao.blob_dao.findById(hashlib.sha256(b"v6").hexdigest()).refCount, 0)
+
+    def test_a_document_deleted_mid_commit_keeps_no_version(self):
+        delete = self.dao.document_dao.collection.delete_one
+        advance = self.dao.document_dao.advanceCurrentNumber
+
+        def deleted_first(document_id, *args):
+            delete({"_id": ObjectId(document_id)})
+            return advance(document_id, *args)
+        with mock.patch.object(self.dao.document_dao, "advanceCurrentNumber", side_effect=deleted_first):
+            self.assertIsNone(self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(b"v4"),
+                                                      content_type="text/plain"))
+        self.assertIsNone(self.dao.version_dao.findOne(self.doc.documentId, 4))
+        self.assertEqual(self.dao.blob_dao.findById(hashlib.sha256(b"v4").hexdigest()).refCount, 0)
+
+    def test_legacy_documents_number_after_their_history(self):
+        legacy_id = ObjectId()
+        versions = [Version(version_number=n, modified_by="a@example.com", modification_date=datetime(2025, 1, n),
+                            file_size=n).dict() for n in (1, 2, 3)]
+        self.dao.document_dao.collection.insert_one({
+            "_id": legacy_id, "name": "old", "owner": "a@example.com", "dType": "text/plain", "departmentId": "d",
+            "tags": [], "category": "c", "description": "", "university": "ttu", "currentNumber": 3,
+            "versions": versions
+        })
+        numbers = [self.dao.update_content("a@example.com", str(legacy_id), io.BytesIO(data),
+                                           content_type="text/plain") for data in (b"x", b"y")]
+        self.assertEqual(numbers, [4, 5])
+        self.assertEqual([v.version_number for v in self.dao.getVersions(str(legacy_id))], [1, 2, 3, 4, 5])
+
+    def test_embedded_history_moves_on_first_use(self):
+        legacy_id = ObjectId()
+        versions = [Version(version_number=n, modified_by="a@example.com", modification_date=datetime(2025, 1, n),
+                            file_size=n).dict() for n in (1, 2, 3)]
+        self.dao.document_dao.collection.insert_one({
+            "_id": legacy_id, "name": "old", "owner": "a@example.com", "dType": "text/plain", "departmentId": "d",
+            "tags": [], "category": "c", "description": "", "university": "ttu", "currentNumber": 3,
+            "versions": versions
+        })
+        page = self.dao.getVersionsPage(str(legacy_id))
+        self.assertEqual([v.version_number for v in page.items], [3, 2, 1])
+        stored = self.dao.document_dao.collection.find_one({"_id": legacy_id})
+        self.assertEqual(len(stored["versions"]), 1)
+        self.assertIsNone(self.dao.document_dao.findEmbeddedVersions(str(legacy_id)))
+        self.assertEqual(self.dao.findDocumentById(str(legacy_id)).versions[0].file_size, 1)
+
+    def test_delete_removes_the_history(self):
+        self.assertTrue(self.dao.deleteDocument("u", self.doc.documentId))
+        self.assertEqual(self.dao.version_dao.findByDocument(self.doc.documentId), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
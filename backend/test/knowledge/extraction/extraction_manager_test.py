@@ -0,0 +1,75 @@
+import io
+import time
+import unittest
+from dao.document_module.document import Document
+from dao.user_module.user import User
+from knowledge.extraction.extraction_manager import ExtractionManager
+from test.support.dao import management_dao
+
+
+class ExtractionManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = management_dao()
+        objects = {}
+        storage = self.dao._storage
+        storage.addDoc.side_effect = lambda name, data, **kwargs: objects.setdefault(name, data.read()) is not None
+        storage.getDoc.side_effect = lambda name, **kwargs: io.BytesIO(objects[name])
+        self.dao.saveUser(User(email="a@example.com", password="x", name="a", departmentId="d"))
+        self.extraction = ExtractionManager(self.dao, max_workers=1, max_bytes=1024, max_chars=100)
+        self.addCleanup(self.extraction.shutdown)
+
+    def _upload(self, content: bytes) -> str:
+        doc = Document(name="notes", owner="a@example.com", dType="text/plain", departmentId="d",
+                       description="", university="ttu", file_size=0, tags=[], category="course")
+        self.dao.saveDocument(doc, io.BytesIO(content))
+        return doc.documentId
+
+    def test_only_new_versions_are_processed(self):
+        doc_id = self._upload(b"Week 1: processes")
+        self.assertEqual(self.extraction.process_document(doc_id), 1)
+        self.assertEqual(self.extraction.process_document(doc_id), 0)
+
+        self.dao.update_content("a@example.com", doc_id, io.BytesIO(b"Week 2: threads"))
+        self.assertEqual(self.extraction.process_document(doc_id), 1)
+        text = self.dao.findLatestDocumentText(doc_id)
+        self.assertEqual((text.version_number, text.text), (2, "Week 2: threads"))
+        self.assertEqual(self.extraction.stats()["extracted"], 2)
+
+    def test_same_content_reuses_the_extraction(self):
+        first = self._upload(b"shared syllabus")
+        second = self._upload(b"shared syllabus")
+        self.extraction.process_document(first)
+        self.extraction.process_document(second)
+
+        self.assertEqual(self.dao._storage.getDoc.call_count, 1)
+        self.assertEqual(self.dao.findDocumentText(second, 1).text, "shared syllabus")
+        self.assertEqual(self.extraction.stats()["reused"], 1)
+
+    def test_limits_and_unsupported_content_are_recorded(self):
+        large = self._upload(b"x" * 2048)
+        binary = self._upload(b"\x89PNG\x00\x00")
+        long = self._upload(b"word " * 50)
+        for doc_id in (large, binary, long):
+            self.extraction.process_document(doc_id)
+
+        self.assertEqual(self.dao.findDocumentText(large, 1).status, "too_large")
+        self.assertEqual(self.dao.findDocumentText(binary, 1).status, "unsupported")
+        text = self.dao.findDocumentText(long, 1)
+        self.assertTrue(text.truncated)
+        self.assertEqual(len(text.text), 100)
+        self.assertEqual(text.word_count(), 20)
+
+    def test_submit_runs_in_the_background(self):
+        extracted = []
+        self.extraction._on_extracted = lambda document_id, added: extracted.append((document_id, added))
+        doc_id = self._upload(b"background")
+        self.assertTrue(self.extraction.submit(doc_id))
+        deadline = time.monotonic() + 5
+        while not extracted and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(extracted, [(doc_id, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import unittest
+import zipfile
+from knowledge.extraction.extractors import extract_text, normalize_text, word_offsets, PdfReader
+
+DOCX_XML = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+    '<w:p><w:r><w:t>Operating</w:t></w:r><w:r><w:tab/><w:t>Systems</w:t></w:r></w:p>'
+    '<w:p><w:r><w:t>Week 1: processes</w:t></w:r></w:p>'
+    '</w:body></w:document>'
+)
+
+
+def _docx() -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", DOCX_XML)
+    buffer.seek(0)
+    return buffer
+
+
+def _pdf(text: str) -> io.BytesIO:
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    out.seek(0)
+    return out
+
+
+class ExtractorsTest(unittest.TestCase):
+
+    def test_docx_paragraphs(self):
+        text, extractor = extract_text(_docx())
+        self.assertEqual(extractor, "docx")
+        self.assertEqual(normalize_text(text), "Operating Systems\nWeek 1: processes")
+
+    def test_plain_text_and_markdown(self):
+        text, extractor = extract_text(io.BytesIO("# Giáo trình\n\n\n  mạng   máy tính".encode()))
+        self.assertEqual(extractor, "text")
+        self.assertEqual(normalize_text(text), "# Giáo trình\nmạng máy tính")
+
+    @unittest.skipIf(PdfReader is None, "pypdf is not installed")
+    def test_pdf(self):
+        text, extractor = extract_text(_pdf("Hello syllabus"))
+        self.assertEqual(extractor, "pdf")
+        self.assertIn("Hello syllabus", text)
+
+    def test_binary_is_unsupported(self):
+        self.assertEqual(extract_text(io.BytesIO(b"\x89PNG\r\n\x1a\n\x00\x00")), (None, None))
+        self.assertEqual(extract_text(io.BytesIO(b"PK\x03\x04broken")), (None, None))
+
+    def test_word_offsets(self):
+        text = "Tuần 1: tiến trình"
+        self.assertEqual([text[i:i + 4] for i in word_offsets(text)], ["Tuần", "1: t", "tiến", "trìn"])
+
+
+if __name__ == '__main__':
+    unittest.main()
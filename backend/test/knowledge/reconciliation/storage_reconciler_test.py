@@ -0,0 +1,81 @@
+import io
+import hashlib
+import unittest
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from dao.blob_module.blob import Blob
+from dao.document_module.document import Document
+from dao.user_module.user import User
+from knowledge.reconciliation.storage_reconciler import StorageReconciler
+from test.support.dao import management_dao
+
+
+NOW = datetime.now(timezone.utc)
+OLD = NOW - timedelta(days=2)
+
+
+def checksum(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class StorageReconcilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = management_dao()
+        self.storage = self.dao._storage
+        self.dao.saveUser(User(email="a@example.com", password="x", name="a", departmentId="d", roles=["user"]))
+        self.doc = Document(name="syllabus", owner="a@example.com", dType="text/plain", departmentId="d",
+                            description="", university="ttu", file_size=0, tags=[], category="course")
+        self.assertNotIn("error", self.dao.saveDocument(self.doc, io.BytesIO(b"v1")))
+        # a record whose object is gone, and one left at zero by an interrupted delete
+        self.dao.blob_dao.save(Blob(checksum=checksum(b"lost"), size=4, createdAt=datetime.now() - timedelta(days=2)))
+        self.dao.blob_dao.save(Blob(checksum=checksum(b"released"), size=8, refCount=0))
+        self.stray = f"{ObjectId()}/v1"
+        self.objects = {
+            Blob.object_name_for(checksum(b"v1")): (2, OLD),
+            # a copy stored with another codec than its record
+            Blob.object_name_for(checksum(b"v1"), "zstd"): (4, OLD),
+            Blob.object_name_for(checksum(b"orphan")): (6, OLD),
+            Blob.object_name_for(checksum(b"uploading")): (9, NOW),
+            Blob.object_name_for(checksum(b"released")): (8, OLD),
+            f"{self.doc.documentId}/v1": (3, OLD),
+            f"{self.doc.documentId}/v7": (5, OLD),
+            self.stray: (7, OLD),
+            "staging/abandoned": (11, OLD),
+            "exports/report.csv": (13, OLD),
+        }
+        self.storage.listDocs.side_effect = lambda prefix=None: iter(
+            {"name": name, "size": size, "last_modified": modified}
+            for name, (size, modified) in sorted(self.objects.items())
+        )
+
+    def test_dry_run_only_reports(self):
+        report = StorageReconciler(self.dao, batch_size=2, deletes_per_second=0).reconcile(now=NOW)
+        self.assertEqual(report["scanned"], 10)
+        self.assertEqual(report["orphans"], 6)
+        self.assertEqual(report["orphan_bytes"], 4 + 6 + 8 + 5 + 7 + 11)
+        self.assertEqual(report["dangling_checksums"], [checksum(b"lost")])
+        self.assertEqual(report["unrecognized"], 1)
+        self.assertEqual(report["deleted"], 0)
+        self.storage.deleteDocs.assert_not_called()
+        self.assertIsNotNone(self.dao.blob_dao.findById(checksum(b"released")))
+
+    def test_orphans_are_deleted_in_bulk(self):
+        self.storage.deleteDocs.side_effect = lambda names: [n for n in names if n.startswith("staging/")]
+        reconciler = StorageReconciler(self.dao, batch_size=1000, deletes_per_second=0)
+        report = reconciler.reconcile(delete=True, now=NOW)
+        self.storage.deleteDocs.assert_called_once()
+        self.assertEqual(set(self.storage.deleteDocs.call_args.args[0]), {
+            Blob.object_name_for(checksum(b"orphan")), Blob.object_name_for(checksum(b"released")),
+            Blob.object_name_for(checksum(b"v1"), "zstd"),
+            f"{self.doc.documentId}/v7", self.stray, "staging/abandoned"
+        })
+        self.assertEqual((report["deleted"], report["failed"], report["reclaimed_bytes"]), (5, 1, 4 + 6 + 8 + 5 + 7))
+        self.assertIsNone(self.dao.blob_dao.findById(checksum(b"released")))
+        self.assertIsNotNone(self.dao.blob_dao.findById(checksum(b"v1")))
+        self.assertEqual(reconciler.stats(), {"runs": 1, "deleted": 5, "reclaimed_bytes": 30, "failed": 1,
+                                              "dangling": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import unittest
+from datetime import datetime, timedelta
+from dao.document_module.document import Document, Version
+from dao.user_module.user import User
+from knowledge.retention.retention_policy import RetentionPolicy, parse_policies
+from knowledge.retention.version_compactor import VersionCompactor
+from test.support.dao import management_dao
+
+
+NOW = datetime(2026, 6, 30, 12)
+
+
+def version(number: int, days_ago: float) -> Version:
+    return Version(version_number=number, modified_by="a@example.com",
+                   modification_date=NOW - timedelta(days=days_ago), file_size=1)
+
+
+class RetentionPolicyTest(unittest.TestCase):
+
+    def test_keeps_the_newest_versions(self):
+        versions = [version(n, 0) for n in range(1, 6)]
+        expired = RetentionPolicy(keep_last=2, daily_days=0).expired(versions, 5, NOW)
+        self.assertEqual([v.version_number for v in expired], [3, 2, 1])
+
+    def test_keeps_one_version_per_day_and_month(self):
+        versions = [version(1, 100), version(2, 70), version(3, 40), version(4, 3.2), version(5, 3.1),
+                    version(6, 0)]
+        expired = RetentionPolicy(keep_last=1, daily_days=30, monthly_months=2).expired(versions, 6, NOW)
+        # v5 covers its day, v3 and v2 their months, v1 is past the monthly window
+        self.assertEqual([v.version_number for v in expired], [4, 1])
+
+    def test_never_expires_the_current_version(self):
+        versions = [version(1, 400), version(2, 0)]
+        expired = RetentionPolicy(keep_last=0, daily_days=0, monthly_months=1).expired(versions, 1, NOW)
+        self.assertEqual(expired, [])
+
+    def test_rejects_unknown_and_negative_settings(self):
+        with self.assertRaises(ValueError):
+            parse_policies({"default": {"keep": 3}})
+        with self.assertRaises(ValueError):
+            parse_policies({"default": {"keep_last": -1}})
+        self.assertEqual(parse_policies({"course": {"keep_last": 3}})["course"], RetentionPolicy(keep_last=3))
+
+
+class VersionCompactorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dao = management_dao()
+        # mongomock treats a lone $slice projection as an inclusion projection
+        self.dao.document_dao.META_PROJECTION = None
+        self.storage = self.dao._storage
+        self.dao.saveUser(User(email="a@example.com", password="x", name="a", departmentId="d", roles=["user"]))
+        self.doc = Document(name="syllabus", owner="a@example.com", dType="text/plain", departmentId="d",
+                            description="", university="ttu", file_size=0, tags=[], category="course")
+        self.assertNotIn("error", self.dao.saveDocument(self.doc, io.BytesIO(b"v1")))
+        for content in (b"v2", b"v3", b"v4"):
+            self.assertTrue(self.dao.update_content("a@example.com", self.doc.documentId, io.BytesIO(content)))
+
+    def test_compaction_removes_expired_versions_and_releases_their_blobs(self):
+        compactor = VersionCompactor(self.dao, {"default": RetentionPolicy(keep_last=2, daily_days=0)}, 0)
+        self.assertEqual(compactor.compact(), 2)
+        self.assertEqual([v.version_number for v in self.dao.getVersions(self.doc.documentId)], [3, 4])
+        self.assertEqual(self.dao.findDocumentById(self.doc.documentId).currentNumber, 4)
+        self.assertEqual(sorted(blob.refCount for blob in self.dao.findBlobsInRange(None, None)), [0, 0, 1, 1])
+        self.assertEqual(compactor.stats(), {"passes": 1, "documents": 1, "removed": 2, "failed": 0})
+
+    def test_categories_without_a_policy_are_left_alone(self):
+        compactor = VersionCompactor(self.dao, {"report": RetentionPolicy(keep_last=1, daily_days=0)}, 0)
+        self.assertEqual(compactor.compact(), 0)
+        self.assertEqual(len(self.dao.getVersions(self.doc.documentId)), 4)
+        self.assertFalse(compactor.start())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from knowledge.retrieval.chunker import chunk_spans, chunk_hash
+from knowledge.retrieval.retrieval_manager import RetrievalManager
+from knowledge.retrieval.vector_index import VectorIndex
+
+
+class ChunkerTest(unittest.TestCase):
+
+    def test_chunks_cover_the_text_with_overlap(self):
+        text = " ".join(f"w{i}" for i in range(1000))
+        spans = chunk_spans(text, chunk_words=50, overlap=5)
+        self.assertEqual((spans[0][0], spans[-1][1]), (0, len(text)))
+        for (_, previous_end), (start, _) in zip(spans, spans[1:]):
+            self.assertEqual(len(text[start:previous_end].split()), 5)
+        self.assertTrue(all(len(text[start:end].split()) <= 105 for start, end in spans))
+        self.assertEqual(chunk_spans("", 4, 1), [])
+
+    def test_an_edit_only_changes_nearby_chunks(self):
+        words = [f"w{i % 997}" for i in range(5000)]
+        before = " ".join(words)
+        after = " ".join(words[:2500] + ["inserted"] + words[2500:])
+        old = {chunk_hash(before[s:e]) for s, e in chunk_spans(before, 100, 10)}
+        new = [chunk_hash(after[s:e]) for s, e in chunk_spans(after, 100, 10)]
+        self.assertLessEqual(len([value for value in new if value not in old]), 2)
+
+
+class VectorIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def _unit(self, *values):
+        vector = np.zeros(4, dtype=np.float32)
+        vector[:len(values)] = values
+        return vector / np.linalg.norm(vector)
+
+    def test_search_is_restricted_to_the_given_documents(self):
+        index = VectorIndex(self.path, 4)
+        index.add("a", 1, np.stack([self._unit(1, 0), self._unit(0, 1)]), np.array([[0, 5], [6, 9]]))
+        index.add("b", 1, np.stack([self._unit(1, 0.1)]), np.array([[0, 3]]))
+
+        hits = index.search(self._unit(1, 0), k=2)
+        self.assertEqual([(h[0], h[3], h[4]) for h in hits], [("a", 0, 5), ("b", 0, 3)])
+        self.assertEqual([h[0] for h in index.search(self._unit(1, 0), ["b"], k=5)], ["b"])
+        self.assertEqual(index.search(self._unit(1, 0), ["missing"], k=5), [])
+
+    def test_replace_compact_and_reopen(self):
+        index = VectorIndex(self.path, 4)
+        axes = [self._unit(1), self._unit(0, 1), self._unit(0, 0, 1)]
+        for i in range(3000):
+            index.add(f"d{i % 3}", i, np.stack([axes[i % 3]]), np.array([[i, i + 1]]))
+        self.assertEqual(len(index), 3)
+        self.assertLess(index.stats()["garbage"] + len(index), 3000)  # compacted on the way
+
+        reopened = VectorIndex(self.path, 4)
+        self.assertEqual(reopened.version_of("d2"), 2999)
+        hits = reopened.search(axes[2], k=1)
+        self.assertEqual((hits[0][0], hits[0][3]), ("d2", 2999))
+
+        self.assertIsNone(VectorIndex(self.path, 8).version_of("d2"))  # other dim starts over
+
+    @patch("knowledge.retrieval.vector_index.EXACT_SEARCH_ROWS", 100)
+    @patch("knowledge.retrieval.vector_index.TRAIN_MIN_ROWS", 2000)
+    def test_coarse_lists_find_the_nearest_rows(self):
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((4000, 16)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        index = VectorIndex(self.path, 16, nprobe=8)
+        for i in range(40):
+            index.add(f"d{i}", 1, vectors[i * 100:(i + 1) * 100], np.zeros((100, 2), dtype=np.int32))
+        self.assertGreater(index.stats()["lists"], 0)
+
+        query = vectors[1234]
+        hits = index.search(query, k=3)
+        self.assertEqual(hits[0][0], "d12")
+        self.assertAlmostEqual(hits[0][2], 1.0, places=5)
+        self.assertTrue(all(h[0] in ("d3", "d4") for h in index.search(query, ["d3", "d4"], k=5)))
+
+        reopened = VectorIndex(self.path, 16, nprobe=8)
+        self.assertEqual(reopened.search(query, k=1)[0][0], "d12")
+
+
+class RetrievalManagerTest(unittest.TestCase):
+
+    def test_semantic_neighbours(self):
+        retrieval = RetrievalManager(tempfile.mkdtemp(), dim=256, chunk_words=20, chunk_overlap=2)
+        retrieval.index_document("os", 1, "round robin scheduling gives each process a time slice on the cpu")
+        retrieval.index_document("db", 1, "a relational database stores rows in tables joined by keys")
+        self.assertEqual(retrieval.index_document("db", 1, "unchanged version is skipped"), 0)
+
+        hits = retrieval.search("how does process scheduling work", None, k=1)
+        self.assertEqual(hits[0]["documentId"], "os")
+        self.assertEqual(retrieval.search("database tables", ["os"], k=3)[0]["documentId"], "os")
+
+    def test_unchanged_chunks_are_carried_forward(self):
+        path = tempfile.mkdtemp()
+        retrieval = RetrievalManager(path, dim=64, chunk_words=20, chunk_overlap=2)
+        words = [f"w{i}" for i in range(2000)]
+        first = retrieval.index_document("doc", 1, " ".join(words))
+        self.assertEqual(first, retrieval.stats()["rows"])
+
+        edited = " ".join(words[:1000] + ["changed"] + words[1001:])
+        self.assertLessEqual(retrieval.index_document("doc", 2, edited), 4)
+        self.assertGreater(retrieval.stats()["reused_chunks"], first - 5)
+
+        # hashes survive a restart, the reopened index keeps carrying vectors forward
+        reopened = RetrievalManager(path, dim=64, chunk_words=20, chunk_overlap=2)
+        self.assertEqual(reopened.index_document("doc", 3, edited + " appended"), 1)
+        text = edited + " appended"
+        vectors, _ = reopened._index.rows_of("doc")
+        expected = reopened._embedder.embed_many([text[s:e] for s, e in chunk_spans(text, 20, 2)])
+        np.testing.assert_allclose(vectors, expected, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+from dao.document_module.document import Document
+from knowledge.knowledge_manager import KnowledgeManager
+from knowledge.retrieval.retrieval_manager import RetrievalManager
+from knowledge.search.fusion import reciprocal_rank_fusion
+from knowledge.search.search_manager import SearchManager
+
+
+def _doc(name: str) -> Document:
+    return Document(name=name, owner="a@example.com", dType="pdf", departmentId="d", description="",
+                    university="ttu", file_size=0, tags=[], category="course")
+
+
+class ReciprocalRankFusionTest(unittest.TestCase):
+
+    def test_agreement_beats_a_single_first_place(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+        self.assertEqual([doc_id for doc_id, _ in fused], ["b", "a", "d", "c"])
+        self.assertAlmostEqual(fused[0][1], 1 / 62 + 1 / 61)
+
+
+class HybridSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.code = _doc("CS101 syllabus")
+        self.paraphrase = _doc("Lecture notes")
+        self.private = _doc("CS101 answers")
+        texts = {
+            self.code.documentId: "course outline and grading policy",
+            self.paraphrase.documentId: "round robin scheduling hands each process a time slice of the cpu",
+            self.private.documentId: "round robin scheduling answers for the exam"
+        }
+        documents = [self.code, self.paraphrase, self.private]
+
+        self.knowledge = KnowledgeManager.__new__(KnowledgeManager)
+        self.knowledge._search = SearchManager(refresh_interval=0)
+        self.knowledge._search.rebuild(documents, texts.items())
+        self.knowledge._retrieval = RetrievalManager(tempfile.mkdtemp(), dim=256, chunk_words=20, chunk_overlap=5)
+        for doc_id, text in texts.items():
+            self.knowledge._retrieval.index_document(doc_id, 1, text)
+        self.knowledge._hybrid_candidates = 10
+        self.knowledge._rrf_k = 60
+        self.knowledge._hybrid_pool = ThreadPoolExecutor(max_workers=1)
+        self.knowledge._perms = MagicMock()
+        self.knowledge._perms.get_readable_doc_ids.return_value = [self.code.documentId, self.paraphrase.documentId]
+        self.knowledge._docs = MagicMock()
+        self.knowledge._docs.get_metadata_batch.side_effect = lambda document_ids, include_versions: [
+            {"documentId": doc.documentId, "name": doc.name} for doc in documents if doc.documentId in document_ids
+        ]
+
+    def tearDown(self):
+        self.knowledge._hybrid_pool.shutdown()
+
+    def test_both_stages_respect_read_permissions(self):
+        response = self.knowledge.hybrid_search("cs101 round robin cpu scheduling", user_id="u")
+        names = [result["name"] for result in response["results"]]
+        self.assertEqual(set(names), {"CS101 syllabus", "Lecture notes"})
+        self.assertTrue(all(result["ranks"]["bm25"] or result["ranks"]["vector"] for result in response["results"]))
+        for stage in ("permissions", "bm25", "vector", "fusion", "metadata", "total"):
+            self.assertIn(stage, response["timings_ms"])
+
+    def test_exact_code_and_paraphrase(self):
+        self.assertEqual(self.knowledge.hybrid_search("CS101", user_id="u")["results"][0]["name"], "CS101 syllabus")
+        paraphrased = self.knowledge.hybrid_search("how is cpu time shared between processes", user_id="u")
+        self.assertEqual(paraphrased["results"][0]["name"], "Lecture notes")
+
+    def test_nothing_readable(self):
+        self.knowledge._perms.get_readable_doc_ids.return_value = []
+        self.assertEqual(self.knowledge.hybrid_search("cs101", user_id="u")["results"], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
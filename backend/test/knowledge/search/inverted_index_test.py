@@ -0,0 +1,48 @@
+import unittest
+from knowledge.search.inverted_index import InvertedIndex, normalize
+
+
+class InvertedIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.index = InvertedIndex()
+        self.index.add("d1", {"name": "Operating Systems Syllabus", "tags": ["os", "kernel"],
+                              "category": "course", "description": "Processes and scheduling",
+                              "university": "TTU"})
+        self.index.add("d2", {"name": "Database Systems", "tags": ["sql"], "category": "course",
+                              "description": "Relational model and operating costs", "university": "TTU"})
+        self.index.add("d3", {"name": "Giáo trình Mạng máy tính", "tags": ["network"], "category": "textbook",
+                              "description": "", "university": "ĐH Tân Tạo"})
+
+    def test_name_matches_rank_above_description_matches(self):
+        ranked = self.index.rank("operating")
+        self.assertEqual([doc_id for doc_id, _ in ranked], ["d1", "d2"])
+
+    def test_exact_name_ranks_first(self):
+        self.assertEqual(self.index.rank("database systems")[0][0], "d2")
+
+    def test_prefix_and_fuzzy_matching(self):
+        self.assertEqual(self.index.match("sched"), {"d1"})
+        self.assertEqual(self.index.match("databse"), {"d2"})
+        self.assertEqual(self.index.match("kernle"), set())  # too short for two edits
+
+    def test_diacritics_are_ignored(self):
+        self.assertEqual(normalize("Đại học"), "dai hoc")
+        self.assertEqual(self.index.match("giao trinh"), {"d3"})
+        self.assertEqual(self.index.match("tan tao"), {"d3"})
+
+    def test_ranking_is_restricted_to_the_given_documents(self):
+        self.assertEqual(self.index.rank("systems", ["d2", "d3"]), self.index.rank("systems", ["d2"]))
+        self.assertEqual(self.index.rank("systems", []), [])
+
+    def test_reindex_and_remove(self):
+        self.index.add("d1", {"name": "Compilers"})
+        self.assertEqual(self.index.match("operating"), {"d2"})
+        self.assertEqual(self.index.match("compiler"), {"d1"})
+        self.index.remove("d1")
+        self.assertEqual(self.index.match("compiler"), set())
+        self.assertEqual(len(self.index), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from dao.document_module.document import Document
+from knowledge.search.search_manager import SearchManager
+
+
+def _doc(name: str) -> Document:
+    return Document(name=name, owner="a@example.com", dType="pdf", departmentId="d", description="",
+                    university="ttu", file_size=0, tags=[], category="course")
+
+
+class SearchManagerTest(unittest.TestCase):
+
+    def test_rebuild_indexes_extracted_content(self):
+        search = SearchManager(refresh_interval=0)
+        self.assertTrue(search.needs_refresh())
+        first, second = _doc("Week one"), _doc("Week two")
+        search.rebuild([first, second], iter([(second.documentId, "round robin scheduling")]))
+
+        self.assertFalse(search.needs_refresh())
+        self.assertEqual(search.match("scheduling"), {second.documentId})
+        self.assertEqual(search.match("week"), {first.documentId, second.documentId})
+
+    def test_metadata_outranks_content(self):
+        search = SearchManager(refresh_interval=0)
+        titled, mentioned = _doc("Scheduling"), _doc("Notes")
+        search.rebuild([titled, mentioned], [(mentioned.documentId, "scheduling")])
+        self.assertEqual([doc_id for doc_id, _ in search.rank("scheduling")],
+                         [titled.documentId, mentioned.documentId])
+
+    def test_changes_during_a_rebuild_survive_the_swap(self):
+        search = SearchManager(refresh_interval=0)
+        first, second = _doc("Week one"), _doc("Week two")
+        search.index_document(first)
+        self.assertTrue(search.begin_rebuild())
+        self.assertFalse(search.begin_rebuild())  # one rebuild at a time
+        self.assertFalse(search.needs_refresh())
+
+        def scan():
+            # the scan read the old state, these land while it runs
+            search.index_document(second, "round robin scheduling")
+            search.remove_document(first.documentId)
+            yield first
+
+        search.rebuild(scan())
+        self.assertTrue(search.wait_ready(timeout=0))
+        self.assertEqual(search.match("week"), {second.documentId})
+        self.assertEqual(search.match("scheduling"), {second.documentId})
+        self.assertTrue(search.begin_rebuild())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+from typing import Optional
+from unittest import mock
+import mongomock
+from dao.management_dao import ManagementDAO
+from dao.storage_module.istorage import IStorage
+
+COLLECTIONS = {
+    "user_dao": "users",
+    "document_dao": "documents",
+    "department_dao": "departments",
+    "permission_dao": "permissions",
+    "activity_log_dao": "activity_logs",
+    "blob_dao": "blobs",
+    "text_dao": "document_texts",
+    "version_dao": "document_versions"
+}
+
+
+def management_dao(client: Optional[mongomock.MongoClient] = None, storage: Optional[IStorage] = None,
+                   storage_config: Optional[dict] = None) -> ManagementDAO:
+    # a ManagementDAO over mongomock. storage replaces the backend, a MagicMock by default,
+    # storage_config builds the configured backend instead
+    if storage_config is not None:
+        backend = mock.patch("dao.management_dao.get_storage_config", return_value=storage_config)
+    elif storage is not None:
+        backend = mock.patch("dao.management_dao.MinIOStorage", return_value=storage)
+    else:
+        backend = mock.patch("dao.management_dao.MinIOStorage")
+    with backend, mock.patch("dao.management_dao.get_collections", return_value=COLLECTIONS):
+        dao = ManagementDAO(client or mongomock.MongoClient(), "testdb")
+    if storage is None and storage_config is None:
+        # writes take the bytes and deletes succeed, tests override what they look at
+        dao._storage.addDoc.side_effect = lambda name, data, **kwargs: bool(data.read())
+        dao._storage.codec_for.return_value = None
+        dao._storage.copyDoc.return_value = True
+        dao._storage.deleteDoc.return_value = True
+        dao._storage.deleteDocs.return_value = []
+    # mongomock has no sessions
+    dao.mongo_client.start_session = mock.MagicMock()
+    return dao
+
+
+def apply_bulk(collection):
+    # mongomock's bulk_write does not accept the UpdateOne of current pymongo, apply the updates one by one
+    def bulk_write(operations, ordered=True, session=None):
+        for operation in operations:
+            collection.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+    return bulk_write
@@ -0,0 +1,32 @@
+import hashlib
+import unittest
+from io import BytesIO
+from utils.stream import HashingReader
+
+
+class HashingReaderTest(unittest.TestCase):
+
+    def test_counts_and_hashes_while_reading(self):
+        payload = b"lecture notes " * 10000
+        reader = HashingReader(BytesIO(payload))
+
+        chunks = []
+        while True:
+            chunk = reader.read(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        self.assertEqual(b"".join(chunks), payload)
+        self.assertEqual(reader.bytes_read, len(payload))
+        self.assertEqual(reader.hexdigest(), hashlib.sha256(payload).hexdigest())
+
+    def test_empty_stream(self):
+        reader = HashingReader(BytesIO(b""))
+        self.assertEqual(reader.read(), b"")
+        self.assertEqual(reader.bytes_read, 0)
+        self.assertEqual(reader.hexdigest(), hashlib.sha256(b"").hexdigest())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import time
+import unittest
+from utils.cache import TTLCache
+
+
+class TTLCacheTest(unittest.TestCase):
+
+    def test_get_and_pop(self):
+        cache = TTLCache(max_size=10, ttl=60)
+        cache.set("u1", "alice")
+        self.assertEqual(cache.get("u1"), "alice")
+        cache.pop("u1")
+        self.assertIsNone(cache.get("u1"))
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now the oldest entry
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+
+    def test_entries_expire(self):
+        cache = TTLCache(max_size=10, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+        self.assertEqual(cache.get("a", "missing"), "missing")
+
+    def test_hit_miss_counters(self):
+        cache = TTLCache(max_size=10, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_disabled_cache(self):
+        cache = TTLCache(max_size=0, ttl=60)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
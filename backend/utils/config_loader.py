@@ -1,3 +1,4 @@
+import json
 import os
 from typing import Dict
 from dotenv import load_dotenv
@@ -18,18 +19,129 @@ def get_db_config() -> Dict[str, str]:
 
     return {
         "uri": uri,
-        "db_name": db_name
+        "db_name": db_name,
+        # sync: blocking pymongo calls in the worker pool, async: mongo metadata reads on the event loop
+        "driver": os.getenv("MONGODB_DRIVER", "sync").lower()
     }
 
 
-def get_storage_config() -> Dict[str, str]:
+def get_storage_config() -> Dict[str, object]:
     return {
+        # "minio", or "local" to keep objects on this machine's disk under local_root
+        "backend": os.getenv("STORAGE_BACKEND", "minio").lower(),
+        "local_root": os.getenv("STORAGE_LOCAL_ROOT", "data/objects"),
         "endpoint": os.getenv("MINIO_ENDPOINT"),
         "access_key": os.getenv("MINIO_ACCESS_KEY"),
         "secret_key": os.getenv("MINIO_SECRET_KEY"),
         "bucket_name": os.getenv("MINIO_BUCKET_NAME"),
-        "secure": os.getenv("MINIO_SECURE", "false").lower() in ("true", "1", "t")
+        "secure": os.getenv("MINIO_SECURE", "false").lower() in ("true", "1", "t"),
+        # multipart part size for streamed uploads of unknown length (MinIO minimum is 5 MiB)
+        "part_size": int(os.getenv("MINIO_PART_SIZE", str(10 * 1024 * 1024))),
+        # "zstd" compresses new content of the compressible types, needs the zstandard package
+        "codec": os.getenv("STORAGE_CODEC") or None,
+        # comma separated, entries ending in / cover a whole family. unset keeps the text-like defaults
+        "compress_types": [t.strip().lower() for t in os.getenv("STORAGE_COMPRESS_TYPES").split(",") if t.strip()]
+        if os.getenv("STORAGE_COMPRESS_TYPES") else None,
+        "compression_level": int(os.getenv("STORAGE_COMPRESSION_LEVEL", "3"))
+    }
+
+
+def get_download_config() -> Dict[str, object]:
+    return {
+        "chunk_size": int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(64 * 1024))),
+        # proxy: stream through the API, presigned: return a short-lived URL, redirect: 307 to that URL
+        "mode": os.getenv("DOWNLOAD_MODE", "proxy").lower(),
+        "url_expires": int(os.getenv("DOWNLOAD_URL_EXPIRES", "300"))
+    }
+
+
+def get_cache_config() -> Dict[str, int]:
+    return {
+        "user_cache_size": int(os.getenv("USER_CACHE_SIZE", "10000")),
+        "user_cache_ttl": int(os.getenv("USER_CACHE_TTL", "300")),
+        "permission_cache_size": int(os.getenv("PERMISSION_CACHE_SIZE", "50000")),
+        "permission_cache_ttl": int(os.getenv("PERMISSION_CACHE_TTL", "60"))
+    }
+
+
+def get_executor_config() -> Dict[str, int]:
+    return {
+        "max_workers": int(os.getenv("EXECUTOR_MAX_WORKERS", "32")),
+        "max_queue": int(os.getenv("EXECUTOR_MAX_QUEUE", "256"))
+    }
+
 
+def get_activity_log_config() -> Dict[str, float]:
+    return {
+        "max_queue": int(os.getenv("ACTIVITY_LOG_MAX_QUEUE", "10000")),
+        "batch_size": int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "500")),
+        "flush_interval": float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "1.0")),
+        # seconds a request waits on a full queue before its log is dropped
+        "block_timeout": float(os.getenv("ACTIVITY_LOG_BLOCK_TIMEOUT", "0.05"))
+    }
+
+
+def get_activity_retention_config() -> Dict[str, int]:
+    return {
+        # days a log is kept in its monthly partition, 0 keeps logs forever
+        "retention_days": int(os.getenv("ACTIVITY_LOG_RETENTION_DAYS", "0")),
+        # days hourly rollups are kept, daily rollups are kept forever
+        "hourly_rollup_days": int(os.getenv("ACTIVITY_ROLLUP_HOURLY_DAYS", "90"))
+    }
+
+
+def get_version_retention_config() -> Dict[str, object]:
+    return {
+        # json, category -> {"keep_last", "daily_days", "monthly_months"}, "default" covers categories
+        # without their own. empty keeps every version
+        "policies": json.loads(os.getenv("VERSION_RETENTION_POLICIES", "{}")),
+        # seconds between compaction passes, 0 disables the background compactor
+        "interval": float(os.getenv("VERSION_COMPACTION_INTERVAL", "3600"))
+    }
+
+
+def get_reconciliation_config() -> Dict[str, float]:
+    return {
+        # storage objects checked against mongo per query, also the size of one bulk delete
+        "batch_size": int(os.getenv("RECONCILE_BATCH_SIZE", "1000")),
+        # seconds, objects written more recently are never treated as orphans
+        "grace": float(os.getenv("RECONCILE_GRACE", "86400")),
+        "deletes_per_second": float(os.getenv("RECONCILE_DELETES_PER_SECOND", "100")),
+        # seconds between in-process passes, 0 leaves reconciliation to python -m knowledge.reconciliation
+        "interval": float(os.getenv("RECONCILE_INTERVAL", "0"))
+    }
+
+
+def get_search_config() -> Dict[str, int]:
+    return {
+        # seconds before the in-memory index is rebuilt from mongo, 0 only builds it once
+        "refresh_interval": int(os.getenv("SEARCH_REFRESH_INTERVAL", "300")),
+        # hybrid mode: candidates taken from each stage, and the rank damping of reciprocal rank fusion
+        "hybrid_candidates": int(os.getenv("SEARCH_HYBRID_CANDIDATES", "200")),
+        "rrf_k": int(os.getenv("SEARCH_RRF_K", "60")),
+        "hybrid_workers": int(os.getenv("SEARCH_HYBRID_WORKERS", "4"))
+    }
+
+
+def get_extraction_config() -> Dict[str, int]:
+    return {
+        "max_workers": int(os.getenv("EXTRACTION_WORKERS", "2")),
+        # larger versions are recorded as too_large and not read
+        "max_bytes": int(os.getenv("EXTRACTION_MAX_BYTES", str(50 * 1024 * 1024))),
+        # keeps the stored text well inside mongo's 16 MB document limit
+        "max_chars": int(os.getenv("EXTRACTION_MAX_CHARS", "2000000"))
+    }
+
+
+def get_retrieval_config() -> Dict[str, object]:
+    return {
+        # written by a single process, run one api worker or point each worker at its own path
+        "index_path": os.getenv("RETRIEVAL_INDEX_PATH", "data/vector_index"),
+        "dim": int(os.getenv("RETRIEVAL_DIM", "256")),
+        "chunk_words": int(os.getenv("RETRIEVAL_CHUNK_WORDS", "200")),
+        "chunk_overlap": int(os.getenv("RETRIEVAL_CHUNK_OVERLAP", "40")),
+        # coarse lists scanned per query once the readable set is large, trading recall for latency
+        "nprobe": int(os.getenv("RETRIEVAL_NPROBE", "8"))
     }
 
 
@@ -39,9 +151,21 @@ def get_collections() -> Dict[str, str]:
         "document_dao":  os.getenv("DOCUMENT_DAO"),
         "department_dao": os.getenv("DEPARTMENT_DAO"),
         "permission_dao": os.getenv("PERMISSION_DAO"),
-        "activity_log_dao": os.getenv("ACTIVITY_LOG_DAO")
+        "activity_log_dao": os.getenv("ACTIVITY_LOG_DAO"),
+        "blob_dao": os.getenv("BLOB_DAO", "blobs"),
+        "text_dao": os.getenv("TEXT_DAO", "document_texts"),
+        "version_dao": os.getenv("VERSION_DAO", "document_versions")
     }
 
 
 def get_secret_key() -> str:
     return os.getenv("SECRET_KEY")
+
+
+def get_chat_config() -> Dict[str, object]:
+    return {
+        "generator": os.getenv("CHAT_GENERATOR", "echo"),
+        "top_k": int(os.getenv("CHAT_TOP_K", "5")),
+        # seconds between streamed tokens of the echo generator
+        "token_delay": float(os.getenv("CHAT_TOKEN_DELAY", "0"))
+    }
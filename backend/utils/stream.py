@@ -0,0 +1,50 @@
+import hashlib
+from typing import BinaryIO, Iterator, Tuple
+
+
+class HashingReader:
+    # wraps a file-like object, counting and hashing bytes as they are read
+    def __init__(self, stream: BinaryIO, algorithm: str = "sha256"):
+        self._stream = stream
+        self._hash = hashlib.new(algorithm)
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        if chunk:
+            self._hash.update(chunk)
+            self.bytes_read += len(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def is_seekable(stream: BinaryIO) -> bool:
+    seekable = getattr(stream, "seekable", None)
+    return bool(seekable and seekable())
+
+
+def hash_seekable(stream: BinaryIO, algorithm: str = "sha256", chunk_size: int = 1024 * 1024) -> Tuple[str, int]:
+    # hashes the rest of a seekable stream, then rewinds it to where it started
+    start = stream.tell()
+    reader = HashingReader(stream, algorithm)
+    while reader.read(chunk_size):
+        pass
+    stream.seek(start)
+    return reader.hexdigest(), reader.bytes_read
+
+
+def iter_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    # yields fixed-size chunks, then closes the stream and hands its connection back to the pool
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        stream.close()
+        release_conn = getattr(stream, "release_conn", None)
+        if release_conn:
+            release_conn()